@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the parse, frame, audio and assembly stages
+
+Generates synthetic scripts and asset libraries, times every stage on its
+own and the whole pipeline end to end, and compares throughput and peak
+memory against a stored baseline. Regressions beyond the tolerance make
+the run exit with status 1.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scenes 10,100,1000,10000
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from cinematic_ai.core.config import Config
+from cinematic_ai.core.script_parser import ScriptParser
+from cinematic_ai.core.character_manager import CharacterManager
+from cinematic_ai.core.frame_generator import FrameGenerator
+from cinematic_ai.core.audio_generator import AudioGenerator
+from cinematic_ai.core.video_assembler import VideoAssembler
+from cinematic_ai.core.video_generator import CinematicAI
+from cinematic_ai.utils.logger import setup_logging
+from synthetic import make_script, make_assets
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+SRC_PATH = Path(__file__).parent.parent / 'src'
+
+# Metrics where a lower value is better, all others are throughputs
+LOWER_IS_BETTER = ('peak_rss_mb',)
+# Timings kept for reference, regressions are judged on the throughputs
+TIMING_METRICS = ('seconds', 'round_ms')
+# Options that change the workload; baselines taken with others are not comparable
+WORKLOAD_OPTIONS = ('scenes', 'render_scenes', 'assembly_scenes', 'locations', 'characters',
+                    'width', 'height', 'min_time')
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter for this process (Linux only)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process since the last reset, in MB"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS, and never resets
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024.0 * 1024.0) if sys.platform == 'darwin' else maxrss / 1024.0
+
+
+class Stage:
+    """Times one benchmark stage and records its peak memory"""
+
+    def __init__(self, results: dict, name: str):
+        self.results = results
+        self.name = name
+
+    def __enter__(self):
+        reset_peak_rss()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        self.peak_rss = peak_rss_mb()
+        return False
+
+    def record(self, rounds: int = 1, **throughputs):
+        """Store elapsed time, time per round, peak RSS and per-second rates of the given counts"""
+        entry = {'seconds': round(self.seconds, 4), 'round_ms': round(self.seconds / rounds * 1000, 4),
+                 'peak_rss_mb': round(self.peak_rss, 1)}
+        for unit, count in throughputs.items():
+            entry[f'{unit}_per_sec'] = round(count / self.seconds, 2) if self.seconds else 0.0
+        self.results[self.name] = entry
+        rates = ', '.join(f"{value:,.1f} {key.replace('_per_sec', '')}/s"
+                          for key, value in entry.items() if key.endswith('_per_sec'))
+        print(f"  {self.name:<28} {self.seconds:8.3f}s  {rates:<36} peak {self.peak_rss:7.1f} MB")
+
+
+def repeat(task, stage: Stage, min_time: float) -> int:
+    """Run a cheap task until the stage has lasted min_time, so timing is not lost in noise"""
+    rounds = 0
+    while not rounds or time.perf_counter() - stage.start < min_time:
+        task()
+        rounds += 1
+    return rounds
+
+
+def make_config(workspace: Path, args) -> Config:
+    """Build a benchmark config writing everything into the workspace"""
+    config = Config()
+    settings = config.config
+    settings['video']['resolution'] = {'width': args.width, 'height': args.height}
+    settings['audio']['tts_backend'] = 'stub'
+    settings['cache']['enabled'] = False
+    settings['cache']['directory'] = str(workspace / 'cache')
+    settings['frame_generation']['persist_location_index'] = False
+    settings['output']['directory'] = str(workspace / 'output')
+    settings['output']['temp_directory'] = str(workspace / 'temp')
+    settings['output']['resume'] = False
+    settings['logging']['file'] = str(workspace / 'benchmark.log')
+    settings['logging']['level'] = 'WARNING'
+    return config
+
+
+def run(args) -> dict:
+    """Run all benchmark stages and return their results"""
+    results = {}
+    scene_counts = [int(count) for count in args.scenes.split(',')]
+
+    with tempfile.TemporaryDirectory(prefix='cinematic_bench_') as tmp:
+        workspace = Path(tmp)
+        config = make_config(workspace, args)
+        locations_dir, characters_dir = make_assets(workspace / 'assets', args.locations, args.characters)
+        print(f"Assets: {args.locations} locations, {args.characters} characters, "
+              f"frames at {args.width}x{args.height}\n")
+
+        # Cold start of the CLI in a fresh interpreter, as paid by every invocation
+        env = dict(os.environ, PYTHONPATH=str(SRC_PATH))
+        help_command = [sys.executable, '-m', 'cinematic_ai.cli', '--help']
+        with Stage(results, 'startup.cli_help') as stage:
+            rounds = repeat(lambda: subprocess.run(help_command, env=env, stdout=subprocess.DEVNULL, check=True),
+                            stage, args.min_time)
+        stage.record(rounds, runs=rounds)
+
+        parser = ScriptParser(config)
+        parsed = {}
+        for count in scene_counts:
+            script = make_script(count)
+            with Stage(results, f'parse.{count}') as stage:
+                rounds = repeat(lambda: parsed.__setitem__(count, parser.parse_script(script)),
+                                stage, args.min_time)
+            stage.record(rounds, scenes=count * rounds, mb=rounds * len(script.encode('utf-8')) / 1e6)
+
+        render_count = min(max(scene_counts), args.render_scenes)
+        scenes = parsed.get(render_count) or parser.parse_script(make_script(render_count))
+        work_dir = workspace / 'work'
+
+        characters = CharacterManager(str(characters_dir))
+        scene_characters = [
+            [path for path in map(characters.get_character_image, scene.characters) if path]
+            for scene in scenes
+        ]
+
+        with Stage(results, f'frames.{render_count}') as stage:
+            frame_generator = FrameGenerator(config, str(locations_dir))
+            frames = [
+                frame_generator.generate_scene_frames(scene, images, str(work_dir))
+                for scene, images in zip(scenes, scene_characters)
+            ]
+        stage.record(scenes=len(scenes), frames=sum(map(len, frames)))
+
+        audio_generator = AudioGenerator(config)
+        jobs = [(scene.dialogue, str(work_dir / f"scene_{scene.number}_audio{audio_generator.audio_extension}"))
+                for scene in scenes]
+        with Stage(results, f'audio.{render_count}') as stage:
+            rounds = repeat(lambda: audio_generator.generate_voiceovers(jobs), stage, args.min_time)
+        audio = [path for _, path in jobs]
+        stage.record(rounds, scenes=len(scenes) * rounds)
+
+        assembly_count = min(args.assembly_scenes, len(scenes))
+        scenes_data = [{'scene': scene, 'frames': scene_frames, 'audio': audio_path}
+                       for scene, scene_frames, audio_path
+                       in list(zip(scenes, frames, audio))[:assembly_count]]
+        with Stage(results, f'assembly.{assembly_count}') as stage:
+            VideoAssembler(config).create_video(scenes_data, str(workspace / 'output' / 'assembly.mp4'))
+        stage.record(scenes=assembly_count, frames=_video_frames(config, scenes_data))
+
+        # End to end through the public entry point, from files on disk
+        script_path = workspace / 'e2e_script.txt'
+        script_path.write_text(make_script(assembly_count, seed=1))
+        config_path = workspace / 'config.yaml'
+        config_path.write_text(yaml.safe_dump(config.config))
+        with Stage(results, f'end_to_end.{assembly_count}') as stage:
+            generator = CinematicAI(str(config_path))
+            generator.generate_video(str(script_path), str(characters_dir), str(locations_dir),
+                                     str(workspace / 'output' / 'end_to_end.mp4'))
+            generator.close()
+        stage.record(scenes=assembly_count)
+
+    return results
+
+
+def _video_frames(config: Config, scenes_data: list) -> int:
+    """Number of video frames the assembled scenes span"""
+    from cinematic_ai.utils.media_probe import probe_audio
+    fps = config.get('video.fps', 24)
+    total = 0.0
+    for scene in scenes_data:
+        info = probe_audio(scene['audio'])
+        total += info.duration if info else 0.0
+    return int(total * fps)
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_round_ms: float = 0.0) -> tuple:
+    """
+    Compare results with a baseline
+
+    A single round of a repeated stage that takes less than min_round_ms
+    is dominated by timer and interpreter noise rather than by the code
+    under test, so such stages are left out of the comparison.
+
+    Args:
+        results: Current results
+        baseline: Stored baseline results
+        tolerance: Allowed relative change before a metric counts as regressed
+        min_round_ms: Shortest round, in milliseconds, a stage needs to be compared
+
+    Returns:
+        (list of regression descriptions, list of stages left out)
+    """
+    regressions = []
+    skipped = []
+    for stage, metrics in results.items():
+        reference_metrics = baseline.get(stage, {})
+        round_ms = min(metrics.get('round_ms', metrics['seconds'] * 1000),
+                       reference_metrics.get('round_ms', float('inf')))
+        if round_ms < min_round_ms:
+            skipped.append(stage)
+            continue
+        for metric, value in metrics.items():
+            reference = reference_metrics.get(metric)
+            if not reference or metric in TIMING_METRICS:
+                continue
+            change = value / reference - 1.0
+            regressed = change > tolerance if metric in LOWER_IS_BETTER else change < -tolerance
+            if regressed:
+                regressions.append(f"{stage} {metric}: {value:,.2f} vs baseline {reference:,.2f} ({change:+.0%})")
+    return regressions, skipped
+
+
+def main() -> int:
+    """Run benchmarks, compare against the baseline and report"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scenes', default='10,100,1000,10000',
+                        help='Comma-separated script sizes for the parse benchmark')
+    parser.add_argument('--render-scenes', type=int, default=50,
+                        help='Scenes used for the frame and audio stages')
+    parser.add_argument('--assembly-scenes', type=int, default=10,
+                        help='Scenes used for assembly and the end-to-end run')
+    parser.add_argument('--locations', type=int, default=24, help='Location images in the asset library')
+    parser.add_argument('--characters', type=int, default=12, help='Character images in the asset library')
+    parser.add_argument('--width', type=int, default=640, help='Output frame width')
+    parser.add_argument('--height', type=int, default=360, help='Output frame height')
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help='Minimum seconds for the cheap parse and audio stages, which are repeated')
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help='Baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative slowdown or memory growth (default: 0.25)')
+    parser.add_argument('--min-round-ms', type=float, default=1.0,
+                        help='Stages whose single round is faster than this are reported but not '
+                             'checked for regressions (default: 1.0)')
+    parser.add_argument('--update-baseline', action='store_true', help='Store results as the new baseline')
+    parser.add_argument('--output', help='Also write results to this JSON file')
+    args = parser.parse_args()
+
+    setup_logging(level='WARNING')
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print("=" * 60)
+    print("Cinematic AI - Benchmarks")
+    print("=" * 60)
+    results = run(args)
+    report = {
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                    'cpus': os.cpu_count()},
+        'config': {option: getattr(args, option) for option in WORKLOAD_OPTIONS},
+        'results': results,
+    }
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    if args.update_baseline:
+        Path(args.baseline).write_text(json.dumps(report, indent=2) + '\n')
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    if not Path(args.baseline).exists():
+        print(f"\nNo baseline at {args.baseline}, run with --update-baseline to create one")
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    print()
+    for section in ('machine', 'config'):
+        if baseline.get(section, report[section]) != report[section]:
+            print(f"! Baseline {section} differs, results may not be comparable: {baseline[section]}")
+    regressions, skipped = compare(results, baseline.get('results', {}), args.tolerance, args.min_round_ms)
+    if skipped:
+        print(f"Not compared, rounds under {args.min_round_ms:g} ms: {', '.join(skipped)}")
+    if regressions:
+        print("=" * 60)
+        print(f"✗ {len(regressions)} REGRESSION(S) beyond {args.tolerance:.0%} of baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        print("=" * 60)
+        return 1
+
+    print(f"✓ No regressions beyond {args.tolerance:.0%} of baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Synthetic scripts and asset libraries for benchmarks"""
+import random
+from pathlib import Path
+from typing import List, Tuple
+from PIL import Image, ImageDraw
+
+LOCATIONS = [
+    'COFFEE SHOP', 'PARK', 'APARTMENT', 'OFFICE', 'BEACH', 'TRAIN STATION',
+    'HOSPITAL', 'LIBRARY', 'ROOFTOP', 'KITCHEN', 'FOREST', 'MUSEUM',
+]
+TIMES = ['DAY', 'NIGHT', 'DAWN', 'DUSK']
+CHARACTERS = [
+    'SARAH', 'JOHN', 'MARIA', 'DAVID', 'ANNA', 'PETER', 'LUCY', 'MARK',
+    'EMMA', 'TOM', 'KATE', 'ADAM',
+]
+WORDS = (
+    'the quiet city waits while rain taps softly on old windows and someone '
+    'remembers a promise made long ago before the lights went out'
+).split()
+
+# Source image sizes in the asset library: (width, height, format)
+IMAGE_SIZES: List[Tuple[int, int, str]] = [
+    (640, 360, 'PNG'),
+    (1920, 1080, 'JPEG'),
+    (4000, 3000, 'JPEG'),
+]
+
+
+def make_script(scene_count: int, seed: int = 0) -> str:
+    """
+    Generate a formal screenplay with varied locations, casts and dialogue
+
+    Args:
+        scene_count: Number of scenes
+        seed: Random seed, the same seed always gives the same script
+
+    Returns:
+        Script text
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(scene_count):
+        location = rng.choice(LOCATIONS)
+        lines.append(f"{'INT' if rng.random() < 0.6 else 'EXT'}. {location} - {rng.choice(TIMES)}")
+        lines.append('')
+        for name in rng.sample(CHARACTERS, rng.randint(1, 3)):
+            words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 12)))
+            lines.append(f"{name} says {words}.")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def make_assets(directory: Path, location_count: int, character_count: int,
+                seed: int = 0) -> Tuple[Path, Path]:
+    """
+    Generate location and character image libraries of mixed sizes
+
+    Args:
+        directory: Directory to create the libraries in
+        location_count: Number of location images
+        character_count: Number of character images
+        seed: Random seed
+
+    Returns:
+        (locations directory, characters directory)
+    """
+    rng = random.Random(seed)
+    locations_dir = directory / 'locations'
+    characters_dir = directory / 'characters'
+    locations_dir.mkdir(parents=True, exist_ok=True)
+    characters_dir.mkdir(parents=True, exist_ok=True)
+
+    for i in range(location_count):
+        name = LOCATIONS[i % len(LOCATIONS)].lower().replace(' ', '_')
+        if i >= len(LOCATIONS):
+            name = f"{name}_{i // len(LOCATIONS)}"
+        _write_image(locations_dir / name, IMAGE_SIZES[i % len(IMAGE_SIZES)], rng)
+
+    for i in range(character_count):
+        name = CHARACTERS[i % len(CHARACTERS)].lower()
+        if i >= len(CHARACTERS):
+            name = f"{name}_{i // len(CHARACTERS)}"
+        _write_image(characters_dir / name, (512, 512, 'PNG'), rng)
+
+    return locations_dir, characters_dir
+
+
+def _write_image(stem: Path, size: Tuple[int, int, str], rng: random.Random):
+    """Write a gradient image with a few shapes, so encoders see real detail"""
+    width, height, image_format = size
+    top = tuple(rng.randrange(256) for _ in range(3))
+    bottom = tuple(rng.randrange(256) for _ in range(3))
+    gradient = Image.linear_gradient('L').resize((width, height))
+    img = Image.composite(Image.new('RGB', (width, height), bottom),
+                          Image.new('RGB', (width, height), top), gradient)
+
+    draw = ImageDraw.Draw(img)
+    for _ in range(8):
+        x, y = rng.randrange(width), rng.randrange(height)
+        radius = rng.randint(width // 20, width // 6)
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius],
+                     fill=tuple(rng.randrange(256) for _ in range(3)))
+
+    suffix = '.png' if image_format == 'PNG' else '.jpg'
+    img.save(stem.with_suffix(suffix), image_format, quality=90)
@@ -1,39 +1,102 @@
 """Command-line interface for CinematicAI"""
 import click
 import sys
+import time
 from pathlib import Path
-from .core.video_generator import CinematicAI
 
+# Heavy modules are imported inside the commands so --help and usage errors stay fast
 
-@click.command()
+
+class DefaultGroup(click.Group):
+    """Command group that runs a default command when no subcommand is named"""
+
+    def __init__(self, *args, default_command: str = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx, args):
+        # Keeps `cinematic-ai -s script.txt ...` working as `cinematic-ai render ...`
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = [self.default_command] + list(args)
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultGroup, default_command='render')
+def main():
+    """
+    Cinematic AI - Generate videos from scripts, character photos, and location photos.
+
+    Example usage:
+
+        cinematic-ai -s script.txt -c ./characters -l ./locations -o video.mp4
+
+    Or many scripts in one process:
+
+        cinematic-ai batch ./scripts -c ./characters -l ./locations -o ./videos
+    """
+
+
+@main.command()
 @click.option('--script', '-s', required=True, type=click.Path(exists=True),
               help='Path to script file')
 @click.option('--characters', '-c', required=True, type=click.Path(exists=True),
               help='Directory containing character images')
 @click.option('--locations', '-l', required=True, type=click.Path(exists=True),
               help='Directory containing location images')
-@click.option('--output', '-o', required=True, type=click.Path(),
+@click.option('--output', '-o', type=click.Path(),
               help='Output video path (e.g., output.mp4)')
 @click.option('--music', '-m', type=click.Path(exists=True),
               help='Background music file (optional)')
 @click.option('--config', type=click.Path(exists=True),
               help='Custom configuration file (optional)')
-def main(script, characters, locations, output, music, config):
+@click.option('--dry-run', is_flag=True,
+              help='Only parse the script and resolve assets, print the plan')
+@click.option('--preview', is_flag=True,
+              help='Fast low-resolution proxy render (config profile "preview") to <output>_preview.mp4')
+def render(script, characters, locations, output, music, config, dry_run, preview):
     """
-    Cinematic AI - Generate videos from scripts, character photos, and location photos.
-    
+    Render one script to a video (the default command).
+
     Example usage:
-    
-        cinematic-ai -s script.txt -c ./characters -l ./locations -o video.mp4
-    
+
+        cinematic-ai render -s script.txt -c ./characters -l ./locations -o video.mp4
+
     Or with background music:
-    
-        cinematic-ai -s script.txt -c ./characters -l ./locations -o video.mp4 -m music.mp3
+
+        cinematic-ai render -s script.txt -c ./characters -l ./locations -o video.mp4 -m music.mp3
+
+    Or a quick low-resolution proxy written to video_preview.mp4; the final
+    render to video.mp4 later reuses its voiceovers:
+
+        cinematic-ai render -s script.txt -c ./characters -l ./locations -o video.mp4 --preview
+
+    Or check scenes and assets without rendering:
+
+        cinematic-ai render -s script.txt -c ./characters -l ./locations --dry-run
     """
+    if not output and not dry_run:
+        raise click.UsageError("Missing option '--output' / '-o'.")
+
+    from .core.video_generator import CinematicAI
+
+    profile = 'preview' if preview else None
+    if dry_run:
+        try:
+            plan = CinematicAI(config_path=config, profile=profile).plan(script, characters, locations)
+        except Exception as e:
+            click.echo(f"\n✗ Error: {e}", err=True)
+            sys.exit(1)
+        _print_plan(plan)
+        sys.exit(0)
+
+    generator = None
     try:
         # Initialize generator
-        generator = CinematicAI(config_path=config)
-        
+        generator = CinematicAI(config_path=config, profile=profile)
+        if preview:
+            # Never overwrite a full-quality render with its proxy
+            output = _preview_output(output)
+
         # Generate video
         output_video = generator.generate_video(
             script_path=script,
@@ -42,13 +105,143 @@ def main(script, characters, locations, output, music, config):
             output_path=output,
             background_music=music
         )
-        
+
         click.echo(f"\n✓ Success! Video created at: {output_video}")
         sys.exit(0)
-        
+
     except Exception as e:
         click.echo(f"\n✗ Error: {e}", err=True)
         sys.exit(1)
+    finally:
+        if generator:
+            generator.close()
+
+
+def _preview_output(output: str) -> str:
+    """Output path of a preview render, `video.mp4` -> `video_preview.mp4`"""
+    path = Path(output)
+    if path.stem.endswith('_preview'):
+        return output
+    return str(path.with_name(f"{path.stem}_preview{path.suffix}"))
+
+
+def _print_plan(plan: list):
+    """Print a dry-run plan with one line per scene"""
+    total = 0.0
+    missing = set()
+    cut = 0
+    for entry in plan:
+        scene = entry['scene']
+        if entry['cut']:
+            cut += 1
+        else:
+            total += entry['duration']
+        images = ', '.join(Path(image).name for image in entry['images']) or 'text card'
+        absent = [' '.join(name.split()) for name, image in entry['characters'].items() if not image]
+        missing.update(absent)
+        status = 'cut' if entry['cut'] else entry['source']
+        click.echo(f"Scene {scene.number:>3}  {entry['duration']:6.1f}s  ({status})  {scene.location} - {scene.time}")
+        click.echo(f"           images: {images}")
+        if absent:
+            click.echo(f"           no image for: {', '.join(absent)}")
+    click.echo(f"\n{len(plan) - cut} scenes, about {total:.1f}s of video")
+    if cut:
+        click.echo(f"{cut} scenes cut to fit the maximum duration")
+    if missing:
+        click.echo(f"Characters without images: {', '.join(sorted(missing))}")
+
+
+@main.command()
+@click.argument('jobs', type=click.Path(exists=True))
+@click.option('--characters', '-c', type=click.Path(exists=True),
+              help='Default directory containing character images')
+@click.option('--locations', '-l', type=click.Path(exists=True),
+              help='Default directory containing location images')
+@click.option('--output-dir', '-o', required=True, type=click.Path(),
+              help='Directory for videos of jobs without an explicit output')
+@click.option('--music', '-m', type=click.Path(exists=True),
+              help='Default background music file (optional)')
+@click.option('--config', type=click.Path(exists=True),
+              help='Custom configuration file (optional)')
+@click.option('--jobs', '-j', 'workers', type=int,
+              help='Scripts rendered concurrently (default: performance.batch_jobs)')
+@click.option('--preview', is_flag=True,
+              help='Fast low-resolution proxy renders (config profile "preview") to <output>_preview.mp4')
+def batch(jobs, characters, locations, output_dir, music, config, workers, preview):
+    """
+    Render many scripts in one process.
+
+    JOBS is a directory of scripts, a text file with one script path per
+    line, or a YAML/JSON list of jobs with `script` and optional `output`,
+    `characters`, `locations` and `music` keys.
+
+    Example usage:
+
+        cinematic-ai batch ./scripts -c ./characters -l ./locations -o ./videos -j 4
+    """
+    from .core.batch import BatchRunner, load_jobs, summarize
+
+    try:
+        job_list = load_jobs(jobs, output_dir, characters, locations, music)
+    except (OSError, ValueError, KeyError) as e:
+        click.echo(f"✗ Invalid job list: {e}", err=True)
+        sys.exit(2)
+    if not job_list:
+        click.echo("✗ No scripts found", err=True)
+        sys.exit(2)
+    if preview:
+        job_list = [job._replace(output=_preview_output(job.output)) for job in job_list]
+
+    runner = BatchRunner(config_path=config, workers=workers, profile='preview' if preview else None)
+    click.echo(f"Rendering {len(job_list)} scripts with {runner.workers} concurrent jobs")
+
+    def report(completed, result):
+        name = Path(result.job.script).name
+        prefix = f"[{completed}/{len(job_list)}]"
+        if result.ok:
+            skipped = f", {result.failed_scenes} scenes skipped" if result.failed_scenes else ""
+            click.echo(f"{prefix} ✓ {name} -> {result.job.output} "
+                       f"({result.scenes} scenes, {result.seconds:.1f}s{skipped})")
+        else:
+            click.echo(f"{prefix} ✗ {name}: {result.error}", err=True)
+
+    start = time.perf_counter()
+    results = runner.run(job_list, on_result=report)
+    click.echo("\n" + summarize(results, time.perf_counter() - start))
+    sys.exit(0 if all(result.ok for result in results) else 1)
+
+
+@main.command()
+@click.option('--characters', '-c', type=click.Path(exists=True),
+              help='Default directory containing character images, indexed at startup')
+@click.option('--locations', '-l', type=click.Path(exists=True),
+              help='Default directory containing location images, indexed at startup')
+@click.option('--host', help='Interface to bind (default: service.host)')
+@click.option('--port', type=int, help='Port to listen on (default: service.port)')
+@click.option('--jobs', '-j', 'workers', type=int,
+              help='Jobs rendered concurrently (default: service.max_concurrent)')
+@click.option('--config', type=click.Path(exists=True),
+              help='Custom configuration file (optional)')
+def serve(characters, locations, host, port, workers, config):
+    """
+    Run a resident render service with a local HTTP job API.
+
+    Config, asset indexes, caches and worker processes stay warm between
+    jobs. Jobs are queued by priority (higher first), `"preview": true`
+    renders a fast low-resolution proxy:
+
+        curl -X POST localhost:8765/jobs -d '{"script": "script.txt", "priority": 5}'
+
+        curl localhost:8765/jobs/<id>
+
+        curl -X DELETE localhost:8765/jobs/<id>
+    """
+    from .core.service import RenderService, serve as serve_http
+
+    service = RenderService(config_path=config, workers=workers,
+                            characters=characters, locations=locations)
+    serve_http(service, host or service.config.get('service.host', '127.0.0.1'),
+               port if port is not None else service.config.get('service.port', 8765))
 
 
 if __name__ == '__main__':
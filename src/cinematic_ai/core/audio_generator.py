@@ -1,9 +1,13 @@
 """Audio generator for TTS and audio mixing"""
 import os
+import shutil
 from pathlib import Path
-from typing import Optional
-from gtts import gTTS
+from typing import List, Optional, Set, Tuple
+from .tts_backends import create_backend
 from ..utils.logger import get_logger
+from ..utils.disk_cache import open_cache, make_key
+from ..utils.media_probe import probe_audio
+from ..utils.tracing import get_tracer
 
 logger = get_logger('audio_generator')
 
@@ -21,6 +25,15 @@ class AudioGenerator:
         self.config = config
         self.tts_lang = config.get('audio.tts_language', 'en')
         self.tts_slow = config.get('audio.tts_slow', False)
+        self.words_per_minute = config.get('audio.words_per_minute', 150)
+        
+        # Speech engine selected by audio.tts_backend
+        self.backend = create_backend(config)
+        self.tts_backend = self.backend.name
+        self.audio_extension = self.backend.extension
+        
+        # Cache of synthesized utterances shared across scenes and runs
+        self.tts_cache = open_cache(config, 'tts')
     
     def generate_voiceover(self, text: str, output_path: str) -> str:
         """
@@ -33,23 +46,90 @@ class AudioGenerator:
         Returns:
             Path to generated audio file
         """
-        try:
-            logger.info(f"Generating TTS voiceover: {len(text)} characters")
-            
-            # Create output directory if needed
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        return self.generate_voiceovers([(text, output_path)])[0]
+    
+    def generate_voiceovers(self, jobs: List[Tuple[str, str]],
+                            fallback_paths: Optional[Set[str]] = None) -> List[str]:
+        """
+        Generate voiceovers for many texts in one batch
+        
+        Cached utterances are copied, identical texts are synthesized once,
+        and the rest go to the backend in a single batch call.
+        
+        Args:
+            jobs: List of (text, output path)
+            fallback_paths: Set the output paths that received silent
+                fallback audio instead of speech are added to
             
-            # Generate TTS
-            tts = gTTS(text=text, lang=self.tts_lang, slow=self.tts_slow)
-            tts.save(output_path)
+        Returns:
+            Paths to generated audio files, in job order
+        """
+        with get_tracer().span('voiceovers', items=len(jobs)) as span:
+            pending = {}
+            for text, output_path in jobs:
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                cache_key = self._tts_cache_key(text)
+                if cache_key and self.tts_cache.fetch(cache_key, output_path):
+                    logger.info(f"Voiceover cache hit: {output_path}")
+                    span.count('cache_hits')
+                    continue
+                pending.setdefault(text, []).append(output_path)
             
-            logger.info(f"Voiceover saved to: {output_path}")
-            return output_path
+            if pending:
+                logger.info(f"Synthesizing {len(pending)} voiceovers with {self.tts_backend}")
+                span.count('cache_misses', len(pending))
+                texts = list(pending)
+                errors = self.backend.synthesize_batch([(text, pending[text][0]) for text in texts])
+                
+                for text, error in zip(texts, errors):
+                    first, *copies = pending[text]
+                    if error is not None:
+                        logger.error(f"Error generating TTS: {error}")
+                        span.count('failures')
+                        # Create silent audio as fallback
+                        for output_path in pending[text]:
+                            if fallback_paths is not None:
+                                fallback_paths.add(output_path)
+                            self._create_silent_audio(output_path, self.estimate_duration(text))
+                        continue
+                    
+                    cache_key = self._tts_cache_key(text)
+                    if cache_key:
+                        self.tts_cache.put(cache_key, first)
+                    for output_path in copies:
+                        shutil.copyfile(first, output_path)
+                    logger.info(f"Voiceover saved to: {first}")
         
-        except Exception as e:
-            logger.error(f"Error generating TTS: {e}")
-            # Create silent audio as fallback
-            return self._create_silent_audio(output_path)
+        return [output_path for _, output_path in jobs]
+    
+    def estimate_duration(self, text: str) -> float:
+        """Estimate spoken duration of text from the configured speaking rate"""
+        return max(1.0, len(text.split()) * 60.0 / self.words_per_minute)
+    
+    def cached_duration(self, text: str) -> Optional[float]:
+        """
+        Get the duration of an already synthesized voiceover
+        
+        Args:
+            text: Text to speak
+            
+        Returns:
+            Duration in seconds, or None if the text is not in the TTS cache
+        """
+        cache_key = self._tts_cache_key(text)
+        path = self.tts_cache.peek(cache_key) if cache_key else None
+        info = probe_audio(path) if path else None
+        return info.duration if info else None
+    
+    def _tts_cache_key(self, text: str) -> Optional[str]:
+        """Build TTS cache key from text and synthesis settings"""
+        if not self.tts_cache:
+            return None
+        return make_key('tts', text, self.backend.cache_key())
+    
+    def cache_stats(self) -> dict:
+        """Get TTS cache hit/miss statistics"""
+        return self.tts_cache.stats() if self.tts_cache else {}
     
     def _create_silent_audio(self, output_path: str, duration: float = 1.0) -> str:
         """Create a silent audio file as fallback"""
@@ -59,7 +139,7 @@ class AudioGenerator:
             
             # Create very quiet tone
             silent = Sine(20).to_audio_segment(duration=int(duration * 1000), volume=-50)
-            silent.export(output_path, format="mp3")
+            silent.export(output_path, format=Path(output_path).suffix.lstrip('.') or 'mp3')
             logger.info(f"Created fallback silent audio: {output_path}")
             return output_path
         except Exception as e:
@@ -68,7 +148,7 @@ class AudioGenerator:
     
     def get_audio_duration(self, audio_path: str) -> float:
         """
-        Get duration of audio file in seconds
+        Get duration of audio file in seconds from its headers
         
         Args:
             audio_path: Path to audio file
@@ -76,10 +156,8 @@ class AudioGenerator:
         Returns:
             Duration in seconds
         """
-        try:
-            from pydub import AudioSegment
-            audio = AudioSegment.from_file(audio_path)
-            return len(audio) / 1000.0  # Convert ms to seconds
-        except Exception as e:
-            logger.error(f"Error getting audio duration: {e}")
+        info = probe_audio(audio_path)
+        if info is None:
+            logger.error(f"Error getting audio duration: {audio_path}")
             return 5.0  # Default fallback
+        return info.duration
@@ -0,0 +1,252 @@
+"""Streaming NumPy mixer for voiceover and background music"""
+import subprocess
+import tempfile
+import wave
+from pathlib import Path
+from typing import List, Optional
+import numpy as np
+from ..utils.logger import get_logger
+from ..utils.media_probe import find_ffmpeg, probe_audio
+
+logger = get_logger('audio_mixer')
+
+AUDIO_SAMPLE_RATE = 44100
+AUDIO_CHANNELS = 2
+
+# Voice level (full scale) above which background music is ducked
+DUCK_THRESHOLD = 0.01
+
+# Samples per ducking envelope step (~23 ms at 44.1 kHz)
+DUCK_WINDOW = 1024
+
+
+class AudioMixer:
+    """Mixes placed voiceovers and looped background music into one PCM track"""
+
+    def __init__(self, config):
+        """
+        Initialize mixer
+
+        Args:
+            config: Configuration object
+        """
+        self.config = config
+        self.voice_volume = config.get('audio.voiceover_volume', 1.0)
+        self.music_volume = config.get('audio.background_music_volume', 0.3)
+        self.ducking = config.get('audio.ducking', 0.5)
+        self.duck_release = max(config.get('audio.duck_release', 0.3), 0.0)
+        self.block_size = max(DUCK_WINDOW, int(config.get('audio.mix_block_seconds', 1.0) * AUDIO_SAMPLE_RATE))
+        self.temp_dir = Path(config.get('output.temp_directory', 'demo/output/temp'))
+        self.ffmpeg = find_ffmpeg()
+
+    def mix(self, tracks: List[dict], duration: float, output_path: str,
+            background_music: Optional[str] = None) -> str:
+        """
+        Mix voiceover tracks and background music into a WAV file
+
+        Every input is decoded to 16-bit PCM once. The timeline is then
+        rendered in fixed-size blocks, so memory stays bounded by the block
+        size and the voiceovers of the scenes inside one block. Inputs that
+        fail to decode raise, so callers can fall back to another mixer
+        instead of silently muting a scene.
+
+        Args:
+            tracks: Dicts with 'audio' path, 'start' and 'duration' in
+                seconds, and optional 'fade_in'/'fade_out' in seconds
+            duration: Total length of the mix in seconds
+            output_path: Path of the WAV file to write
+            background_music: Optional music file, looped under the voices
+
+        Returns:
+            Path to the mixed WAV file
+
+        Raises:
+            RuntimeError: If ffmpeg is missing or an input cannot be decoded
+        """
+        total = int(round(duration * AUDIO_SAMPLE_RATE))
+        placed = sorted((self._place(track) for track in tracks), key=lambda t: t['start'])
+
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        music_file = None
+        music = None
+        gain = 1.0
+        next_track = 0
+        active = []
+
+        try:
+            if background_music and Path(background_music).exists() and self.music_volume:
+                music_file = tempfile.NamedTemporaryFile(suffix='.pcm', dir=self.temp_dir, delete=False)
+                music_file.close()
+                music = self._decode_music(background_music, music_file.name)
+
+            logger.info(f"Mixing {len(placed)} voice tracks{' with music' if music is not None else ''} "
+                        f"({duration:.2f}s)")
+            with wave.open(output_path, 'wb') as out:
+                out.setnchannels(AUDIO_CHANNELS)
+                out.setsampwidth(2)
+                out.setframerate(AUDIO_SAMPLE_RATE)
+
+                for block_start in range(0, total, self.block_size):
+                    block_end = min(block_start + self.block_size, total)
+                    voice = np.zeros((block_end - block_start, AUDIO_CHANNELS), dtype=np.float32)
+
+                    # Decode voices as their scenes come up, drop them once passed
+                    while next_track < len(placed) and placed[next_track]['start'] < block_end:
+                        track = placed[next_track]
+                        track['samples'] = self._load_voice(track)
+                        active.append(track)
+                        next_track += 1
+                    for track in active:
+                        if track['start'] + track['length'] <= block_start:
+                            track['samples'] = None
+                    active = [t for t in active if t['samples'] is not None]
+
+                    for track in active:
+                        self._add_voice(voice, block_start, track)
+
+                    block = voice * self.voice_volume
+                    if music is not None:
+                        music_gain, gain = self._music_gain(voice, gain)
+                        block += self._music_block(music, block_start, block_end) * music_gain
+
+                    np.clip(block, -1.0, 1.0, out=block)
+                    out.writeframes((block * 32767.0).astype('<i2').tobytes())
+        finally:
+            music = None
+            if music_file:
+                Path(music_file.name).unlink()
+
+        return output_path
+
+    def _place(self, track: dict) -> dict:
+        """Convert track timing from seconds to samples"""
+        start = int(round(track['start'] * AUDIO_SAMPLE_RATE))
+        return {
+            'audio': track.get('audio'),
+            'start': start,
+            'length': int(round((track['start'] + track['duration']) * AUDIO_SAMPLE_RATE)) - start,
+            'fade_in': int(round(track.get('fade_in', 0.0) * AUDIO_SAMPLE_RATE)),
+            'fade_out': int(round(track.get('fade_out', 0.0) * AUDIO_SAMPLE_RATE)),
+        }
+
+    def _decode_command(self, audio_path: str, output: str = '-') -> tuple:
+        """
+        Build an ffmpeg command decoding audio to raw 16-bit PCM
+
+        Mono sources stay mono and are spread over both channels while
+        mixing, as ffmpeg's own upmix would lower them by 3 dB.
+
+        Args:
+            audio_path: Audio file to decode
+            output: Output file, or '-' for stdout
+
+        Returns:
+            (command, channel count of the decoded PCM)
+        """
+        if not self.ffmpeg:
+            raise RuntimeError("ffmpeg binary not found, cannot decode audio")
+        info = probe_audio(audio_path)
+        channels = 1 if info and info.channels == 1 else AUDIO_CHANNELS
+        cmd = [
+            self.ffmpeg, '-y', '-loglevel', 'error', '-i', audio_path,
+            '-vn', '-f', 's16le', '-ac', str(channels), '-ar', str(AUDIO_SAMPLE_RATE),
+            output
+        ]
+        return cmd, channels
+
+    def _decode_music(self, audio_path: str, pcm_path: str) -> Optional[np.ndarray]:
+        """Decode music to a PCM file and map it into memory"""
+        cmd, channels = self._decode_command(audio_path, pcm_path)
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg decode failed for {audio_path}: "
+                               f"{result.stderr.decode(errors='replace').strip()}")
+        if Path(pcm_path).stat().st_size < 2 * channels:
+            return None
+        return np.memmap(pcm_path, dtype='<i2', mode='r').reshape(-1, channels)
+
+    def _load_voice(self, track: dict) -> np.ndarray:
+        """Decode a voiceover, padded or trimmed to its scene, with fades applied"""
+        samples = np.zeros((track['length'], AUDIO_CHANNELS), dtype=np.float32)
+        audio_path = track['audio']
+        if not audio_path or not Path(audio_path).exists():
+            return samples
+
+        cmd, channels = self._decode_command(audio_path)
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg decode failed for voiceover {audio_path}: "
+                               f"{result.stderr.decode(errors='replace').strip()}")
+
+        pcm = np.frombuffer(result.stdout, dtype='<i2')
+        pcm = pcm[:len(pcm) - len(pcm) % channels].reshape(-1, channels)
+        count = min(len(pcm), track['length'])
+        samples[:count] = pcm[:count]
+        samples *= 1.0 / 32768.0
+
+        # Complementary linear fades, so overlapping scenes sum to unity gain
+        if track['fade_in']:
+            fade = min(track['fade_in'], len(samples))
+            samples[:fade] *= self._ramp(fade)
+        if track['fade_out']:
+            fade = min(track['fade_out'], len(samples))
+            samples[len(samples) - fade:] *= 1.0 - self._ramp(fade)
+        return samples
+
+    @staticmethod
+    def _ramp(count: int) -> np.ndarray:
+        """Rising linear fade of `count` samples, as a column for stereo blocks"""
+        return ((np.arange(count, dtype=np.float32) + 0.5) / count)[:, None]
+
+    def _add_voice(self, block: np.ndarray, block_start: int, track: dict):
+        """Add the part of a placed voice that falls into a block"""
+        first = max(block_start, track['start'])
+        last = min(block_start + len(block), track['start'] + track['length'])
+        if first < last:
+            block[first - block_start:last - block_start] += \
+                track['samples'][first - track['start']:last - track['start']]
+
+    def _music_block(self, music: np.ndarray, block_start: int, block_end: int) -> np.ndarray:
+        """Read a block of looped music from the decoded PCM"""
+        block = np.empty((block_end - block_start, AUDIO_CHANNELS), dtype=np.float32)
+        position = block_start % len(music)
+        filled = 0
+        while filled < len(block):
+            count = min(len(block) - filled, len(music) - position)
+            block[filled:filled + count] = music[position:position + count]
+            filled += count
+            position = 0
+        block *= self.music_volume / 32768.0
+        return block
+
+    def _music_gain(self, voice: np.ndarray, gain: float) -> tuple:
+        """
+        Compute the ducking gain curve for one block
+
+        Args:
+            voice: Voice samples of the block
+            gain: Gain at the end of the previous block
+
+        Returns:
+            (per-sample gain column, gain at the end of this block)
+        """
+        if self.ducking >= 1.0:
+            return 1.0, 1.0
+
+        windows = -(-len(voice) // DUCK_WINDOW)
+        padded = np.zeros((windows * DUCK_WINDOW, AUDIO_CHANNELS), dtype=np.float32)
+        padded[:len(voice)] = voice
+        levels = np.abs(padded).reshape(windows, -1).max(axis=1)
+        targets = np.where(levels > DUCK_THRESHOLD, self.ducking, 1.0)
+
+        # Duck within one window, recover over the release time
+        release_windows = max(1.0, self.duck_release * AUDIO_SAMPLE_RATE / DUCK_WINDOW)
+        step = (1.0 - self.ducking) / release_windows
+        points = np.empty(windows + 1)
+        points[0] = gain
+        for i, target in enumerate(targets):
+            points[i + 1] = target if target < points[i] else min(target, points[i] + step)
+
+        positions = np.arange(len(voice)) / DUCK_WINDOW
+        curve = np.interp(positions, np.arange(windows + 1), points).astype(np.float32)
+        return curve[:, None], float(points[-1])
@@ -0,0 +1,198 @@
+"""Batch rendering of many scripts in one process"""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional
+import yaml
+from .video_generator import CinematicAI
+from ..utils.logger import get_logger
+from ..utils.media_probe import probe_audio
+from ..utils.tracing import configure_tracing, get_tracer
+
+logger = get_logger('batch')
+
+SCRIPT_EXTENSIONS = ('.txt', '.fountain')
+
+
+class BatchJob(NamedTuple):
+    """One script to render"""
+    script: str
+    output: str
+    characters: str
+    locations: str
+    music: Optional[str] = None
+
+
+class JobResult(NamedTuple):
+    """Outcome of a batch job"""
+    job: BatchJob
+    ok: bool
+    seconds: float
+    scenes: int = 0
+    failed_scenes: int = 0
+    video_seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def load_jobs(source: str, output_dir: str, characters: Optional[str] = None,
+              locations: Optional[str] = None, music: Optional[str] = None) -> List[BatchJob]:
+    """
+    Read a job list
+
+    The source is either a directory, whose script files are rendered to
+    `<output_dir>/<script name>.mp4`, a YAML or JSON list of jobs with a
+    `script` key and optional `output`, `characters`, `locations` and
+    `music` keys, or a text file with one script path per line (`#` starts
+    a comment). Relative paths in job files are relative to the file.
+
+    Args:
+        source: Directory of scripts or job list file
+        output_dir: Directory for outputs of jobs without an explicit output
+        characters: Default character image directory
+        locations: Default location image directory
+        music: Default background music
+
+    Returns:
+        List of jobs
+    """
+    source_path = Path(source)
+    if source_path.is_dir():
+        entries = [{'script': str(path)} for path in sorted(source_path.iterdir())
+                   if path.is_file() and path.suffix.lower() in SCRIPT_EXTENSIONS]
+        base = Path('.')
+    elif source_path.suffix.lower() in ('.yaml', '.yml', '.json'):
+        with open(source_path, 'r') as f:
+            entries = (json.load(f) if source_path.suffix.lower() == '.json' else yaml.safe_load(f)) or []
+        entries = [entry if isinstance(entry, dict) else {'script': entry} for entry in entries]
+        base = source_path.parent
+    else:
+        with open(source_path, 'r') as f:
+            lines = (line.split('#', 1)[0].strip() for line in f)
+            entries = [{'script': line} for line in lines if line]
+        base = source_path.parent
+
+    def resolve(value: Optional[str]) -> Optional[str]:
+        return str(base / value) if value else None
+
+    jobs = []
+    for entry in entries:
+        script = resolve(entry['script'])
+        output = resolve(entry.get('output')) or str(Path(output_dir) / f"{Path(script).stem}.mp4")
+        job = BatchJob(
+            script=script,
+            output=output,
+            characters=resolve(entry.get('characters')) or characters,
+            locations=resolve(entry.get('locations')) or locations,
+            music=resolve(entry.get('music')) or music,
+        )
+        if not job.characters or not job.locations:
+            raise ValueError(f"Job {script} has no characters or locations directory")
+        jobs.append(job)
+
+    # Work directories and temp files are named after the output stem
+    stems = [Path(job.output).stem for job in jobs]
+    duplicates = sorted({stem for stem in stems if stems.count(stem) > 1})
+    if duplicates:
+        raise ValueError(f"Outputs must have unique file names, duplicated: {', '.join(duplicates)}")
+    return jobs
+
+
+class BatchRunner:
+    """Renders jobs through a bounded pool sharing one warm CinematicAI"""
+
+    def __init__(self, config_path: Optional[str] = None, workers: Optional[int] = None,
+                 profile: Optional[str] = None):
+        """
+        Initialize batch runner
+
+        Args:
+            config_path: Path to configuration file
+            workers: Jobs rendered concurrently, defaults to performance.batch_jobs
+            profile: Optional config profile applied to every job, e.g. 'preview'
+        """
+        self.generator = CinematicAI(config_path, profile)
+        self.config = self.generator.config
+        self.workers = max(1, workers or self.config.get('performance.batch_jobs', 2) or 1)
+
+    def run(self, jobs: List[BatchJob],
+            on_result: Optional[Callable[[int, JobResult], None]] = None) -> List[JobResult]:
+        """
+        Render all jobs
+
+        Configuration, asset indexes, caches and the frame worker pool are
+        shared by every job; a failing job is reported and the batch goes on.
+
+        Args:
+            jobs: Jobs to render
+            on_result: Called with (completed count, result) as jobs finish
+
+        Returns:
+            Results in job order
+        """
+        tracer = configure_tracing(self.config)
+        results: List[Optional[JobResult]] = [None] * len(jobs)
+
+        try:
+            with tracer.span('batch', jobs=len(jobs)) as batch_span:
+                with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs) or 1)) as pool:
+                    futures = {pool.submit(self._run_job, job, batch_span): i for i, job in enumerate(jobs)}
+                    for completed, future in enumerate(as_completed(futures), 1):
+                        result = future.result()
+                        results[futures[future]] = result
+                        if on_result:
+                            on_result(completed, result)
+        finally:
+            self.generator.close()
+
+        if tracer.enabled:
+            logger.info("Batch stage timings:\n" + tracer.summary())
+            if self.config.get('tracing.export_chrome', True):
+                temp_dir = Path(self.config.get('output.temp_directory', 'demo/output/temp'))
+                tracer.export_chrome(str(temp_dir / 'batch_trace.json'))
+        return results
+
+    def _run_job(self, job: BatchJob, parent) -> JobResult:
+        """Render one job in its own session"""
+        session = self.generator.session()
+        start = time.perf_counter()
+        try:
+            with get_tracer().attach(parent):
+                session.generate_video(job.script, job.characters, job.locations,
+                                       job.output, job.music)
+        except Exception as e:
+            logger.error(f"Job {job.script} failed: {e}")
+            return JobResult(job, False, time.perf_counter() - start, error=str(e))
+
+        info = probe_audio(job.output)
+        return JobResult(
+            job, True, time.perf_counter() - start,
+            scenes=len(session.render_report),
+            failed_scenes=len(session.failed_scenes),
+            video_seconds=info.duration if info else 0.0,
+        )
+
+
+def summarize(results: List[JobResult], seconds: float) -> str:
+    """
+    Describe batch throughput
+
+    Args:
+        results: Job results
+        seconds: Wall-clock duration of the batch
+
+    Returns:
+        Summary text
+    """
+    succeeded = [result for result in results if result.ok]
+    scenes = sum(result.scenes for result in succeeded)
+    video_seconds = sum(result.video_seconds for result in succeeded)
+    lines = [
+        f"Rendered {len(succeeded)}/{len(results)} jobs in {seconds:.1f}s",
+        f"Throughput: {len(succeeded) / seconds * 3600:.1f} jobs/h, {scenes / seconds:.2f} scenes/s, "
+        f"{video_seconds / seconds:.2f}x realtime" if seconds else "Throughput: n/a",
+    ]
+    failed = [result for result in results if not result.ok]
+    if failed:
+        lines.append(f"Failed: {', '.join(Path(result.job.script).name for result in failed)}")
+    return '\n'.join(lines)
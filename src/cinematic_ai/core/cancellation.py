@@ -0,0 +1,21 @@
+"""Cooperative cancellation of renders"""
+import threading
+from typing import Optional
+
+
+class RenderCancelled(Exception):
+    """Raised when a render is cancelled through its cancel event"""
+
+
+def check_cancelled(cancel_event: Optional[threading.Event]):
+    """
+    Stop work whose cancel event is set
+
+    Args:
+        cancel_event: Event set from another thread, or None
+
+    Raises:
+        RenderCancelled: If the event is set
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise RenderCancelled("Render cancelled")
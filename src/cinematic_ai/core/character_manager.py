@@ -1,12 +1,33 @@
 """Character consistency manager for tracking character appearances"""
+import bisect
+import re
 from pathlib import Path
-from typing import Dict, List, Optional
-from PIL import Image
+from typing import Dict, List, Optional, Tuple
 import os
 from ..utils.logger import get_logger
 
 logger = get_logger('character_manager')
 
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.webp']
+
+# Leading honorifics that may be omitted when a character is referenced
+NAME_TITLES = {'dr', 'mr', 'mrs', 'ms', 'miss', 'mx', 'prof', 'sir', 'dame',
+               'capt', 'captain', 'sgt', 'det', 'rev', 'officer', 'agent'}
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a character name for lookups ("Dr._Smith" -> "dr smith")"""
+    return ' '.join(re.sub(r'[\W_]+', ' ', name.casefold()).split())
+
+
+def name_keys(name: str) -> Tuple[str, str]:
+    """Get normalized name and the same name without leading honorifics"""
+    key = normalize_name(name)
+    tokens = key.split()
+    while len(tokens) > 1 and tokens[0] in NAME_TITLES:
+        tokens.pop(0)
+    return key, ' '.join(tokens)
+
 
 class Character:
     """Represents a character with reference images"""
@@ -35,6 +56,14 @@ class CharacterManager:
         """
         self.characters_dir = Path(characters_dir)
         self.characters: Dict[str, Character] = {}
+        
+        # Directory entry -> (mtime, character name or None if shadowed)
+        self._sources: Dict[str, Tuple[int, Optional[str]]] = {}
+        # Normalized key -> candidate character names, best first
+        self._name_index: Dict[str, List[str]] = {}
+        self._alias_index: Dict[str, List[str]] = {}
+        self._explicit_aliases: Dict[str, str] = {}
+        
         self._load_characters()
     
     def _load_characters(self):
@@ -46,34 +75,145 @@ class CharacterManager:
         logger.info(f"Loading characters from {self.characters_dir}")
         
         # Group images by character name (folder or prefix)
+        for item in sorted(self.characters_dir.iterdir()):
+            self._load_entry(item)
+    
+    def _load_entry(self, item: Path):
+        """Load a character from a directory entry"""
+        try:
+            mtime = item.stat().st_mtime_ns
+        except OSError:
+            return
+        
+        if item.is_dir():
+            # Each subdirectory is a character
+            character_name = item.name
+            image_paths = [
+                str(img) for img in sorted(item.iterdir())
+                if img.suffix.lower() in IMAGE_EXTENSIONS
+            ]
+            if image_paths:
+                # Folders take precedence over single images of the same name
+                if character_name in self.characters:
+                    self._shadow(character_name)
+                self._add_character(Character(character_name, image_paths))
+                self._sources[str(item)] = (mtime, character_name)
+                logger.info(f"Loaded character '{character_name}' with {len(image_paths)} images")
+            else:
+                self._sources[str(item)] = (mtime, None)
+        elif item.suffix.lower() in IMAGE_EXTENSIONS:
+            # Individual image - use filename as character name
+            character_name = item.stem
+            if character_name not in self.characters:
+                self._add_character(Character(character_name, [str(item)]))
+                self._sources[str(item)] = (mtime, character_name)
+                logger.info(f"Loaded character '{character_name}' from single image")
+            else:
+                self._sources[str(item)] = (mtime, None)
+    
+    def _shadow(self, name: str):
+        """Replace a character, keeping its previous source for later refreshes"""
+        self._remove_character(name)
+        for source, (mtime, source_name) in self._sources.items():
+            if source_name == name:
+                self._sources[source] = (mtime, None)
+    
+    def _add_character(self, character: Character):
+        """Add character and index its normalized name and alias"""
+        self.characters[character.name] = character
+        key, alias = name_keys(character.name)
+        bisect.insort(self._name_index.setdefault(key, []), character.name)
+        if alias != key:
+            bisect.insort(self._alias_index.setdefault(alias, []), character.name)
+    
+    def _remove_character(self, name: str):
+        """Remove character and its index entries"""
+        if self.characters.pop(name, None) is None:
+            return
+        key, alias = name_keys(name)
+        for index, index_key in ((self._name_index, key), (self._alias_index, alias)):
+            candidates = index.get(index_key)
+            if candidates and name in candidates:
+                candidates.remove(name)
+                if not candidates:
+                    del index[index_key]
+    
+    def refresh(self) -> bool:
+        """
+        Update characters from directory changes
+        
+        Only added, removed or modified entries are (re)loaded; unchanged
+        character folders are not rescanned.
+        
+        Returns:
+            True if any character changed
+        """
+        if not self.characters_dir.exists():
+            changed = bool(self._sources)
+            for source in list(self._sources):
+                self._drop_source(source)
+            return changed
+        
+        current = {}
         for item in self.characters_dir.iterdir():
-            if item.is_dir():
-                # Each subdirectory is a character
-                character_name = item.name
-                image_paths = [
-                    str(img) for img in item.iterdir()
-                    if img.suffix.lower() in ['.jpg', '.jpeg', '.png', '.webp']
-                ]
-                if image_paths:
-                    self.characters[character_name] = Character(character_name, image_paths)
-                    logger.info(f"Loaded character '{character_name}' with {len(image_paths)} images")
-            elif item.suffix.lower() in ['.jpg', '.jpeg', '.png', '.webp']:
-                # Individual image - use filename as character name
-                character_name = item.stem
-                if character_name not in self.characters:
-                    self.characters[character_name] = Character(character_name, [str(item)])
-                    logger.info(f"Loaded character '{character_name}' from single image")
+            try:
+                current[str(item)] = item.stat().st_mtime_ns
+            except OSError:
+                continue
+        
+        removed = [source for source in self._sources if source not in current]
+        modified = [source for source, mtime in current.items()
+                    if self._sources.get(source, (None,))[0] != mtime]
+        if not removed and not modified:
+            return False
+        
+        for source in removed + modified:
+            self._drop_source(source)
+        
+        # Entries shadowed by a removed folder may now provide the character
+        shadowed = [source for source, (_, name) in self._sources.items() if name is None]
+        for source in shadowed:
+            del self._sources[source]
+        
+        for source in sorted(set(modified + shadowed)):
+            self._load_entry(Path(source))
+        
+        logger.info(f"Refreshed characters: {len(removed)} removed, {len(modified)} added or changed")
+        return True
+    
+    def _drop_source(self, source: str):
+        """Forget a directory entry and the character it provided"""
+        _, name = self._sources.pop(source, (None, None))
+        if name:
+            self._remove_character(name)
+    
+    def add_alias(self, alias: str, name: str):
+        """
+        Register an explicit alias for a character
+        
+        Args:
+            alias: Alternative name used in scripts
+            name: Character name as loaded from the directory
+        """
+        self._explicit_aliases[normalize_name(alias)] = name
     
     def get_character(self, name: str) -> Optional[Character]:
-        """Get character by name (case-insensitive)"""
+        """Get character by name (case-insensitive, honorifics optional)"""
         # Try exact match first
         if name in self.characters:
             return self.characters[name]
         
-        # Try case-insensitive match
-        for char_name, character in self.characters.items():
-            if char_name.lower() == name.lower():
-                return character
+        key, stripped = name_keys(name)
+        explicit = self._explicit_aliases.get(key)
+        if explicit in self.characters:
+            return self.characters[explicit]
+        
+        # Normalized names win over aliases, "DR. SMITH" also tries "SMITH"
+        for index in (self._name_index, self._alias_index):
+            for lookup_key in (key, stripped):
+                candidates = index.get(lookup_key)
+                if candidates:
+                    return self.characters[candidates[0]]
         
         return None
     
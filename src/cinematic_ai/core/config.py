@@ -8,12 +8,13 @@ from typing import Dict, Any
 class Config:
     """Configuration manager that loads and provides access to config settings"""
     
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, profile: str = None):
         """
         Initialize configuration
         
         Args:
             config_path: Path to custom config file, or None to use default
+            profile: Name of a profile under `profiles` to apply, e.g. 'preview'
         """
         if config_path is None:
             # Use default config - look in multiple locations
@@ -32,6 +33,22 @@ class Config:
         
         self.config_path = Path(config_path)
         self.config = self._load_config()
+        self.profile = None
+        if profile:
+            self.apply_profile(profile)
+    
+    def apply_profile(self, name: str):
+        """
+        Override settings with those of a named profile
+        
+        Args:
+            name: Profile name under `profiles`
+        """
+        overrides = self.get(f'profiles.{name}')
+        if not isinstance(overrides, dict):
+            raise ValueError(f"Unknown config profile: {name}")
+        _merge(self.config, overrides)
+        self.profile = name
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file"""
@@ -66,3 +83,12 @@ class Config:
     def __getitem__(self, key: str) -> Any:
         """Allow dict-like access to config"""
         return self.get(key)
+
+
+def _merge(base: Dict[str, Any], overrides: Dict[str, Any]):
+    """Recursively merge overrides into base, replacing non-dict values"""
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
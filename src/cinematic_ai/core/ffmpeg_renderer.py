@@ -0,0 +1,423 @@
+"""Direct FFmpeg renderer streaming frames over a pipe"""
+import subprocess
+import tempfile
+import threading
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+from .audio_mixer import AudioMixer
+from .cancellation import check_cancelled
+from .frame_store import FrameStore
+from .motion import KenBurnsEngine
+from .transitions import crossfade
+from ..utils.logger import get_logger
+from ..utils.disk_cache import open_cache, make_key, file_digest
+from ..utils.media_probe import find_ffmpeg
+from ..utils.tracing import get_tracer
+
+logger = get_logger('ffmpeg_renderer')
+
+
+class FFmpegRenderer:
+    """Renders scenes by piping already-sized RGB frames into an ffmpeg subprocess"""
+
+    def __init__(self, config):
+        """
+        Initialize renderer
+
+        Args:
+            config: Configuration object
+        """
+        self.config = config
+        self.fps = config.get('video.fps', 24)
+        self.width = config.get('video.resolution.width', 1920)
+        self.height = config.get('video.resolution.height', 1080)
+        self.codec = config.get('video.codec', 'libx264')
+        self.preset = config.get('video.preset', 'medium')
+        self.temp_dir = Path(config.get('output.temp_directory', 'demo/output/temp'))
+        self.segment_encoding = config.get('video.segment_encoding', True)
+        self.transition_duration = config.get('scenes.transition_duration', 0.0) or 0.0
+        self.cancel_event: Optional[threading.Event] = None
+        self.motion = KenBurnsEngine(config, self.width, self.height)
+        # Without zoom/pan every shot is a held still, encoded once with variable frame rate;
+        # with them every frame differs, so there is nothing to hold
+        self.still_encoding = config.get('video.still_encoding', True) and not self.motion.enabled
+        if config.get('video.still_encoding', True) and self.motion.enabled:
+            logger.info("Still image encoding needs zoom_effect and pan_effect off, encoding every frame")
+        self.frame_store = FrameStore(config)
+        self.ffmpeg = find_ffmpeg()
+        
+        # Encoded scene segments keyed by frame content, timing and settings
+        self.segment_cache = open_cache(config, 'segments') if self.segment_encoding else None
+
+    def available(self) -> bool:
+        """Check whether an ffmpeg binary was found"""
+        return self.ffmpeg is not None
+
+    def render(self, scenes: List[dict], output_path: str,
+               background_music: Optional[str] = None,
+               cancel_event: Optional[threading.Event] = None) -> str:
+        """
+        Render scenes to a video file
+
+        Args:
+            scenes: List of dicts with 'frames', 'duration' and optional 'audio'
+            output_path: Path to save output video
+            background_music: Optional path to background music
+            cancel_event: Event that stops encoding when set
+
+        Returns:
+            Path to created video
+        """
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self.cancel_event = cancel_event
+        video_path = self.temp_dir / f"{Path(output_path).stem}_video.mp4"
+        scenes = self._plan_transitions(self._quantize(scenes))
+        tracer = get_tracer()
+
+        logger.info(f"Encoding {len(scenes)} scenes with ffmpeg ({self.codec}"
+                    f"{', still images' if self.still_encoding else ''})")
+        with tracer.span('encode', engine='ffmpeg') as span:
+            if self.segment_encoding:
+                self._encode_segments(scenes, str(video_path), Path(output_path).stem)
+            else:
+                stream = chain.from_iterable(self._segment_stream(scenes, i) for i in range(len(scenes)))
+                self._encode(stream, str(video_path))
+            span.count('frames', sum(scene['frame_count'] for scene in scenes))
+
+        audio_path = self.temp_dir / f"{Path(output_path).stem}_audio.wav"
+        try:
+            with tracer.span('mix_audio') as span:
+                tracks, duration = self._audio_tracks(scenes)
+                AudioMixer(self.config).mix(tracks, duration, str(audio_path), background_music)
+                span.count('bytes_written', audio_path.stat().st_size)
+
+            logger.info(f"Muxing audio into {output_path}")
+            with tracer.span('mux') as span:
+                self._mux(str(video_path), str(audio_path), output_path)
+                span.count('bytes_written', Path(output_path).stat().st_size)
+        finally:
+            video_path.unlink()
+            if audio_path.exists():
+                audio_path.unlink()
+        return output_path
+
+    def _frame_counts(self, durations: List[float]) -> List[int]:
+        """Convert durations to frame counts without accumulating rounding drift"""
+        counts = []
+        elapsed = 0.0
+        emitted = 0
+        for duration in durations:
+            elapsed += duration
+            end = round(elapsed * self.fps)
+            counts.append(max(end - emitted, 0))
+            emitted = max(end, emitted)
+        return counts
+
+    def _quantize(self, scenes: List[dict]) -> List[dict]:
+        """Round scene durations to whole frames so video and audio stay in sync"""
+        quantized = []
+        for scene in scenes:
+            frame_count = max(1, round(scene['duration'] * self.fps))
+            quantized.append(dict(scene, duration=frame_count / self.fps,
+                                  frame_count=frame_count))
+        return quantized
+
+    def _plan_transitions(self, scenes: List[dict]) -> List[dict]:
+        """
+        Assign crossfade lengths in frames between adjacent scenes
+
+        Each transition is limited to half of either neighbouring scene, so
+        a scene's incoming and outgoing overlaps never meet.
+
+        Args:
+            scenes: Quantized scenes
+
+        Returns:
+            Scenes with 'transition_in' and 'transition_out' frame counts
+        """
+        length = max(0, round(self.transition_duration * self.fps))
+        planned = [dict(scene, transition_in=0, transition_out=0) for scene in scenes]
+        for previous, scene in zip(planned, planned[1:]):
+            overlap = min(length, previous['frame_count'] // 2, scene['frame_count'] // 2)
+            previous['transition_out'] = overlap
+            scene['transition_in'] = overlap
+        return planned
+
+    def _shots(self, scenes: List[dict]) -> List[tuple]:
+        """Split scenes into (frame path, frame count, shot index in scene) shots"""
+        shots = []
+        for scene in scenes:
+            frames = scene['frames']
+            counts = self._frame_counts([scene['duration'] / len(frames)] * len(frames))
+            # Give any rounding remainder to the last shot
+            counts[-1] += scene['frame_count'] - sum(counts)
+            shots.extend(zip(frames, counts, range(len(frames))))
+        return shots
+
+    def _encoder_args(self) -> List[str]:
+        """Encoder settings shared by every segment so they concat losslessly"""
+        args = ['-an', '-c:v', self.codec, '-pix_fmt', 'yuv420p']
+        if self.preset and self.codec in ('libx264', 'libx265'):
+            args += ['-preset', self.preset]
+        if self.still_encoding:
+            # B-frames would push decode timestamps of long-held frames far
+            # below zero, which stream-copy concat of segments cannot join
+            args += ['-bf', '0']
+            if self.codec == 'libx264':
+                args += ['-tune', 'stillimage']
+        return args
+
+    def _shot_signature(self, scene: dict) -> list:
+        """Frame content and length of each shot in a scene"""
+        return [(file_digest(path), count) for path, count, _ in self._shots([scene])]
+
+    def _segment_key(self, scenes: List[dict], index: int) -> str:
+        """Build segment cache key from frame content, timing and encoder settings"""
+        scene = scenes[index]
+        motion = self.motion.cache_key() if self.motion.enabled else None
+        # A crossfade into this segment also depends on the previous scene's tail
+        previous = self._shot_signature(scenes[index - 1]) if scene['transition_in'] else None
+        return make_key('segment', self._shot_signature(scene),
+                        scene['transition_in'], scene['transition_out'], previous,
+                        self.width, self.height, self.fps, self._encoder_args(), motion)
+
+    def _encode_segments(self, scenes: List[dict], video_path: str, name: str):
+        """Encode each scene separately, reusing cached segments, then concat with stream copy"""
+        segment_paths = []
+        reused = 0
+        tracer = get_tracer()
+
+        try:
+            for i in range(len(scenes)):
+                segment_path = self.temp_dir / f"{name}_segment_{i + 1:05d}.mp4"
+                segment_paths.append(segment_path)
+
+                check_cancelled(self.cancel_event)
+                with tracer.span('segment', scene=i + 1) as span:
+                    cache_key = self._segment_key(scenes, i) if self.segment_cache else None
+                    if cache_key and self.segment_cache.fetch(cache_key, str(segment_path)):
+                        reused += 1
+                        span.count('cache_hits')
+                        continue
+
+                    self._encode(self._segment_stream(scenes, i), str(segment_path))
+                    span.count('cache_misses')
+                    span.count('bytes_written', segment_path.stat().st_size)
+                    if cache_key:
+                        self.segment_cache.put(cache_key, str(segment_path))
+
+            logger.info(f"Encoded {len(scenes) - reused} segments, reused {reused} cached segments")
+            with tracer.span('concat') as span:
+                self._concat_segments(segment_paths, video_path)
+                span.count('bytes_written', Path(video_path).stat().st_size)
+        finally:
+            for segment_path in segment_paths:
+                if segment_path.exists():
+                    segment_path.unlink()
+
+    def _concat_segments(self, segment_paths: List[Path], video_path: str):
+        """Join encoded segments with the concat demuxer without re-encoding"""
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', dir=self.temp_dir,
+                                         delete=False) as listing:
+            for segment_path in segment_paths:
+                escaped = str(segment_path.resolve()).replace("'", "'\\''")
+                listing.write(f"file '{escaped}'\n")
+
+        cmd = [
+            self.ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 'concat', '-safe', '0', '-i', listing.name,
+            '-c', 'copy', video_path
+        ]
+
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        finally:
+            Path(listing.name).unlink()
+
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg concat failed: {result.stderr.decode(errors='replace').strip()}")
+
+    def _load_frame(self, frame_path: str) -> np.ndarray:
+        """Load a frame as an RGB array at the output resolution"""
+        frame = self.frame_store.load(frame_path)
+        if frame.shape[:2] != (self.height, self.width):
+            img = Image.fromarray(frame).resize((self.width, self.height), Image.Resampling.LANCZOS)
+            frame = np.asarray(img)
+        return frame
+
+    def _scene_stream(self, scene: dict, start: int, stop: int) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Stream frames [start, stop) of a scene without materializing repeats
+
+        Args:
+            scene: Quantized scene
+            start: First frame index within the scene
+            stop: Frame index after the last frame
+
+        Yields:
+            (frame, repeat) for still shots, (batch, 1) for zoom/pan shots
+        """
+        shot_start = 0
+        for frame_path, count, variant in self._shots([scene]):
+            shot_stop = shot_start + count
+            first, last = max(start, shot_start), min(stop, shot_stop)
+            if first < last:
+                if self.motion.enabled and count > 1:
+                    # Sampled at the frame's own size, so zooming in stays sharp
+                    frame = self.frame_store.load(frame_path)
+                    for batch in self.motion.render(frame, count, variant,
+                                                    first - shot_start, last - shot_start):
+                        yield batch, 1
+                else:
+                    yield self._load_frame(frame_path), last - first
+            shot_start = shot_stop
+
+    def _segment_stream(self, scenes: List[dict], index: int) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Stream one scene's segment: the crossfade from the previous scene, then
+        the scene's own frames up to where the next crossfade takes over
+
+        Only overlapping frames are blended; all others pass through as-is.
+
+        Args:
+            scenes: Scenes with planned transitions
+            index: Scene index
+
+        Yields:
+            (frames, repeat) items for `_encode`
+        """
+        scene = scenes[index]
+        overlap = scene['transition_in']
+        if overlap:
+            previous = scenes[index - 1]
+            tail = previous['frame_count']
+            yield from crossfade(self._scene_stream(previous, tail - overlap, tail),
+                                 self._scene_stream(scene, 0, overlap), overlap)
+        yield from self._scene_stream(scene, overlap, scene['frame_count'] - scene['transition_out'])
+
+    def _encode(self, stream: Iterable[Tuple[np.ndarray, int]], video_path: str):
+        """Encode a (frames, repeat) stream into a video-only file"""
+        if self.still_encoding:
+            self._encode_stills(stream, video_path)
+        else:
+            self._encode_stream(stream, video_path)
+
+    def _encode_stills(self, stream: Iterable[Tuple[np.ndarray, int]], video_path: str):
+        """
+        Encode a stream of held frames with variable frame rate
+
+        Each distinct frame is written once and listed with how long it is
+        held, so ffmpeg encodes one frame per still instead of one per
+        output frame. Timestamps stay on the fps grid, keeping the audio
+        in sync and segments joinable.
+        """
+        with tempfile.TemporaryDirectory(dir=self.temp_dir) as tmp:
+            entries = []
+            for frames, repeat in stream:
+                check_cancelled(self.cancel_event)
+                held = [(frames, repeat)] if frames.ndim == 3 else [(frame, 1) for frame in frames]
+                for frame, count in held:
+                    frame_path = Path(tmp) / f"{len(entries):06d}.ppm"
+                    Image.fromarray(frame).save(frame_path)
+                    entries.append((frame_path, count))
+            if not entries:
+                raise RuntimeError("No frames to encode")
+
+            # A file is shown from its start only for one frame unless another
+            # follows, so a one-frame copy of the last still marks the end
+            last_path, last_count = entries[-1]
+            if last_count > 1:
+                entries[-1:] = [(last_path, last_count - 1), (last_path, 1)]
+
+            listing = Path(tmp) / 'stills.txt'
+            with open(listing, 'w') as f:
+                f.write('ffconcat version 1.0\n')
+                for frame_path, count in entries:
+                    f.write(f"file '{frame_path.name}'\noption framerate {self.fps}\n"
+                            f"duration {count / self.fps:.6f}\n")
+
+            cmd = [
+                self.ffmpeg, '-y', '-loglevel', 'error',
+                '-f', 'concat', '-safe', '0', '-i', str(listing),
+                '-fps_mode', 'vfr',
+                *self._encoder_args(),
+                video_path
+            ]
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg still encode failed: {result.stderr.decode(errors='replace').strip()}")
+
+    def _encode_stream(self, stream: Iterable[Tuple[np.ndarray, int]], video_path: str):
+        """Pipe a (frames, repeat) stream into a video-only file"""
+        cmd = [
+            self.ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f'{self.width}x{self.height}', '-r', str(self.fps),
+            '-i', '-',
+            *self._encoder_args(),
+            video_path
+        ]
+
+        with tempfile.TemporaryFile() as stderr:
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=stderr)
+            try:
+                # Frame buffers go straight to the pipe, repeated stills are written, not copied
+                for frames, repeat in stream:
+                    check_cancelled(self.cancel_event)
+                    for _ in range(repeat):
+                        proc.stdin.write(frames.data)
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            except BaseException:
+                # Without this ffmpeg would wait for more input forever
+                proc.kill()
+                raise
+            finally:
+                returncode = proc.wait()
+
+            if returncode != 0:
+                stderr.seek(0)
+                raise RuntimeError(f"ffmpeg video encode failed: {stderr.read().decode(errors='replace').strip()}")
+
+    def _audio_tracks(self, scenes: List[dict]) -> tuple:
+        """
+        Place scene voiceovers on the output timeline
+
+        Args:
+            scenes: Scenes with planned transitions
+
+        Returns:
+            (mixer tracks, total duration in seconds)
+        """
+        tracks = []
+        position = 0
+        for scene in scenes:
+            position -= scene['transition_in']
+            tracks.append({
+                'audio': scene.get('audio'),
+                'start': position / self.fps,
+                'duration': scene['frame_count'] / self.fps,
+                'fade_in': scene['transition_in'] / self.fps,
+                'fade_out': scene['transition_out'] / self.fps,
+            })
+            position += scene['frame_count']
+        return tracks, position / self.fps
+
+    def _mux(self, video_path: str, audio_path: str, output_path: str):
+        """Mux the encoded video with the mixed audio track"""
+        cmd = [
+            self.ffmpeg, '-y', '-loglevel', 'error',
+            '-i', video_path, '-i', audio_path,
+            '-map', '0:v', '-map', '1:a',
+            '-c:v', 'copy', '-c:a', 'aac',
+            '-movflags', '+faststart',
+            output_path
+        ]
+
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg mux failed: {result.stderr.decode(errors='replace').strip()}")
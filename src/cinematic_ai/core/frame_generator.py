@@ -1,13 +1,28 @@
 """Frame generator for creating video frames"""
+import math
 from pathlib import Path
 from typing import List, Optional
-from PIL import Image, ImageDraw, ImageFont
-import numpy as np
 import os
+from .frame_store import FrameStore
+from .location_index import LocationIndex
 from ..utils.logger import get_logger
+from ..utils.disk_cache import open_cache, make_key, file_digest
+from ..utils.tracing import get_tracer
 
 logger = get_logger('frame_generator')
 
+# Reduced-scale decode followed by LANCZOS; part of the frame cache key
+RESAMPLE_MODE = 'LANCZOS+reduce'
+REDUCING_GAP = 3.0
+
+
+def _file_size(path: str) -> int:
+    """Size of a file in bytes, 0 if it does not exist"""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
 
 class FrameGenerator:
     """Generates frames for video scenes"""
@@ -25,9 +40,26 @@ class FrameGenerator:
         self.width = config.get('video.resolution.width', 1920)
         self.height = config.get('video.resolution.height', 1080)
         self.mode = config.get('frame_generation.mode', 'slideshow')
+        # Zoom and pan crop into the frame, so frames carry the pixels they
+        # consume; the ffmpeg engine scales still shots back down
+        self.frame_width, self.frame_height = self.width, self.height
+        if config.get('video.engine', 'ffmpeg') == 'ffmpeg':
+            from .motion import KenBurnsEngine
+            self.frame_width, self.frame_height = KenBurnsEngine(config, self.width, self.height).source_size()
+        
+        # Load location images and index their names for matching
+        self.location_index = self._load_location_index()
+        self.location_images = self.location_index.paths
+        # Bumped when an owner reloads the directory, so pool workers rebuild their copy
+        self.generation = 0
         
-        # Load location images
-        self.location_images = self._load_location_images()
+        # Cache of resized frames keyed by source content and target size
+        self.frame_cache = open_cache(config, 'frames')
+        # Format frames are handed to assembly in
+        self.frame_store = FrameStore(config)
+        
+        # Title and fallback cards, created on first use
+        self.text_renderer = None
     
     def _load_location_images(self) -> List[str]:
         """Load all location images from directory"""
@@ -43,6 +75,32 @@ class FrameGenerator:
         logger.info(f"Loaded {len(images)} location images")
         return images
     
+    def _load_location_index(self) -> LocationIndex:
+        """Load persisted location index if the directory is unchanged, else build it"""
+        persist = (self.config.get('frame_generation.persist_location_index', True)
+                   and self.config.get('cache.enabled', True))
+        if not persist or not self.locations_dir.exists():
+            return LocationIndex(self._load_location_images())
+        
+        locations_dir = self.locations_dir.resolve()
+        signature = [str(locations_dir), locations_dir.stat().st_mtime_ns]
+        cache_dir = Path(self.config.get('cache.directory', 'demo/output/cache'))
+        index_path = cache_dir / 'location_index' / f"{make_key(str(locations_dir))}.json"
+        
+        # Paths are stored relative to the directory and joined back onto it
+        # as given this time, so runs from other working directories agree
+        index = LocationIndex.load(str(index_path), signature, str(self.locations_dir))
+        if index is not None:
+            logger.info(f"Loaded location index with {len(index.paths)} images")
+            return index
+        
+        index = LocationIndex(self._load_location_images(), signature)
+        try:
+            index.save(str(index_path), str(self.locations_dir))
+        except OSError as e:
+            logger.warning(f"Could not persist location index: {e}")
+        return index
+    
     def generate_scene_frames(self, scene, character_images: List[str] = None,
                             output_dir: str = None) -> List[str]:
         """
@@ -75,7 +133,37 @@ class FrameGenerator:
             output_path = Path("demo/output/temp")
             output_path.mkdir(parents=True, exist_ok=True)
         
-        # Collect images for this scene
+        with get_tracer().span('frames', scene=scene.number) as span:
+            # Collect images for this scene
+            images_to_use = self.resolve_scene_images(scene, character_images)
+            
+            # If no images, create a text frame
+            if not images_to_use:
+                frame_path = self.frame_store.path(output_path, f"scene_{scene.number}_frame_1")
+                self._create_text_frame(scene, frame_path)
+                frames.append(frame_path)
+            else:
+                # Create frames from images
+                for i, img_path in enumerate(images_to_use):
+                    frame_path = self.frame_store.path(output_path, f"scene_{scene.number}_frame_{i+1}")
+                    self._create_frame_from_image(img_path, frame_path)
+                    frames.append(frame_path)
+            span.count('frames', len(frames))
+        
+        logger.info(f"Generated {len(frames)} frames for scene {scene.number}")
+        return frames
+    
+    def resolve_scene_images(self, scene, character_images: List[str] = None) -> List[str]:
+        """
+        Get the source images a slideshow scene will be built from
+        
+        Args:
+            scene: Scene object
+            character_images: List of character image paths for this scene
+            
+        Returns:
+            Character images followed by the matched location image
+        """
         images_to_use = []
         
         # Add character images
@@ -89,93 +177,124 @@ class FrameGenerator:
             if location_image:
                 images_to_use.append(location_image)
         
-        # If no images, create a text frame
-        if not images_to_use:
-            frame_path = output_path / f"scene_{scene.number}_frame_1.png"
-            self._create_text_frame(scene, str(frame_path))
-            frames.append(str(frame_path))
-        else:
-            # Create frames from images
-            for i, img_path in enumerate(images_to_use):
-                frame_path = output_path / f"scene_{scene.number}_frame_{i+1}.png"
-                self._create_frame_from_image(img_path, str(frame_path))
-                frames.append(str(frame_path))
-        
-        logger.info(f"Generated {len(frames)} frames for scene {scene.number}")
-        return frames
+        return images_to_use
     
     def _find_location_image(self, location: str) -> Optional[str]:
-        """Find location image matching the scene location"""
-        location_lower = location.lower()
-        
-        for img_path in self.location_images:
-            img_name = Path(img_path).stem.lower()
-            if location_lower in img_name or img_name in location_lower:
-                return img_path
-        
-        # Return first location image as fallback
-        return self.location_images[0] if self.location_images else None
+        """Find location image best matching the scene location"""
+        return self.location_index.match(location)
     
     def _create_frame_from_image(self, image_path: str, output_path: str):
         """Create a frame from an image, resizing to target resolution"""
+        with get_tracer().span('frame', source=Path(image_path).name) as span:
+            cache_key = self._frame_cache_key(image_path, output_path)
+            if cache_key and self.frame_cache.fetch(cache_key, output_path):
+                logger.debug(f"Frame cache hit: {image_path}")
+                span.count('cache_hits')
+                return
+            if cache_key:
+                span.count('cache_misses')
+            
+            self._render_frame(image_path, output_path, cache_key)
+            span.count('bytes_read', _file_size(image_path))
+            span.count('bytes_written', _file_size(output_path))
+    
+    def _render_frame(self, image_path: str, output_path: str, cache_key: Optional[str]):
+        """Decode, resize and crop a source image into a frame file"""
+        from PIL import Image
         try:
-            img = Image.open(image_path)
+            img = self._open_source_image(image_path)
             
             # Calculate aspect ratio preserving resize
             img_ratio = img.width / img.height
-            target_ratio = self.width / self.height
+            width, height = self.frame_width, self.frame_height
+            target_ratio = width / height
             
             if img_ratio > target_ratio:
                 # Image is wider, fit to height
-                new_height = self.height
-                new_width = int(self.height * img_ratio)
+                new_height = height
+                new_width = int(height * img_ratio)
             else:
                 # Image is taller, fit to width
-                new_width = self.width
-                new_height = int(self.width / img_ratio)
+                new_width = width
+                new_height = int(width / img_ratio)
             
             # Resize and crop to center
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS,
+                             reducing_gap=REDUCING_GAP)
             
             # Crop to target size
-            left = (new_width - self.width) // 2
-            top = (new_height - self.height) // 2
-            img = img.crop((left, top, left + self.width, top + self.height))
+            left = (new_width - width) // 2
+            top = (new_height - height) // 2
+            img = img.crop((left, top, left + width, top + height))
             
             # Convert to RGB if necessary
             if img.mode != 'RGB':
                 img = img.convert('RGB')
             
-            img.save(output_path)
+            self.frame_store.save(img, output_path)
             logger.debug(f"Created frame: {output_path}")
+            
+            if cache_key:
+                self.frame_cache.put(cache_key, output_path)
         except Exception as e:
             logger.error(f"Error creating frame from {image_path}: {e}")
             # Create fallback text frame
             self._create_text_frame(None, output_path, f"Image Error: {Path(image_path).name}")
     
+    def _open_source_image(self, image_path: str) -> 'Image.Image':
+        """
+        Open a source image, decoding at reduced scale where the codec allows
+        
+        JPEG files are decoded with DCT scaling (1/2, 1/4 or 1/8) to the
+        smallest size still covering the target resolution, so peak memory
+        follows the output size rather than the source megapixels. Other
+        formats are decoded fully and shrunk with integer reduce() before
+        the final LANCZOS pass.
+        
+        Args:
+            image_path: Path to source image
+            
+        Returns:
+            Loaded PIL image
+        """
+        from PIL import Image
+        img = Image.open(image_path)
+        
+        scale = max(self.frame_width / img.width, self.frame_height / img.height)
+        if scale < 1 and img.format == 'JPEG':
+            requested = (math.ceil(img.width * scale), math.ceil(img.height * scale))
+            img.draft('RGB', requested)
+            logger.debug(f"Reduced decode of {image_path} to {img.size}")
+        
+        img.load()
+        return img
+    
+    def _frame_cache_key(self, image_path: str, output_path: str) -> Optional[str]:
+        """Build frame cache key from source content, target size and resample mode"""
+        if not self.frame_cache:
+            return None
+        try:
+            source_hash = file_digest(image_path)
+        except OSError:
+            return None
+        return make_key('frame', source_hash, self.frame_width, self.frame_height,
+                        RESAMPLE_MODE, Path(output_path).suffix.lower())
+    
+    def cache_stats(self) -> dict:
+        """Get frame cache hit/miss statistics"""
+        return self.frame_cache.stats() if self.frame_cache else {}
+    
     def _create_text_frame(self, scene, output_path: str, text: str = None):
         """Create a simple text frame"""
-        img = Image.new('RGB', (self.width, self.height), color='black')
-        draw = ImageDraw.Draw(img)
-        
         if text is None and scene:
             text = f"Scene {scene.number}\n{scene.location}\n{scene.time}"
         elif text is None:
             text = "Cinematic AI"
         
-        # Use default font
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 60)
-        except:
-            font = ImageFont.load_default()
-        
-        # Draw text in center
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        
-        position = ((self.width - text_width) // 2, (self.height - text_height) // 2)
-        draw.text(position, text, fill='white', font=font)
-        
-        img.save(output_path)
+        with get_tracer().span('text_card') as span:
+            if self.text_renderer is None:
+                from .text_renderer import TextRenderer
+                self.text_renderer = TextRenderer(self.config, self.frame_width, self.frame_height)
+            cached = self.text_renderer.write(text, output_path)
+            span.count('cache_hits' if cached else 'cache_misses')
         logger.debug(f"Created text frame: {output_path}")
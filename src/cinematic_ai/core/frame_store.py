@@ -0,0 +1,132 @@
+"""Frame handoff between frame generation and video assembly"""
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+from ..utils.logger import get_logger
+
+logger = get_logger('frame_store')
+
+# Store format -> file extension of the frames it writes
+FORMATS = {
+    'spool': '.ppm',  # Uncompressed, written and read without zlib
+    'memory': '.ppm',  # Spool files plus decoded arrays kept in process
+    'png': '.png',  # Compressed, for inspecting frames or saving disk space
+}
+
+
+class FrameStore:
+    """
+    Writes frames and loads them back as RGB arrays
+
+    Frames are referenced by path so they can cross process boundaries and
+    be recorded in the render manifest; the store format decides how they
+    are encoded. With the 'memory' format, frames saved or loaded in this
+    process are kept decoded, so assembly never decodes them again.
+    """
+
+    # Shared by all stores of the process: path -> ((mtime_ns, size), array)
+    _frames: 'OrderedDict[str, Tuple[tuple, object]]' = OrderedDict()
+    _frames_size = 0
+    _frames_lock = threading.Lock()
+
+    def __init__(self, config):
+        """
+        Initialize frame store
+
+        Args:
+            config: Configuration object
+        """
+        self.format = config.get('frame_generation.store', 'spool')
+        if self.format not in FORMATS:
+            logger.warning(f"Unknown frame store {self.format}, using spool")
+            self.format = 'spool'
+        self.extension = FORMATS[self.format]
+        self.memory_bytes = int(config.get('frame_generation.store_memory_mb', 512) * 1024 * 1024)
+        # Turned off where nothing reads the frames back, e.g. in frame workers
+        self.retain = self.format == 'memory'
+
+    def path(self, directory: str, name: str) -> str:
+        """
+        Get the path of a frame
+
+        Args:
+            directory: Directory for the frame
+            name: Frame name without extension
+
+        Returns:
+            Frame path with the store's extension
+        """
+        return str(Path(directory) / f"{name}{self.extension}")
+
+    def save(self, image, path: str):
+        """
+        Write a frame
+
+        Args:
+            image: RGB PIL image
+            path: Frame path from path()
+        """
+        image.save(path)
+        if self.retain:
+            import numpy as np
+            self._remember(path, np.asarray(image))
+
+    def load(self, path: str) -> 'np.ndarray':
+        """
+        Load a frame as a read-only RGB array
+
+        Args:
+            path: Frame path, any image format PIL reads
+
+        Returns:
+            Array of shape (height, width, 3)
+        """
+        import numpy as np
+        from PIL import Image
+        if self.retain:
+            frame = self._recall(path)
+            if frame is not None:
+                return frame
+
+        with Image.open(path) as img:
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            frame = np.asarray(img)
+        if self.retain:
+            self._remember(path, frame)
+        return frame
+
+    def _recall(self, path: str) -> Optional['np.ndarray']:
+        """Get a kept frame unless its file changed since"""
+        with self._frames_lock:
+            entry = self._frames.get(path)
+            if entry is None:
+                return None
+            self._frames.move_to_end(path)
+        return entry[1] if entry[0] == _file_state(path) else None
+
+    def _remember(self, path: str, frame: 'np.ndarray'):
+        """Keep a decoded frame, evicting the least recently used beyond the size limit"""
+        if frame.nbytes > self.memory_bytes:
+            return
+        frame.flags.writeable = False
+        with self._frames_lock:
+            previous = self._frames.pop(path, None)
+            if previous:
+                FrameStore._frames_size -= previous[1].nbytes
+            self._frames[path] = (_file_state(path), frame)
+            FrameStore._frames_size += frame.nbytes
+            while FrameStore._frames_size > self.memory_bytes:
+                _, (_, evicted) = self._frames.popitem(last=False)
+                FrameStore._frames_size -= evicted.nbytes
+
+
+def _file_state(path: str) -> Optional[tuple]:
+    """Modification time and size identifying a version of a file"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
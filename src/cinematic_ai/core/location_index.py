@@ -0,0 +1,194 @@
+"""Inverted index for ranked location image matching"""
+import json
+import math
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ..utils.logger import get_logger
+
+logger = get_logger('location_index')
+
+# Minimum trigram similarity for a fuzzy match when no token matches
+MIN_TRIGRAM_SCORE = 0.3
+
+# Number of ranked results kept per memoized query
+MAX_RANKED = 10
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a location or file name into lowercase word tokens"""
+    return re.findall(r'[^\W_]+', text.casefold())
+
+
+def trigrams(tokens: List[str]) -> set:
+    """Get character trigrams of the joined tokens"""
+    text = ''.join(tokens)
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class LocationIndex:
+    """Token and trigram inverted index over location image names"""
+
+    VERSION = 2
+
+    def __init__(self, image_paths: List[str], signature: Optional[list] = None):
+        """
+        Build index over image file stems
+
+        Args:
+            image_paths: Location image paths
+            signature: Directory signature used to validate a persisted index
+        """
+        self.paths = sorted(image_paths)
+        self.signature = signature
+        self._tokens: List[List[str]] = [tokenize(Path(path).stem) for path in self.paths]
+        self._build_postings()
+
+    def _build_postings(self):
+        """Build token and trigram posting lists from tokenized names"""
+        self._token_postings: Dict[str, List[int]] = defaultdict(list)
+        self._trigram_postings: Dict[str, List[int]] = defaultdict(list)
+        self._trigram_counts: List[int] = []
+        self._matches: Dict[str, List[Tuple[float, str]]] = {}
+
+        for doc_id, tokens in enumerate(self._tokens):
+            for token in set(tokens):
+                self._token_postings[token].append(doc_id)
+            grams = trigrams(tokens)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._trigram_postings[gram].append(doc_id)
+
+        # Total IDF weight of each name, for weighted Jaccard scoring
+        self._doc_weights = [sum(self._idf(token) for token in set(tokens)) for tokens in self._tokens]
+
+    def _idf(self, token: str) -> float:
+        """Inverse document frequency, unseen tokens weigh like the rarest ones"""
+        df = len(self._token_postings.get(token, ())) or 1
+        return math.log(1 + len(self.paths) / df)
+
+    def rank(self, location: str, limit: int = 5) -> List[Tuple[float, str]]:
+        """
+        Rank location images by similarity to a scene location
+
+        Token overlap is scored as IDF-weighted Jaccard similarity, so rare
+        words such as "coffee" outweigh common ones such as "room". When no
+        token matches, trigram similarity catches variants like
+        "coffeeshop" or plurals.
+
+        Args:
+            location: Scene location (e.g. "COFFEE SHOP")
+            limit: Maximum number of results
+
+        Returns:
+            List of (score, image path), best first
+        """
+        query = set(tokenize(location))
+        if not query or not self.paths:
+            return []
+
+        # Scene locations repeat a lot within a script
+        cache_key = ' '.join(sorted(query))
+        if cache_key in self._matches:
+            return self._matches[cache_key][:limit]
+
+        # Accumulate shared weight per candidate straight from posting lists
+        shared: Dict[int, float] = defaultdict(float)
+        query_weight = 0.0
+        for token in query:
+            weight = self._idf(token)
+            query_weight += weight
+            for doc_id in self._token_postings.get(token, ()):
+                shared[doc_id] += weight
+
+        scored = []
+        if shared:
+            for doc_id, weight in shared.items():
+                union = query_weight + self._doc_weights[doc_id] - weight
+                scored.append((weight / union, doc_id))
+        else:
+            query_grams = trigrams(tokenize(location))
+            counts: Dict[int, int] = defaultdict(int)
+            for gram in query_grams:
+                for doc_id in self._trigram_postings.get(gram, ()):
+                    counts[doc_id] += 1
+            for doc_id, count in counts.items():
+                score = count / (len(query_grams) + self._trigram_counts[doc_id] - count)
+                if score >= MIN_TRIGRAM_SCORE:
+                    scored.append((score, doc_id))
+
+        # Deterministic order: score, then shorter names, then path
+        scored.sort(key=lambda item: (-item[0], len(self._tokens[item[1]]), self.paths[item[1]]))
+        ranked = [(score, self.paths[doc_id]) for score, doc_id in scored[:MAX_RANKED]]
+        self._matches[cache_key] = ranked
+        return ranked[:limit]
+
+    def match(self, location: str) -> Optional[str]:
+        """
+        Find best location image, falling back to the first image
+
+        Args:
+            location: Scene location
+
+        Returns:
+            Image path, or None if the index is empty
+        """
+        ranked = self.rank(location, limit=1)
+        if ranked:
+            return ranked[0][1]
+        return self.paths[0] if self.paths else None
+
+    def save(self, path: str, root: Optional[str] = None):
+        """
+        Persist index to a JSON file
+
+        Args:
+            path: Path to JSON file
+            root: Directory the image paths are stored relative to, so the
+                index stays valid however the directory is spelled later
+        """
+        paths = [os.path.relpath(image, root) for image in self.paths] if root else self.paths
+        data = {
+            'version': self.VERSION,
+            'signature': self.signature,
+            'paths': paths,
+            'tokens': self._tokens,
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, signature: list, root: Optional[str] = None) -> Optional['LocationIndex']:
+        """
+        Load a persisted index if it matches the directory signature
+
+        Args:
+            path: Path to JSON file
+            signature: Current directory signature
+            root: Directory to join the paths onto, as given to save()
+
+        Returns:
+            LocationIndex, or None if missing or stale
+        """
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('version') != cls.VERSION or data.get('signature') != signature:
+            return None
+
+        index = cls.__new__(cls)
+        index.paths = [str(Path(root) / image) for image in data['paths']] if root else data['paths']
+        index.signature = signature
+        index._tokens = data['tokens']
+        index._build_postings()
+        return index
@@ -0,0 +1,106 @@
+"""Scene duration planning ahead of frame and voiceover generation"""
+from typing import List, NamedTuple, Optional, Tuple
+from .script_parser import Scene
+from ..utils.logger import get_logger
+
+logger = get_logger('planner')
+
+
+class ScenePlan(NamedTuple):
+    """Planned place of a scene in the film"""
+    scene: Scene
+    start: float  # Seconds from the start of the film
+    duration: float  # Time budget in seconds, voiceover length or clamped image time
+    source: str  # What the duration is based on: 'tts cache', 'words' or 'images'
+    cut: bool  # True if the scene falls past video.max_duration
+
+
+class DurationPlanner:
+    """Estimates scene durations and decides which scenes fit the film"""
+
+    def __init__(self, config, audio_generator=None):
+        """
+        Initialize duration planner
+
+        Args:
+            config: Configuration object
+            audio_generator: AudioGenerator for speaking rate and cached
+                voiceover durations, None to clamp durations only
+        """
+        self.audio_generator = audio_generator
+        self.max_duration = config.get('video.max_duration', 300)
+        self.min_scene = config.get('scenes.min_duration', 0) or 0
+        self.max_scene = config.get('scenes.max_duration', 0) or None
+        self.image_duration = config.get('frame_generation.slideshow.image_duration', 5)
+        # Word-count estimates are rough, so scenes may run this far past the
+        # limit before being cut; the assembler still enforces the exact limit
+        self.margin = config.get('scenes.plan_margin', 0.1)
+
+    def clamp(self, seconds: float) -> float:
+        """
+        Fit a scene duration into scenes.min_duration and scenes.max_duration
+
+        Args:
+            seconds: Natural scene duration
+
+        Returns:
+            Scene duration in seconds
+        """
+        seconds = max(seconds, self.min_scene)
+        return min(seconds, self.max_scene) if self.max_scene else seconds
+
+    def estimate(self, scene: Scene, image_count: int = 1) -> Tuple[float, str]:
+        """
+        Estimate how long a scene will be on screen
+
+        Scenes with dialogue last as long as their voiceover: its real
+        length if already synthesized, else a speaking-rate estimate.
+        Speech is never truncated, so only scenes without dialogue, which
+        show each image for image_duration, are clamped.
+
+        Args:
+            scene: Scene to estimate
+            image_count: Number of images the scene's frames are built from
+
+        Returns:
+            (duration in seconds, source of the estimate)
+        """
+        if scene.dialogue.strip() and self.audio_generator:
+            cached = self.audio_generator.cached_duration(scene.dialogue)
+            if cached is not None:
+                return cached, 'tts cache'
+            return self.audio_generator.estimate_duration(scene.dialogue), 'words'
+        return self.clamp(max(1, image_count) * self.image_duration), 'images'
+
+    def plan(self, scenes: List[Scene], image_counts: Optional[List[int]] = None) -> List[ScenePlan]:
+        """
+        Lay scenes out on the film timeline
+
+        Scenes are kept in order until one would end past max_duration
+        (plus the margin); it and every later scene are cut, as the
+        assembler would drop them anyway.
+
+        Args:
+            scenes: Parsed scenes
+            image_counts: Images per scene, defaults to one each
+
+        Returns:
+            One plan per scene, in scene order
+        """
+        image_counts = image_counts or [1] * len(scenes)
+        limit = self.max_duration * (1 + self.margin)
+        plans = []
+        start = 0.0
+        cutting = False
+        for scene, image_count in zip(scenes, image_counts):
+            duration, source = self.estimate(scene, image_count)
+            cutting = cutting or start + duration > limit
+            plans.append(ScenePlan(scene, start, duration, source, cutting))
+            if not cutting:
+                start += duration
+
+        cut = [plan.scene.number for plan in plans if plan.cut]
+        if cut:
+            logger.warning(f"Planned {start:.1f}s of video, cutting {len(cut)} scene(s) past the "
+                           f"{self.max_duration}s limit from scene {cut[0]}")
+        return plans
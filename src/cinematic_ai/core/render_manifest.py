@@ -0,0 +1,96 @@
+"""Render manifest for incremental and resumable video generation"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from ..utils.logger import get_logger
+
+logger = get_logger('render_manifest')
+
+
+class RenderManifest:
+    """Records each scene's input fingerprints and produced artifacts per stage"""
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        """
+        Initialize manifest, loading previous state if present
+
+        Args:
+            path: Path to manifest JSON file
+        """
+        self.path = Path(path)
+        self.scenes: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load manifest from disk, ignoring unreadable or outdated files"""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable render manifest {self.path}: {e}")
+            return
+
+        if data.get('version') == self.VERSION:
+            self.scenes = data.get('scenes', {})
+            logger.info(f"Loaded render manifest with {len(self.scenes)} scenes")
+
+    def check(self, scene_number: int, stage: str, fingerprint: str) -> Optional[str]:
+        """
+        Check whether a scene stage must be rebuilt
+
+        Args:
+            scene_number: Scene number
+            stage: Stage name (e.g. 'frames', 'audio')
+            fingerprint: Fingerprint of the stage inputs
+
+        Returns:
+            Reason for rebuilding, or None if recorded artifacts are current
+        """
+        entry = self.scenes.get(str(scene_number), {}).get(stage)
+        if not entry:
+            return 'new'
+        if entry['fingerprint'] != fingerprint:
+            return 'changed'
+        if not all(Path(path).exists() for path in entry['artifacts']):
+            return 'missing artifacts'
+        return None
+
+    def artifacts(self, scene_number: int, stage: str) -> List[str]:
+        """Get recorded artifacts of a scene stage"""
+        entry = self.scenes.get(str(scene_number), {}).get(stage)
+        return list(entry['artifacts']) if entry else []
+
+    def record(self, scene_number: int, stage: str, fingerprint: str,
+               artifacts: List[str]):
+        """
+        Record the artifacts produced for a scene stage
+
+        Args:
+            scene_number: Scene number
+            stage: Stage name
+            fingerprint: Fingerprint of the stage inputs
+            artifacts: Paths of produced files
+        """
+        with self._lock:
+            self.scenes.setdefault(str(scene_number), {})[stage] = {
+                'fingerprint': fingerprint,
+                'artifacts': [str(path) for path in artifacts],
+            }
+
+    def save(self):
+        """Write manifest atomically so a crash never leaves a partial file"""
+        with self._lock:
+            data = {'version': self.VERSION, 'scenes': self.scenes}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp_path, self.path)
@@ -1,21 +1,29 @@
 """Script parser for splitting scripts into scenes"""
+import io
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 from ..utils.logger import get_logger
 
 logger = get_logger('script_parser')
 
+# Scene header (INT./EXT. up to the end of the line)
+SCENE_HEADER = re.compile(r'(?:INT\.|EXT\.)[^\n]+')
+
 
 class Scene:
     """Represents a single scene in the script"""
     
     def __init__(self, number: int, location: str, time: str, 
-                 dialogue: str, characters: List[str] = None):
+                 dialogue: str, characters: List[str] = None,
+                 line_number: int = None, byte_offset: int = None):
         self.number = number
         self.location = location
         self.time = time
         self.dialogue = dialogue
         self.characters = characters or []
+        # Position of the scene start in the source script, if known
+        self.line_number = line_number
+        self.byte_offset = byte_offset
     
     def __repr__(self):
         return f"Scene {self.number}: {self.location} - {self.time}"
@@ -40,59 +48,114 @@ class ScriptParser:
         """
         logger.info("Parsing script into scenes...")
         
-        # Split by scene headers (INT./EXT. pattern)
-        scene_pattern = r'((?:INT\.|EXT\.)[^\n]+)'
-        parts = re.split(scene_pattern, script_text)
+        scenes = list(self.iter_scenes(io.StringIO(script_text)))
         
-        scenes = []
+        logger.info(f"Parsed {len(scenes)} scenes from script")
+        self.scenes = scenes
+        return scenes
+    
+    def iter_scenes(self, script_file: Iterable[str]) -> Iterator[Scene]:
+        """
+        Parse a script line by line, yielding scenes as soon as they end
+        
+        Memory stays bounded by the largest scene, so arbitrarily long
+        screenplays can be consumed from an open file. Scripts without
+        INT./EXT. headers fall back to paragraph scenes, which can only be
+        emitted once the end of the file proves there are no headers.
+        
+        Byte offsets are only exact if line endings reach the parser
+        unchanged, so open files with newline='' (CRLF and CR endings are
+        normalized here, after counting).
+        
+        Args:
+            script_file: Text file object or any iterable of lines
+            
+        Yields:
+            Scene objects with line_number and byte_offset (UTF-8) set
+        """
+        line_number = 0
+        byte_offset = 0
         scene_num = 1
+        header = None
+        content = []
+        preamble = []
         
-        # If no formal scene headers, split by paragraphs
-        if len(parts) <= 1:
-            scenes = self._parse_simple_script(script_text)
-        else:
-            # Process formal screenplay format
-            for i in range(1, len(parts), 2):
-                if i + 1 < len(parts):
-                    header = parts[i].strip()
-                    content = parts[i + 1].strip()
-                    
-                    # Extract location and time from header
-                    location, time = self._parse_scene_header(header)
-                    
-                    # Extract characters and dialogue
-                    characters = self._extract_characters(content)
-                    
-                    scene = Scene(
-                        number=scene_num,
-                        location=location,
-                        time=time,
-                        dialogue=content,
-                        characters=characters
-                    )
-                    scenes.append(scene)
+        for line in script_file:
+            line_number += 1
+            line_bytes = len(line.encode('utf-8'))
+            text = line.rstrip('\r\n')
+            if text != line:
+                line = text + '\n'
+            match = SCENE_HEADER.search(line)
+            
+            if match:
+                before = line[:match.start()]
+                if header:
+                    content.append(before)
+                    yield self._build_scene(scene_num, header, content)
                     scene_num += 1
+                else:
+                    # Text before the first header is not part of any scene
+                    preamble = None
+                
+                header = (match.group(0), line_number,
+                          byte_offset + len(before.encode('utf-8')))
+                content = [line[match.end():]]
+            elif header:
+                content.append(line)
+            else:
+                preamble.append((line, line_number, byte_offset))
+            
+            byte_offset += line_bytes
         
-        logger.info(f"Parsed {len(scenes)} scenes from script")
-        self.scenes = scenes
-        return scenes
+        if header:
+            yield self._build_scene(scene_num, header, content)
+        elif preamble:
+            # If no formal scene headers, split by paragraphs
+            yield from self._iter_paragraph_scenes(preamble)
     
-    def _parse_simple_script(self, script_text: str) -> List[Scene]:
-        """Parse simple script format (paragraphs as scenes)"""
-        paragraphs = [p.strip() for p in script_text.split('\n\n') if p.strip()]
-        scenes = []
+    def _build_scene(self, number: int, header: tuple, content: List[str]) -> Scene:
+        """Build a scene from its header and accumulated content lines"""
+        header_text, line_number, byte_offset = header
+        text = ''.join(content).strip()
         
-        for i, para in enumerate(paragraphs, 1):
-            scene = Scene(
-                number=i,
-                location=f"Scene {i}",
-                time="DAY",
-                dialogue=para,
-                characters=self._extract_characters(para)
-            )
-            scenes.append(scene)
+        # Extract location and time from header
+        location, time = self._parse_scene_header(header_text.strip())
         
-        return scenes
+        return Scene(
+            number=number,
+            location=location,
+            time=time,
+            dialogue=text,
+            characters=self._extract_characters(text),
+            line_number=line_number,
+            byte_offset=byte_offset
+        )
+    
+    def _iter_paragraph_scenes(self, lines: List[tuple]) -> Iterator[Scene]:
+        """Yield simple-format scenes (paragraphs separated by blank lines)"""
+        scene_num = 1
+        paragraph = []
+        
+        for line, line_number, byte_offset in lines + [('\n', None, None)]:
+            if line != '\n':
+                paragraph.append((line, line_number, byte_offset))
+                continue
+            
+            text = ''.join(part for part, _, _ in paragraph).strip()
+            if text:
+                _, first_line, first_offset = paragraph[0]
+                yield Scene(
+                    number=scene_num,
+                    location=f"Scene {scene_num}",
+                    time="DAY",
+                    dialogue=text,
+                    characters=self._extract_characters(text),
+                    line_number=first_line,
+                    byte_offset=first_offset
+                )
+                scene_num += 1
+            paragraph = []
     
     def _parse_scene_header(self, header: str) -> tuple:
         """Extract location and time from scene header"""
@@ -113,4 +176,4 @@ class ScriptParser:
         # Filter out common non-character words
         stop_words = {'INT', 'EXT', 'DAY', 'NIGHT', 'FADE', 'CUT', 'TO'}
         characters = [c.strip() for c in characters if c.strip() not in stop_words]
-        return list(set(characters))  # Remove duplicates
+        return list(dict.fromkeys(characters))  # Remove duplicates, keep first-appearance order
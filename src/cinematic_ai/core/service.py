@@ -0,0 +1,328 @@
+"""Resident render service with a local HTTP job API"""
+import itertools
+import json
+import queue
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from .cancellation import RenderCancelled
+from .video_generator import CinematicAI
+from ..utils.logger import get_logger
+from ..utils.tracing import configure_tracing
+
+logger = get_logger('service')
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class RenderJob:
+    """A render request and its progress"""
+
+    def __init__(self, script: str, characters: str, locations: str, output: str,
+                 music: Optional[str] = None, priority: int = 0, preview: bool = False):
+        self.id = uuid.uuid4().hex[:12]
+        self.script = script
+        self.characters = characters
+        self.locations = locations
+        self.output = output
+        self.music = music
+        self.priority = priority
+        self.preview = preview
+        self.status = QUEUED
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancel_event = threading.Event()
+
+    def to_dict(self) -> dict:
+        """JSON-serializable job state"""
+        elapsed = None
+        if self.started:
+            elapsed = round((self.finished or time.time()) - self.started, 3)
+        return {
+            'id': self.id, 'status': self.status, 'priority': self.priority,
+            'script': self.script, 'characters': self.characters, 'locations': self.locations,
+            'output': self.output, 'music': self.music, 'preview': self.preview, 'error': self.error,
+            'created': self.created, 'started': self.started, 'finished': self.finished,
+            'seconds': elapsed,
+        }
+
+
+class RenderService:
+    """Keeps CinematicAI warm and renders queued jobs by priority"""
+
+    def __init__(self, config_path: Optional[str] = None, workers: Optional[int] = None,
+                 characters: Optional[str] = None, locations: Optional[str] = None):
+        """
+        Initialize service
+
+        Args:
+            config_path: Path to configuration file
+            workers: Jobs rendered concurrently, defaults to service.max_concurrent
+            characters: Default character directory, indexed at startup
+            locations: Default location directory, indexed at startup
+        """
+        self.config_path = config_path
+        self.generator = CinematicAI(config_path)
+        self.config = self.generator.config
+        # The preview generator has its own frame pool and starts on the first preview job
+        self._preview_generator: Optional[CinematicAI] = None
+        self.workers = max(1, workers or self.config.get('service.max_concurrent', 1) or 1)
+        self.max_queue = self.config.get('service.max_queue', 100)
+        self.keep_finished = self.config.get('service.keep_finished', 200)
+        self.output_dir = Path(self.config.get('output.directory', 'demo/output'))
+        self.characters = characters
+        self.locations = locations
+
+        self.jobs: Dict[str, RenderJob] = {}
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._running = 0
+        self._threads: List[threading.Thread] = []
+        self._tracer = configure_tracing(self.config)
+
+        if characters and locations:
+            # Warm the asset indexes so the first job does not pay for them
+            self.generator.load_assets(characters, locations)
+
+    def start(self):
+        """Start the worker threads"""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f'render-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Render service started with {self.workers} workers")
+
+    def stop(self):
+        """Cancel all jobs, wait for running ones to stop and release resources"""
+        with self._lock:
+            for job in self.jobs.values():
+                if job.status == QUEUED:
+                    job.status = CANCELLED
+                    job.finished = time.time()
+                job.cancel_event.set()
+        for _ in self._threads:
+            self._queue.put((float('inf'), next(self._order), None))
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.generator.close()
+        if self._preview_generator:
+            self._preview_generator.close()
+
+    def submit(self, script: str, characters: Optional[str] = None, locations: Optional[str] = None,
+               output: Optional[str] = None, music: Optional[str] = None,
+               priority: int = 0, preview: bool = False) -> RenderJob:
+        """
+        Queue a render
+
+        Args:
+            script: Path to script file
+            characters: Character directory, defaults to the service's
+            locations: Location directory, defaults to the service's
+            output: Output video path, defaults to `<output dir>/<job id>.mp4`
+            music: Optional background music
+            priority: Higher values are rendered first
+            preview: Render a fast low-resolution proxy with the 'preview' profile
+
+        Returns:
+            The queued job
+        """
+        characters = characters or self.characters
+        locations = locations or self.locations
+        if not characters or not locations:
+            raise ValueError("characters and locations directories are required")
+        for path in (script, characters, locations, music):
+            if path and not Path(path).exists():
+                raise ValueError(f"Path not found: {path}")
+
+        job = RenderJob(script, characters, locations, output or '', music, int(priority), bool(preview))
+        if not output:
+            suffix = '_preview' if job.preview else ''
+            job.output = str(self.output_dir / f"{job.id}{suffix}.mp4")
+
+        with self._lock:
+            queued = sum(1 for queued_job in self.jobs.values() if queued_job.status == QUEUED)
+            if queued >= self.max_queue:
+                raise OverflowError(f"Queue is full ({self.max_queue} jobs)")
+            self.jobs[job.id] = job
+            self._prune()
+        self._queue.put((-job.priority, next(self._order), job))
+        logger.info(f"Queued job {job.id} ({Path(script).name}, priority {job.priority})")
+        return job
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond the retention limit"""
+        finished = [job for job in self.jobs.values() if job.finished]
+        for job in sorted(finished, key=lambda job: job.finished)[:max(0, len(finished) - self.keep_finished)]:
+            del self.jobs[job.id]
+
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        """Look up a job by id"""
+        return self.jobs.get(job_id)
+
+    def list(self) -> List[RenderJob]:
+        """All jobs, newest first"""
+        with self._lock:
+            jobs = list(self.jobs.values())
+        return sorted(jobs, key=lambda job: job.created, reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[RenderJob]:
+        """
+        Cancel a job
+
+        Queued jobs are dropped; running jobs stop at the next scene boundary.
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            The job, or None if unknown
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished = time.time()
+            job.cancel_event.set()
+        return job
+
+    def _worker(self):
+        """Render jobs from the queue until stopped"""
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                if job.status != QUEUED:
+                    continue
+                job.status = RUNNING
+                job.started = time.time()
+                self._running += 1
+            self._run(job)
+
+    def _generator(self, preview: bool) -> CinematicAI:
+        """Generator for final or preview renders"""
+        if not preview:
+            return self.generator
+        with self._lock:
+            if self._preview_generator is None:
+                self._preview_generator = CinematicAI(self.config_path, 'preview')
+            return self._preview_generator
+
+    def _run(self, job: RenderJob):
+        """Render one job in its own session"""
+        session = self._generator(job.preview).session()
+        session.cancel_event = job.cancel_event
+        try:
+            with self._tracer.span('job', job=job.id):
+                session.generate_video(job.script, job.characters, job.locations,
+                                       job.output, job.music)
+            status, error = DONE, None
+        except RenderCancelled:
+            status, error = CANCELLED, None
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            status, error = FAILED, str(e)
+
+        with self._lock:
+            job.status, job.error = status, error
+            job.finished = time.time()
+            self._running -= 1
+            idle = self._running == 0
+        logger.info(f"Job {job.id} {status} in {job.finished - job.started:.1f}s")
+
+        if idle and self._tracer.enabled:
+            # Report and release the spans of everything rendered since the last idle moment
+            logger.info("Stage timings:\n" + self._tracer.summary())
+            self._tracer.drain()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """JSON API: POST /jobs, GET /jobs, GET /jobs/<id>, DELETE /jobs/<id>, GET /health"""
+
+    service: RenderService = None
+
+    def do_GET(self):
+        if self.path == '/health':
+            return self._send(200, {'status': 'ok'})
+        if self.path == '/jobs':
+            return self._send(200, {'jobs': [job.to_dict() for job in self.service.list()]})
+        job = self._job()
+        if job:
+            self._send(200, job.to_dict())
+
+    def do_POST(self):
+        if self.path != '/jobs':
+            return self._send(404, {'error': 'not found'})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            job = self.service.submit(
+                request['script'], request.get('characters'), request.get('locations'),
+                request.get('output'), request.get('music'), request.get('priority', 0),
+                request.get('preview', False)
+            )
+        except OverflowError as e:
+            return self._send(503, {'error': str(e)})
+        except (KeyError, TypeError, ValueError) as e:
+            return self._send(400, {'error': f"invalid job: {e}"})
+        self._send(201, job.to_dict())
+
+    def do_DELETE(self):
+        job = self._job()
+        if job:
+            self._send(200, self.service.cancel(job.id).to_dict())
+
+    def _job(self) -> Optional[RenderJob]:
+        """Job addressed by /jobs/<id>, sending 404 if there is none"""
+        job = None
+        if self.path.startswith('/jobs/'):
+            job = self.service.get(self.path[len('/jobs/'):])
+        if job is None:
+            self._send(404, {'error': 'not found'})
+        return job
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def serve(service: RenderService, host: str = '127.0.0.1', port: int = 8765):
+    """
+    Run the HTTP API until interrupted
+
+    Args:
+        service: Render service
+        host: Interface to bind, loopback by default since the API has no authentication
+        port: TCP port
+    """
+    handler = type('RequestHandler', (_RequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    service.start()
+    logger.info(f"Listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
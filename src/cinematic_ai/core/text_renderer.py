@@ -0,0 +1,188 @@
+"""Text card rendering with cached fonts, backgrounds and cards"""
+import io
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+from PIL import Image, ImageDraw, ImageFont
+from ..utils.logger import get_logger
+
+logger = get_logger('text_renderer')
+
+DEFAULT_FONT = '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'
+
+
+class TextStyle(NamedTuple):
+    """Everything besides the text that changes how a card looks"""
+    font: str
+    font_size: int
+    color: str
+    background: str
+    line_spacing: float
+    margin: float
+
+
+@lru_cache(maxsize=32)
+def load_font(face: str, size: int) -> ImageFont.ImageFont:
+    """
+    Load a font once per process
+
+    Args:
+        face: TrueType file path or font name
+        size: Size in pixels
+
+    Returns:
+        The font, or PIL's built-in font if the face cannot be loaded
+    """
+    try:
+        return ImageFont.truetype(face, size)
+    except OSError:
+        logger.warning(f"Font {face} not found, using the built-in font")
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # Pillow < 10.1 has a single bitmap size
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=8)
+def _background(width: int, height: int, color: str) -> Image.Image:
+    """Pre-filled canvas that cards are copied from instead of allocated and filled"""
+    return Image.new('RGB', (width, height), color=color)
+
+
+class TextRenderer:
+    """Renders centered, wrapped text cards and caches them encoded"""
+
+    # Shared by all renderers of the process: (text, style, width, height, format) -> encoded card
+    _cards: 'OrderedDict[tuple, bytes]' = OrderedDict()
+    _cards_size = 0
+    _cards_lock = threading.Lock()
+
+    def __init__(self, config, width: int, height: int):
+        """
+        Initialize text renderer
+
+        Args:
+            config: Configuration object
+            width: Card width
+            height: Card height
+        """
+        self.width = width
+        self.height = height
+        # Font size is configured for 1080p and follows the output height
+        base_size = config.get('text_cards.font_size', 60)
+        self.style = TextStyle(
+            font=config.get('text_cards.font', DEFAULT_FONT),
+            font_size=max(8, round(base_size * height / 1080)),
+            color=config.get('text_cards.color', 'white'),
+            background=config.get('text_cards.background', 'black'),
+            line_spacing=config.get('text_cards.line_spacing', 1.2),
+            margin=config.get('text_cards.margin', 0.08),
+        )
+        self.cache_bytes = int(config.get('text_cards.cache_mb', 32) * 1024 * 1024)
+
+    def write(self, text: str, output_path: str) -> bool:
+        """
+        Write a card to an image file
+
+        Args:
+            text: Card text, newlines start new lines
+            output_path: Path to save the card, its extension picks the format
+
+        Returns:
+            True if the card came from the cache
+        """
+        image_format = Image.registered_extensions().get(Path(output_path).suffix.lower(), 'PNG')
+        key = (text, self.style, self.width, self.height, image_format)
+        with self._cards_lock:
+            data = self._cards.get(key)
+            if data is not None:
+                self._cards.move_to_end(key)
+        hit = data is not None
+
+        if not hit:
+            buffer = io.BytesIO()
+            self.render(text).save(buffer, image_format)
+            data = buffer.getvalue()
+            self._remember(key, data)
+
+        with open(output_path, 'wb') as f:
+            f.write(data)
+        return hit
+
+    def render(self, text: str) -> Image.Image:
+        """
+        Draw a card
+
+        Args:
+            text: Card text
+
+        Returns:
+            RGB image of the card
+        """
+        font = load_font(self.style.font, self.style.font_size)
+        img = _background(self.width, self.height, self.style.background).copy()
+        draw = ImageDraw.Draw(img)
+
+        lines = self.layout(text, font)
+        line_height = self._line_height(font)
+        y = (self.height - line_height * len(lines)) // 2
+        for line, line_width in lines:
+            draw.text(((self.width - line_width) // 2, y), line, fill=self.style.color, font=font)
+            y += line_height
+        return img
+
+    def layout(self, text: str, font: Optional[ImageFont.ImageFont] = None) -> List[Tuple[str, int]]:
+        """
+        Break text into lines that fit between the margins
+
+        Explicit newlines are kept; longer lines wrap at spaces, and words
+        wider than a line are left to overflow rather than split.
+
+        Args:
+            text: Card text
+            font: Font to measure with, defaults to the style's font
+
+        Returns:
+            List of (line, width in pixels)
+        """
+        font = font or load_font(self.style.font, self.style.font_size)
+        max_width = self.width * (1 - 2 * self.style.margin)
+        space = font.getlength(' ')
+
+        lines = []
+        for paragraph in text.split('\n'):
+            line, line_width = [], 0.0
+            for word in paragraph.split():
+                word_width = font.getlength(word)
+                width = line_width + space + word_width if line else word_width
+                if line and width > max_width:
+                    lines.append((' '.join(line), int(line_width)))
+                    line, width = [], word_width
+                line.append(word)
+                line_width = width
+            lines.append((' '.join(line), int(line_width)))
+        return lines
+
+    def _line_height(self, font: ImageFont.ImageFont) -> int:
+        """Distance between baselines of consecutive lines"""
+        try:
+            ascent, descent = font.getmetrics()
+        except AttributeError:
+            ascent, descent = font.getbbox('Ay')[3], 0
+        return int((ascent + descent) * self.style.line_spacing)
+
+    def _remember(self, key: tuple, data: bytes):
+        """Cache an encoded card, evicting the least recently used beyond the size limit"""
+        if len(data) > self.cache_bytes:
+            return
+        with self._cards_lock:
+            if key in self._cards:
+                return
+            self._cards[key] = data
+            TextRenderer._cards_size += len(data)
+            while TextRenderer._cards_size > self.cache_bytes:
+                _, evicted = self._cards.popitem(last=False)
+                TextRenderer._cards_size -= len(evicted)
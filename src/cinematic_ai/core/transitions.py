@@ -0,0 +1,59 @@
+"""Streaming crossfade transitions between scenes"""
+from typing import Iterable, Iterator, Tuple
+import numpy as np
+from .motion import WEIGHT_BITS, WEIGHT_ONE
+
+
+def iter_frames(stream: Iterable[Tuple[np.ndarray, int]]) -> Iterator[np.ndarray]:
+    """
+    Expand a (frames, repeat) stream into single frames
+
+    Args:
+        stream: Items of a single frame (H, W, 3) with a repeat count, or a
+            batch of frames (N, H, W, 3) with repeat 1
+
+    Yields:
+        Frames of shape (H, W, 3)
+    """
+    for frames, repeat in stream:
+        if frames.ndim == 4:
+            yield from frames
+        else:
+            for _ in range(repeat):
+                yield frames
+
+
+def crossfade(outgoing: Iterable[Tuple[np.ndarray, int]],
+              incoming: Iterable[Tuple[np.ndarray, int]],
+              count: int) -> Iterator[Tuple[np.ndarray, int]]:
+    """
+    Blend the overlapping frames of two scenes in fixed-point arithmetic
+
+    Only the `count` overlapping frames are touched; the weight of the
+    incoming scene rises linearly and never reaches 0 or 1, so both cuts
+    of the overlap stay continuous. Output reuses one frame buffer, so each
+    yielded frame must be consumed before advancing.
+
+    Args:
+        outgoing: Stream covering the last `count` frames of the earlier scene
+        incoming: Stream covering the first `count` frames of the later scene
+        count: Number of overlapping frames
+
+    Yields:
+        (frame, 1) items in the same format as the input streams
+    """
+    blended = None
+    pairs = zip(iter_frames(outgoing), iter_frames(incoming))
+    for k, (a, b) in enumerate(pairs):
+        if k >= count:
+            break
+        weight = ((k + 1) * WEIGHT_ONE) // (count + 1)
+        mix = a.astype(np.uint16)
+        mix *= WEIGHT_ONE - weight
+        mix += b.astype(np.uint16) * np.uint16(weight)
+        mix += 1 << (WEIGHT_BITS - 1)
+        mix >>= WEIGHT_BITS
+        if blended is None:
+            blended = np.empty(a.shape, dtype=np.uint8)
+        blended[...] = mix
+        yield blended, 1
@@ -0,0 +1,196 @@
+"""Pluggable text-to-speech backends"""
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+from ..utils.logger import get_logger
+from ..utils.tracing import get_tracer
+
+logger = get_logger('tts_backends')
+
+
+class TTSBackend:
+    """Base class for speech synthesis engines"""
+
+    name = 'base'
+    extension = '.wav'
+    remote = False
+
+    def __init__(self, config):
+        """
+        Initialize backend
+
+        Args:
+            config: Configuration object
+        """
+        self.config = config
+        self.lang = config.get('audio.tts_language', 'en')
+        self.slow = bool(config.get('audio.tts_slow', False))
+        self.concurrency = max(1, config.get('performance.audio_workers', 4) or 1)
+        self.rate_limit = config.get('audio.tts_rate_limit', 0) if self.remote else 0
+
+        self._slots = threading.Semaphore(self.concurrency)
+        self._rate_lock = threading.Lock()
+        self._next_request = 0.0
+
+    def available(self) -> bool:
+        """Check whether the engine can run on this machine"""
+        return True
+
+    def cache_key(self) -> tuple:
+        """Settings that change synthesized speech, for cache keys"""
+        return (self.name, self.lang, self.slow)
+
+    def synthesize(self, text: str, output_path: str):
+        """
+        Synthesize one utterance
+
+        Args:
+            text: Text to speak
+            output_path: Path to save audio file
+        """
+        raise NotImplementedError
+
+    def synthesize_batch(self, jobs: List[Tuple[str, str]]) -> List[Optional[Exception]]:
+        """
+        Synthesize many utterances in one call
+
+        Jobs run concurrently up to the concurrency limit; remote backends
+        additionally space out request starts to respect the rate limit.
+
+        Args:
+            jobs: List of (text, output path)
+
+        Returns:
+            Per job, None on success or the exception that was raised
+        """
+        if not jobs:
+            return []
+        parent = get_tracer().current()
+        if self.concurrency == 1 or len(jobs) == 1:
+            return [self._run_job(text, path, parent) for text, path in jobs]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(jobs))) as pool:
+            return list(pool.map(lambda job: self._run_job(*job, parent), jobs))
+
+    def _run_job(self, text: str, output_path: str, parent=None) -> Optional[Exception]:
+        """Run one synthesis within the concurrency and rate limits"""
+        with self._slots:
+            self._wait_for_rate_limit()
+            with get_tracer().span('tts', parent=parent, backend=self.name) as span:
+                try:
+                    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                    self.synthesize(text, output_path)
+                    span.count('bytes_written', Path(output_path).stat().st_size)
+                    return None
+                except Exception as e:
+                    span.count('failures')
+                    return e
+
+    def _wait_for_rate_limit(self):
+        """Block until the next request may start"""
+        if not self.rate_limit:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request)
+            self._next_request = start + 1.0 / self.rate_limit
+        if start > now:
+            time.sleep(start - now)
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate TTS, needs network access"""
+
+    name = 'gtts'
+    extension = '.mp3'
+    remote = True
+
+    def synthesize(self, text: str, output_path: str):
+        from gtts import gTTS
+        tts = gTTS(text=text, lang=self.lang, slow=self.slow)
+        tts.save(output_path)
+
+
+class EspeakBackend(TTSBackend):
+    """Offline synthesis with the espeak-ng or espeak command line engine"""
+
+    name = 'espeak'
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.binary = shutil.which('espeak-ng') or shutil.which('espeak')
+        self.voice = config.get('audio.espeak_voice', '') or self.lang
+        self.words_per_minute = config.get('audio.words_per_minute', 150)
+
+    def available(self) -> bool:
+        return self.binary is not None
+
+    def cache_key(self) -> tuple:
+        return (self.name, self.voice, self._speed())
+
+    def _speed(self) -> int:
+        """Speaking rate in words per minute, slowed down like gTTS slow mode"""
+        return int(self.words_per_minute * (0.7 if self.slow else 1.0))
+
+    def synthesize(self, text: str, output_path: str):
+        # Text goes over stdin so it is never parsed as options
+        cmd = [self.binary, '-v', self.voice, '-s', str(self._speed()), '-w', output_path, '--stdin']
+        result = subprocess.run(cmd, input=text.encode('utf-8'),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(f"{Path(self.binary).name} failed: "
+                               f"{result.stderr.decode(errors='replace').strip()}")
+
+
+class StubBackend(TTSBackend):
+    """Deterministic silent speech sized by word count, for tests and offline previews"""
+
+    name = 'stub'
+    sample_rate = 22050
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.words_per_minute = config.get('audio.words_per_minute', 150)
+
+    def cache_key(self) -> tuple:
+        return (self.name, self.words_per_minute)
+
+    def synthesize(self, text: str, output_path: str):
+        duration = max(1.0, len(text.split()) * 60.0 / self.words_per_minute)
+        with wave.open(output_path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(b'\0\0' * int(duration * self.sample_rate))
+
+
+TTS_BACKENDS = {
+    backend.name: backend for backend in (GTTSBackend, EspeakBackend, StubBackend)
+}
+
+
+def create_backend(config) -> TTSBackend:
+    """
+    Create the TTS backend selected by `audio.tts_backend`
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        Backend instance; unknown or unavailable engines fall back to the stub
+    """
+    name = config.get('audio.tts_backend', 'gtts')
+    backend_class = TTS_BACKENDS.get(name)
+    if backend_class is None:
+        logger.error(f"Unknown TTS backend '{name}', options: {', '.join(TTS_BACKENDS)}")
+        return StubBackend(config)
+
+    backend = backend_class(config)
+    if not backend.available():
+        logger.error(f"TTS backend '{name}' is not available on this machine, using silent stub voices")
+        return StubBackend(config)
+    return backend
@@ -1,19 +1,38 @@
 """Video assembler using FFmpeg and MoviePy"""
 import os
+import threading
 from pathlib import Path
 from typing import List, Optional
-try:
-    # Try MoviePy 2.x imports
-    from moviepy import ImageClip, AudioFileClip, CompositeAudioClip, concatenate_videoclips
-except ImportError:
-    # Fallback to MoviePy 1.x imports
-    from moviepy.editor import ImageClip, AudioFileClip, CompositeAudioClip, concatenate_videoclips
-
+from .cancellation import RenderCancelled, check_cancelled
+from .frame_store import FrameStore
+from .planner import DurationPlanner
 from ..utils.logger import get_logger
+from ..utils.media_probe import probe_audio
+from ..utils.tracing import get_tracer
 
 logger = get_logger('video_assembler')
 
 
+def _moviepy():
+    """
+    Import MoviePy on first use
+
+    MoviePy is only needed by the fallback engine and takes longer to
+    import than the rest of the package together.
+
+    Returns:
+        Module exposing ImageClip, AudioFileClip, CompositeAudioClip and
+        the concatenate functions
+    """
+    import moviepy
+    if hasattr(moviepy, 'ImageClip'):
+        # MoviePy 2.x exports clips at the top level
+        return moviepy
+    # Fallback to MoviePy 1.x
+    import moviepy.editor
+    return moviepy.editor
+
+
 class VideoAssembler:
     """Assembles final video from frames and audio"""
     
@@ -30,9 +49,14 @@ class VideoAssembler:
         self.height = config.get('video.resolution.height', 1080)
         self.max_duration = config.get('video.max_duration', 300)
         self.codec = config.get('video.codec', 'libx264')
+        self.preset = config.get('video.preset', 'medium')
+        self.engine = config.get('video.engine', 'ffmpeg')
+        self.frame_store = FrameStore(config)
+        self.planner = DurationPlanner(config)
     
     def create_video(self, scenes_data: List[dict], output_path: str,
-                     background_music: Optional[str] = None) -> str:
+                     background_music: Optional[str] = None,
+                     cancel_event: Optional[threading.Event] = None) -> str:
         """
         Create final video from scene data
         
@@ -40,6 +64,7 @@ class VideoAssembler:
             scenes_data: List of dicts with 'frames' and 'audio' paths
             output_path: Path to save output video
             background_music: Optional path to background music
+            cancel_event: Event that stops the render when set
             
         Returns:
             Path to created video
@@ -49,7 +74,34 @@ class VideoAssembler:
         # Create output directory
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         
-        video_clips = []
+        # Decide scene durations and apply the max duration limit
+        with get_tracer().span('plan'):
+            scenes = self._plan_scenes(scenes_data)
+        if not scenes:
+            logger.error("No video clips created")
+            raise ValueError("No valid scenes to create video")
+        
+        if self.engine == 'ffmpeg':
+            from .ffmpeg_renderer import FFmpegRenderer
+            renderer = FFmpegRenderer(self.config)
+            if renderer.available():
+                try:
+                    renderer.render(scenes, output_path, background_music, cancel_event)
+                    logger.info(f"Video created successfully: {output_path}")
+                    return output_path
+                except RenderCancelled:
+                    raise
+                except Exception as e:
+                    logger.error(f"FFmpeg renderer failed, falling back to MoviePy: {e}")
+            else:
+                logger.warning("ffmpeg binary not found, falling back to MoviePy")
+        
+        check_cancelled(cancel_event)
+        return self._render_moviepy(scenes, output_path, background_music)
+    
+    def _plan_scenes(self, scenes_data: List[dict]) -> List[dict]:
+        """Compute scene durations, stopping before the max duration is exceeded"""
+        scenes = []
         total_duration = 0
         
         for i, scene_data in enumerate(scenes_data):
@@ -63,26 +115,48 @@ class VideoAssembler:
                 logger.warning(f"No frames for scene {i+1}, skipping")
                 continue
             
-            # Calculate scene duration
-            if audio_path and os.path.exists(audio_path):
-                audio_clip = AudioFileClip(audio_path)
-                scene_duration = audio_clip.duration
-                audio_clip.close()
+            # Calculate scene duration from audio headers, without decoding
+            info = probe_audio(audio_path) if audio_path else None
+            if info:
+                scene_duration = info.duration
             else:
-                # Default duration per frame
-                scene_duration = len(frames) * self.config.get('frame_generation.slideshow.image_duration', 5)
+                # Default duration per frame, kept within the scene limits;
+                # voiceovers are never clamped so speech is not cut off
+                scene_duration = self.planner.clamp(
+                    len(frames) * self.config.get('frame_generation.slideshow.image_duration', 5))
             
             # Check if we exceed max duration
             if total_duration + scene_duration > self.max_duration:
                 logger.warning(f"Reached max duration limit, stopping at scene {i+1}")
                 break
             
-            # Create clip from frames
-            scene_clip = self._create_scene_clip(frames, scene_duration, audio_path)
-            
-            if scene_clip:
-                video_clips.append(scene_clip)
-                total_duration += scene_duration
+            scenes.append({
+                'frames': frames,
+                'duration': scene_duration,
+                'audio': audio_path
+            })
+            total_duration += scene_duration
+        
+        return scenes
+    
+    def _render_moviepy(self, scenes: List[dict], output_path: str,
+                        background_music: Optional[str] = None) -> str:
+        """Compose and write the video with MoviePy"""
+        from .audio_mixer import AudioMixer
+        mp = _moviepy()
+        video_clips = []
+        rendered = []
+        tracer = get_tracer()
+        
+        with tracer.span('clip_build', engine='moviepy') as span:
+            for scene in scenes:
+                # Create clip from frames, audio is added for the whole film below
+                scene_clip = self._create_scene_clip(scene['frames'], scene['duration'])
+                
+                if scene_clip:
+                    video_clips.append(scene_clip)
+                    rendered.append(scene)
+                    span.count('clips')
         
         if not video_clips:
             logger.error("No video clips created")
@@ -90,48 +164,83 @@ class VideoAssembler:
         
         # Concatenate all scenes
         logger.info("Concatenating video clips...")
-        final_video = concatenate_videoclips(video_clips, method="compose")
+        with tracer.span('concat'):
+            final_video = mp.concatenate_videoclips(video_clips, method="compose")
         
-        # Add background music if provided
-        if background_music and os.path.exists(background_music):
-            logger.info("Adding background music...")
-            final_video = self._add_background_music(final_video, background_music)
+        # Mix voiceovers and background music into one track
+        audio_path = Path(self.config.get('output.temp_directory', 'demo/output/temp')) / \
+            f"{Path(output_path).stem}_audio.wav"
+        try:
+            with tracer.span('mix_audio'):
+                tracks = []
+                start = 0.0
+                for scene in rendered:
+                    tracks.append({'audio': scene['audio'], 'start': start, 'duration': scene['duration']})
+                    start += scene['duration']
+                AudioMixer(self.config).mix(tracks, final_video.duration, str(audio_path), background_music)
+                final_video = self._attach_audio(final_video, str(audio_path))
+        except Exception as e:
+            logger.error(f"Audio mixer failed, compositing audio with MoviePy: {e}")
+            for i, scene in enumerate(rendered):
+                if scene['audio'] and os.path.exists(scene['audio']):
+                    video_clips[i] = self._attach_audio(video_clips[i], scene['audio'])
+            final_video = mp.concatenate_videoclips(video_clips, method="compose")
+            
+            # Add background music if provided
+            if background_music and os.path.exists(background_music):
+                logger.info("Adding background music...")
+                final_video = self._add_background_music(final_video, background_music)
         
         # Write final video
         logger.info(f"Writing final video to {output_path}")
-        final_video.write_videofile(
-            output_path,
-            fps=self.fps,
-            codec=self.codec,
-            audio_codec='aac',
-            temp_audiofile='temp-audio.m4a',
-            remove_temp=True,
-            logger=None  # Suppress moviepy's verbose output
-        )
+        with tracer.span('write') as span:
+            final_video.write_videofile(
+                output_path,
+                fps=self.fps,
+                codec=self.codec,
+                preset=self.preset,
+                audio_codec='aac',
+                temp_audiofile=str(audio_path.with_name(f"{Path(output_path).stem}_temp_audio.m4a")),
+                remove_temp=True,
+                logger=None  # Suppress moviepy's verbose output
+            )
+            span.count('bytes_written', os.path.getsize(output_path))
         
         # Clean up
         final_video.close()
         for clip in video_clips:
             clip.close()
+        if audio_path.exists():
+            audio_path.unlink()
         
         logger.info(f"Video created successfully: {output_path}")
         return output_path
     
+    def _attach_audio(self, clip, audio_path: str):
+        """Set an audio file as the soundtrack of a clip"""
+        audio = _moviepy().AudioFileClip(audio_path)
+        # MoviePy 2.x uses with_audio(), 1.x uses set_audio()
+        try:
+            return clip.with_audio(audio)
+        except AttributeError:
+            return clip.set_audio(audio)
+    
     def _create_scene_clip(self, frames: List[str], duration: float, 
                           audio_path: Optional[str] = None):
         """Create a video clip from frames with audio"""
+        mp = _moviepy()
         try:
             if len(frames) == 1:
                 # Single frame - create static clip
-                clip = ImageClip(frames[0], duration=duration)
+                clip = mp.ImageClip(self.frame_store.load(frames[0]), duration=duration)
             else:
                 # Multiple frames - create slideshow
                 frame_duration = duration / len(frames)
                 frame_clips = [
-                    ImageClip(frame, duration=frame_duration) 
+                    mp.ImageClip(self.frame_store.load(frame), duration=frame_duration)
                     for frame in frames
                 ]
-                clip = concatenate_videoclips(frame_clips, method="compose")
+                clip = mp.concatenate_videoclips(frame_clips, method="compose")
             
             # Set resolution - MoviePy 2.x uses resized(), 1.x uses resize()
             try:
@@ -141,12 +250,7 @@ class VideoAssembler:
             
             # Add audio if available
             if audio_path and os.path.exists(audio_path):
-                audio = AudioFileClip(audio_path)
-                # MoviePy 2.x uses with_audio(), 1.x uses set_audio()
-                try:
-                    clip = clip.with_audio(audio)
-                except AttributeError:
-                    clip = clip.set_audio(audio)
+                clip = self._attach_audio(clip, audio_path)
             
             return clip
         
@@ -156,21 +260,15 @@ class VideoAssembler:
     
     def _add_background_music(self, video_clip, music_path: str):
         """Add background music to video clip"""
+        mp = _moviepy()
         try:
-            bg_music = AudioFileClip(music_path)
+            bg_music = mp.AudioFileClip(music_path)
             
             # Loop background music if video is longer
             if bg_music.duration < video_clip.duration:
                 n_loops = int(video_clip.duration / bg_music.duration) + 1
                 bg_music_clips = [bg_music] * n_loops
-                # MoviePy 2.x and 1.x audio concatenation
-                try:
-                    from moviepy import concatenate_audioclips
-                    bg_music = concatenate_audioclips(bg_music_clips)
-                except ImportError:
-                    # Fallback for MoviePy 1.x
-                    from moviepy.editor import concatenate_audioclips
-                    bg_music = concatenate_audioclips(bg_music_clips)
+                bg_music = mp.concatenate_audioclips(bg_music_clips)
                 
                 # Trim to match video duration
                 try:
@@ -192,7 +290,7 @@ class VideoAssembler:
             
             # Mix with existing audio
             if video_clip.audio:
-                final_audio = CompositeAudioClip([video_clip.audio, bg_music])
+                final_audio = mp.CompositeAudioClip([video_clip.audio, bg_music])
             else:
                 final_audio = bg_music
             
@@ -1,5 +1,11 @@
 """Main video generator orchestrating all components"""
+import atexit
+import copy
 import os
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List
 from .config import Config
@@ -8,21 +14,63 @@ from .character_manager import CharacterManager
 from .frame_generator import FrameGenerator
 from .audio_generator import AudioGenerator
 from .video_assembler import VideoAssembler
+from .planner import DurationPlanner
+from .render_manifest import RenderManifest
+from .cancellation import RenderCancelled, check_cancelled
 from ..utils.logger import setup_logging, get_logger
+from ..utils.disk_cache import make_key, file_digest
+from ..utils.tracing import configure_tracing, get_tracer
+
+# Configuration and frame generators of each worker process of the frame pool
+_worker_config = None
+_worker_frame_generators = {}
+
+
+def _init_frame_worker(config, tracing: bool = False):
+    """Install the configuration in a freshly started worker process"""
+    global _worker_config
+    _worker_config = config
+    # Ctrl-C is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    configure_tracing(enabled=tracing)
+
+
+def _generate_frames_task(locations_dir, generation, scene, character_images, output_dir):
+    """Generate frames for one scene inside a worker process, returning its trace events and cache counts too"""
+    # Workers outlive single renders, so they keep one generator per locations
+    # directory and rebuild it when the parent reloaded that directory
+    key = str(locations_dir)
+    cached = _worker_frame_generators.get(key)
+    if cached is None or cached[0] != generation:
+        frame_generator = FrameGenerator(_worker_config, locations_dir)
+        # Frames are read back by the parent, keeping them decoded here only costs memory
+        frame_generator.frame_store.retain = False
+        cached = _worker_frame_generators[key] = (generation, frame_generator)
+    before = _cache_counts(cached[1])
+    frames = cached[1].generate_scene_frames(scene, character_images, output_dir)
+    counts = tuple(after - start for after, start in zip(_cache_counts(cached[1]), before))
+    return frames, get_tracer().drain(), counts
+
+
+def _cache_counts(frame_generator) -> tuple:
+    """Frame cache (hits, misses, evictions) of a frame generator so far"""
+    stats = frame_generator.cache_stats()
+    return (stats['hits'], stats['misses'], stats['evictions']) if stats else (0, 0, 0)
 
 
 class CinematicAI:
     """Main class for generating cinematic videos from scripts"""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, profile: Optional[str] = None):
         """
         Initialize CinematicAI
         
         Args:
             config_path: Path to configuration file
+            profile: Optional config profile, e.g. 'preview' for a fast proxy render
         """
         # Load configuration
-        self.config = Config(config_path)
+        self.config = Config(config_path, profile)
         
         # Setup logging
         self.logger = setup_logging(self.config)
@@ -32,10 +80,101 @@ class CinematicAI:
         self.script_parser = ScriptParser(self.config)
         self.audio_generator = AudioGenerator(self.config)
         self.video_assembler = VideoAssembler(self.config)
+        self.planner = DurationPlanner(self.config, self.audio_generator)
         
         # These will be initialized when processing
         self.character_manager = None
         self.frame_generator = None
+        self.failed_scenes = []
+        self.render_report = []
+        # Frame cache (hits, misses, evictions) of the last render, worker processes included
+        self.frame_cache_counts = (0, 0, 0)
+        # Set from another thread to stop the render at the next scene boundary
+        self.cancel_event: Optional[threading.Event] = None
+        
+        # Asset managers and the frame worker pool are shared by every render
+        # of this instance, including concurrent sessions
+        self._assets = {}
+        self._assets_lock = threading.Lock()
+        self._frame_pool = None
+        self._frame_pool_lock = threading.Lock()
+    
+    def session(self) -> 'CinematicAI':
+        """
+        Create a generator for running a render concurrently with others
+        
+        The session shares configuration, components, asset indexes, caches
+        and the frame worker pool with this instance but keeps its own
+        per-render state.
+        
+        Returns:
+            New CinematicAI sharing this instance's resources
+        """
+        session = copy.copy(self)
+        session.character_manager = None
+        session.frame_generator = None
+        session.failed_scenes = []
+        session.render_report = []
+        session.frame_cache_counts = (0, 0, 0)
+        session.cancel_event = None
+        return session
+    
+    def close(self):
+        """Shut down the frame worker pool"""
+        with self._frame_pool_lock:
+            if self._frame_pool:
+                atexit.unregister(self._frame_pool.shutdown)
+                self._frame_pool.shutdown(wait=True)
+                self._frame_pool = None
+    
+    def load_assets(self, characters_dir: str, locations_dir: str):
+        """
+        Get character and location managers, reusing those already loaded
+        
+        Reused character managers pick up directory changes incrementally;
+        a location directory whose modification time changed is reloaded.
+        
+        Args:
+            characters_dir: Directory with character images
+            locations_dir: Directory with location images
+            
+        Returns:
+            (CharacterManager, FrameGenerator)
+        """
+        characters_key = ('characters', str(Path(characters_dir).resolve()))
+        locations_key = ('locations', str(Path(locations_dir).resolve()))
+        locations_mtime = _mtime_ns(locations_dir)
+        
+        with self._assets_lock:
+            character_manager = self._assets.get(characters_key)
+            if character_manager is None:
+                character_manager = self._assets[characters_key] = CharacterManager(characters_dir)
+            else:
+                character_manager.refresh()
+            
+            cached = self._assets.get(locations_key)
+            if cached is None or cached[0] != locations_mtime:
+                frame_generator = FrameGenerator(self.config, locations_dir)
+                if cached:
+                    frame_generator.generation = cached[1].generation + 1
+                cached = self._assets[locations_key] = (locations_mtime, frame_generator)
+        
+        return character_manager, cached[1]
+    
+    def _get_frame_pool(self, frame_workers: int) -> ProcessPoolExecutor:
+        """Start the frame worker pool on first use"""
+        with self._frame_pool_lock:
+            if self._frame_pool is None:
+                # Spawn keeps workers independent of the parent's running threads
+                self._frame_pool = ProcessPoolExecutor(
+                    max_workers=frame_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_frame_worker,
+                    initargs=(self.config, get_tracer().enabled)
+                )
+                # Callers that never close() still stop the workers before interpreter teardown
+                atexit.register(self._frame_pool.shutdown)
+            return self._frame_pool
     
     def generate_video(self, script_path: str, characters_dir: str, 
                       locations_dir: str, output_path: str,
@@ -57,59 +196,71 @@ class CinematicAI:
         self.logger.info("Starting video generation process")
         self.logger.info("=" * 60)
         
-        # Initialize managers
-        self.character_manager = CharacterManager(characters_dir)
-        self.frame_generator = FrameGenerator(self.config, locations_dir)
+        # A caller that already traces (e.g. a batch) collects and reports the spans
+        tracer = get_tracer()
+        owns_trace = tracer.current() is None
+        if owns_trace:
+            tracer = configure_tracing(self.config)
+        with tracer.span('generate_video', output=Path(output_path).name):
+            # Initialize managers
+            self.character_manager, self.frame_generator = self.load_assets(characters_dir, locations_dir)
         
-        # Step 1: Parse script
-        self.logger.info("Step 1: Parsing script...")
-        with open(script_path, 'r') as f:
-            script_text = f.read()
-        scenes = self.script_parser.parse_script(script_text)
+            # Step 1: Parse script
+            self.logger.info("Step 1: Parsing script...")
+            with tracer.span('parse') as span, open(script_path, 'r', encoding='utf-8', newline='') as f:
+                scenes = list(self.script_parser.iter_scenes(f))
+                span.count('bytes_read', os.path.getsize(script_path))
+                span.count('scenes', len(scenes))
+            self.logger.info(f"Parsed {len(scenes)} scenes from script")
         
-        if not scenes:
-            raise ValueError("No scenes found in script")
+            if not scenes:
+                raise ValueError("No scenes found in script")
         
-        # Step 2: Process each scene
-        self.logger.info(f"Step 2: Processing {len(scenes)} scenes...")
-        scenes_data = []
+            # Step 2: Process each scene
+            self.logger.info(f"Step 2: Processing {len(scenes)} scenes...")
         
-        temp_dir = Path(self.config.get('output.temp_directory', 'demo/output/temp'))
-        temp_dir.mkdir(parents=True, exist_ok=True)
+            # Each project gets its own work directory so reruns can resume;
+            # `video_preview.mp4` from a profile render shares that of `video.mp4`
+            project = Path(output_path).stem
+            suffix = f"_{self.config.profile}" if self.config.profile else None
+            if suffix and project.endswith(suffix) and project != suffix:
+                project = project[:-len(suffix)]
+            temp_dir = Path(self.config.get('output.temp_directory', 'demo/output/temp'))
+            work_dir = temp_dir / project
+            work_dir.mkdir(parents=True, exist_ok=True)
         
-        for scene in scenes:
-            self.logger.info(f"\nProcessing Scene {scene.number}: {scene.location}")
-            
-            # Get character images for this scene
-            character_images = []
-            for char_name in scene.characters:
-                char_img = self.character_manager.get_character_image(char_name)
-                if char_img:
-                    character_images.append(char_img)
-                    self.logger.info(f"  - Using character: {char_name}")
-            
-            # Generate frames
-            self.logger.info(f"  - Generating frames...")
-            frames = self.frame_generator.generate_scene_frames(
-                scene, character_images, str(temp_dir)
-            )
-            
-            # Generate voiceover
-            self.logger.info(f"  - Generating voiceover...")
-            audio_path = temp_dir / f"scene_{scene.number}_audio.mp3"
-            self.audio_generator.generate_voiceover(scene.dialogue, str(audio_path))
-            
-            scenes_data.append({
-                'scene': scene,
-                'frames': frames,
-                'audio': str(audio_path)
-            })
+            manifest = None
+            if self.config.get('output.resume', True):
+                manifest = RenderManifest(str(work_dir / 'manifest.json'))
         
-        # Step 3: Assemble video
-        self.logger.info("\nStep 3: Assembling final video...")
-        output_video = self.video_assembler.create_video(
-            scenes_data, output_path, background_music
-        )
+            with tracer.span('scenes'):
+                scenes_data = self._process_scenes(scenes, work_dir, manifest)
+        
+            if self.failed_scenes:
+                failed = ', '.join(str(number) for number, _ in self.failed_scenes)
+                self.logger.warning(f"{len(self.failed_scenes)} scene(s) failed and were skipped: {failed}")
+            if not scenes_data:
+                raise ValueError("All scenes failed to process")
+        
+            # Step 3: Assemble video
+            check_cancelled(self.cancel_event)
+            self.logger.info("\nStep 3: Assembling final video...")
+            with tracer.span('assemble'):
+                output_video = self.video_assembler.create_video(
+                    scenes_data, output_path, background_music, self.cancel_event
+                )
+        
+            if self.frame_generator.frame_cache:
+                hits, misses, evictions = self.frame_cache_counts
+                self.logger.info(f"Frame cache: {hits} hits, {misses} misses, {evictions} evictions")
+            tts_stats = self.audio_generator.cache_stats()
+            if tts_stats:
+                self.logger.info(f"TTS cache: {tts_stats['hits']} hits, "
+                                 f"{tts_stats['misses']} misses "
+                                 f"({tts_stats['hit_rate']:.0%} hit rate)")
+        
+        if owns_trace:
+            self._report_trace(tracer, work_dir)
         
         self.logger.info("=" * 60)
         self.logger.info(f"Video generation complete!")
@@ -117,3 +268,258 @@ class CinematicAI:
         self.logger.info("=" * 60)
         
         return output_video
+    
+    def plan(self, script_path: str, characters_dir: str, locations_dir: str) -> List[dict]:
+        """
+        Work out what a render would do without generating any media
+        
+        Parses the script and resolves characters and location images; no
+        image, audio or video library is loaded.
+        
+        Args:
+            script_path: Path to script file
+            characters_dir: Directory with character images
+            locations_dir: Directory with location images
+            
+        Returns:
+            Per scene: 'scene', 'characters' (name -> image path or None),
+            'images' the frames are built from, planned 'duration', its
+            'source' and whether the scene is 'cut' by the max duration
+        """
+        character_manager, frame_generator = self.load_assets(characters_dir, locations_dir)
+        with open(script_path, 'r', encoding='utf-8', newline='') as f:
+            scenes = list(self.script_parser.iter_scenes(f))
+        
+        plan = []
+        for scene in scenes:
+            characters = {name: character_manager.get_character_image(name) for name in scene.characters}
+            images = [image for image in characters.values() if image]
+            plan.append({
+                'scene': scene,
+                'characters': characters,
+                'images': frame_generator.resolve_scene_images(scene, images),
+            })
+        
+        durations = self.planner.plan(scenes, [len(entry['images']) for entry in plan])
+        for entry, scene_plan in zip(plan, durations):
+            entry.update(duration=scene_plan.duration, source=scene_plan.source, cut=scene_plan.cut)
+        return plan
+    
+    def _process_scenes(self, scenes: list, work_dir: Path,
+                        manifest: Optional[RenderManifest] = None) -> List[dict]:
+        """
+        Generate frames and voiceovers for all scenes
+        
+        Frame preparation is CPU-bound and runs in a process pool, voiceovers
+        are synthesized as one batch on a background thread, so both overlap.
+        Results are gathered in scene order; a failing scene is recorded in
+        self.failed_scenes and left out instead of aborting the batch.
+        
+        When a manifest is given, stages whose input fingerprint is unchanged
+        reuse the recorded artifacts, and progress is saved after every scene
+        so an interrupted render resumes where it stopped.
+        
+        Args:
+            scenes: Parsed Scene objects
+            work_dir: Directory for intermediate files
+            manifest: Optional render manifest
+            
+        Returns:
+            List of scene data dicts in scene order
+        """
+        frame_workers = self.config.get('performance.frame_workers', 1) or os.cpu_count() or 1
+        # Frames depend on the resolution, so preview and final renders of a
+        # project keep separate frames while sharing parsing and voiceovers
+        width = self.config.get('video.resolution.width', 1920)
+        height = self.config.get('video.resolution.height', 1080)
+        frames_dir = work_dir / f"frames_{width}x{height}"
+        frames_dir.mkdir(exist_ok=True)
+        stages = {'frames': f"frames@{width}x{height}", 'audio': 'audio'}
+        self.failed_scenes = []
+        self.render_report = []
+        tracer = get_tracer()
+        # Lookups in this process plus those reported back by frame workers
+        local_before = _cache_counts(self.frame_generator)
+        worker_counts = (0, 0, 0)
+        
+        # Get character images and input fingerprints for each scene
+        scene_characters = []
+        fingerprints = []
+        with tracer.span('character_lookup') as span:
+            for scene in scenes:
+                character_images = []
+                for char_name in scene.characters:
+                    char_img = self.character_manager.get_character_image(char_name)
+                    span.count('lookups')
+                    if char_img:
+                        character_images.append(char_img)
+                        self.logger.info(f"  - Scene {scene.number}: using character {char_name}")
+                    else:
+                        span.count('misses')
+                scene_characters.append(character_images)
+        
+        # Leave out scenes that cannot fit the film before generating anything
+        with tracer.span('duration_plan') as span:
+            image_counts = [len(self.frame_generator.resolve_scene_images(scene, character_images))
+                            for scene, character_images in zip(scenes, scene_characters)]
+            kept = [i for i, scene_plan in enumerate(self.planner.plan(scenes, image_counts))
+                    if not scene_plan.cut]
+            span.count('cut', len(scenes) - len(kept))
+        if not kept:
+            raise ValueError(f"Scene {scenes[0].number} alone exceeds the maximum video duration "
+                             f"of {self.planner.max_duration}s")
+        scenes = [scenes[i] for i in kept]
+        scene_characters = [scene_characters[i] for i in kept]
+        
+        with tracer.span('fingerprint'):
+            for scene, character_images in zip(scenes, scene_characters):
+                fingerprints.append({
+                    'frames': self._frames_fingerprint(scene, character_images),
+                    'audio': self._audio_fingerprint(scene),
+                })
+        
+        # Decide which stages must be rebuilt
+        rebuild = []
+        for scene, fingerprint in zip(scenes, fingerprints):
+            reasons = {}
+            for stage in ('frames', 'audio'):
+                reasons[stage] = manifest.check(scene.number, stages[stage], fingerprint[stage]) if manifest else 'no manifest'
+            rebuild.append(reasons)
+        
+        pending_frames = [i for i, reasons in enumerate(rebuild) if reasons['frames']]
+        pending_audio = [i for i, reasons in enumerate(rebuild) if reasons['audio']]
+        
+        frame_pool = None
+        if frame_workers > 1 and len(pending_frames) > 1:
+            frame_pool = self._get_frame_pool(frame_workers)
+        audio_pool = ThreadPoolExecutor(max_workers=1)
+        frame_futures = {}
+        
+        try:
+            self.logger.info(f"  - Generating frames for {len(pending_frames)} scenes ({frame_workers} workers) "
+                             f"and voiceovers for {len(pending_audio)} scenes "
+                             f"({self.audio_generator.tts_backend}, {self.audio_generator.backend.concurrency} workers)...")
+            # All voiceovers go to the TTS backend as one batch
+            extension = self.audio_generator.audio_extension
+            audio_jobs = [
+                (scenes[i].dialogue, str(work_dir / f"scene_{scenes[i].number}_audio{extension}"))
+                for i in pending_audio
+            ]
+            # Filled per render, as sessions share one audio generator
+            fallback_paths = set()
+            audio_batch = audio_pool.submit(self._generate_voiceovers, audio_jobs, fallback_paths,
+                                            tracer.current())
+            audio_index = {i: k for k, i in enumerate(pending_audio)}
+            
+            if frame_pool:
+                for i in pending_frames:
+                    frame_futures[i] = frame_pool.submit(
+                        _generate_frames_task, self.frame_generator.locations_dir,
+                        self.frame_generator.generation, scenes[i], scene_characters[i], str(frames_dir)
+                    )
+            
+            scenes_data = []
+            for i, scene in enumerate(scenes):
+                check_cancelled(self.cancel_event)
+                reasons = rebuild[i]
+                try:
+                    if not reasons['frames']:
+                        frames = manifest.artifacts(scene.number, stages['frames'])
+                    elif frame_pool:
+                        frames, events, counts = frame_futures[i].result()
+                        tracer.merge(events, parent=tracer.current())
+                        worker_counts = tuple(a + b for a, b in zip(worker_counts, counts))
+                    else:
+                        frames = self.frame_generator.generate_scene_frames(
+                            scene, scene_characters[i], str(frames_dir)
+                        )
+                    
+                    if not reasons['audio']:
+                        audio_path = manifest.artifacts(scene.number, 'audio')[0]
+                    else:
+                        audio_path = audio_batch.result()[audio_index[i]]
+                except Exception as e:
+                    self.logger.error(f"Scene {scene.number} failed: {e}")
+                    self.failed_scenes.append((scene.number, str(e)))
+                    continue
+                
+                if manifest:
+                    if reasons['frames']:
+                        manifest.record(scene.number, stages['frames'], fingerprints[i]['frames'], frames)
+                    # Fallback audio is not recorded so the next run retries synthesis
+                    if reasons['audio'] and audio_path not in fallback_paths:
+                        manifest.record(scene.number, 'audio', fingerprints[i]['audio'], [audio_path])
+                    manifest.save()
+                
+                self._report_scene(scene, reasons)
+                scenes_data.append({
+                    'scene': scene,
+                    'frames': frames,
+                    'audio': str(audio_path)
+                })
+        finally:
+            audio_pool.shutdown(wait=True)
+            for future in frame_futures.values():
+                future.cancel()
+        
+        self.frame_cache_counts = tuple(
+            local + worker - before for local, worker, before
+            in zip(_cache_counts(self.frame_generator), worker_counts, local_before)
+        )
+        rebuilt = sum(1 for entry in self.render_report if entry['frames'] or entry['audio'])
+        self.logger.info(f"Rebuilt {rebuilt} scenes, reused {len(self.render_report) - rebuilt} unchanged scenes")
+        return scenes_data
+    
+    def _generate_voiceovers(self, jobs: list, fallback_paths: set, parent=None) -> List[str]:
+        """Synthesize a voiceover batch on a pool thread, traced under the calling span"""
+        with get_tracer().attach(parent):
+            return self.audio_generator.generate_voiceovers(jobs, fallback_paths)
+    
+    def _report_trace(self, tracer, work_dir: Path):
+        """Log the per-stage timing summary and export the Chrome trace"""
+        if not tracer.enabled:
+            return
+        self.logger.info("Stage timings:\n" + tracer.summary())
+        if self.config.get('tracing.export_chrome', True):
+            tracer.export_chrome(str(work_dir / 'trace.json'))
+    
+    def _report_scene(self, scene, reasons: dict):
+        """Record and log which stages of a scene were rebuilt and why"""
+        self.render_report.append({'scene': scene.number, **reasons})
+        rebuilt = [f"{stage} ({reason})" for stage, reason in reasons.items() if reason]
+        if rebuilt:
+            self.logger.info(f"  - Scene {scene.number}: rebuilt {', '.join(rebuilt)}")
+        else:
+            self.logger.info(f"  - Scene {scene.number}: up to date")
+    
+    def _frames_fingerprint(self, scene, character_images: List[str]) -> str:
+        """Fingerprint everything the frames of a scene depend on"""
+        assets = []
+        for image_path in self.frame_generator.resolve_scene_images(scene, character_images):
+            try:
+                assets.append((image_path, file_digest(image_path)))
+            except OSError:
+                assets.append((image_path, None))
+        
+        return make_key(
+            'frames', scene.number, scene.location, scene.time, sorted(scene.characters), assets,
+            self.config.get('video.resolution.width', 1920),
+            self.config.get('video.resolution.height', 1080),
+            self.frame_generator.frame_width, self.frame_generator.frame_height,
+            self.config.get('frame_generation.mode', 'slideshow'),
+            self.frame_generator.frame_store.extension,
+            # Title and fallback cards are drawn with these settings
+            sorted((self.config.get('text_cards') or {}).items())
+        )
+    
+    def _audio_fingerprint(self, scene) -> str:
+        """Fingerprint everything the voiceover of a scene depends on"""
+        return make_key('audio', scene.dialogue, self.audio_generator.backend.cache_key())
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    """Modification time of a path in nanoseconds, None if it does not exist"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
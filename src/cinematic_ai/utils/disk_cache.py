@@ -0,0 +1,296 @@
+"""Content-addressed on-disk LRU cache for generated artifacts"""
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from .logger import get_logger
+
+logger = get_logger('disk_cache')
+
+_digest_memo: Dict[Tuple[str, int, int], str] = {}
+_digest_lock = threading.Lock()
+
+
+def make_key(*parts) -> str:
+    """
+    Build a stable cache key from arbitrary parts
+
+    Args:
+        parts: Values identifying the artifact (hashes, sizes, settings)
+
+    Returns:
+        Hex digest usable as a cache key
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """
+    Get SHA-256 of a file's contents, memoized by (path, mtime, size)
+
+    Args:
+        path: Path to file
+
+    Returns:
+        Hex digest of the file contents
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _digest_lock:
+        digest = _digest_memo.get(memo_key)
+    if digest:
+        return digest
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+
+    with _digest_lock:
+        _digest_memo[memo_key] = digest
+    return digest
+
+
+class DiskCache:
+    """Size-bounded LRU cache storing one file per key"""
+
+    def __init__(self, directory: str, max_bytes: int = 0, name: str = 'cache'):
+        """
+        Initialize disk cache
+
+        Args:
+            directory: Directory holding cached files
+            max_bytes: Maximum total size in bytes, 0 for unlimited
+            name: Name used in log messages
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries: 'OrderedDict[str, Tuple[Path, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load_index(self):
+        """Scan cache directory, ordering entries by last use"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        found = []
+        for shard in self.directory.iterdir():
+            if not shard.is_dir():
+                continue
+            for item in shard.iterdir():
+                if item.name.startswith('.'):
+                    continue
+                stat = item.stat()
+                found.append((stat.st_mtime_ns, item.name.split('.')[0], item, stat.st_size))
+
+        for _, key, path, size in sorted(found):
+            self._entries[key] = (path, size)
+            self.total_bytes += size
+
+        logger.debug(f"Cache '{self.name}': {len(self._entries)} entries, {self.total_bytes} bytes")
+
+    def _lookup(self, key: str) -> Optional[Path]:
+        """Find cached file for key, picking up files written by other processes"""
+        entry = self._entries.get(key)
+        if entry:
+            if entry[0].exists():
+                return entry[0]
+            self._entries.pop(key)
+            self.total_bytes -= entry[1]
+
+        shard = self.directory / key[:2]
+        if shard.is_dir():
+            for path in shard.glob(f"{key}*"):
+                size = path.stat().st_size
+                self._entries[key] = (path, size)
+                self.total_bytes += size
+                return path
+        return None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get path of cached file
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Path to cached file, or None on a miss
+        """
+        with self._lock:
+            path = self._lookup(key)
+            if path is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        try:
+            # Refresh mtime so LRU order survives across runs
+            os.utime(path)
+        except OSError:
+            pass
+        return str(path)
+
+    def peek(self, key: str) -> Optional[str]:
+        """
+        Get path of cached file without counting a hit or miss
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Path to cached file, or None if not cached
+        """
+        with self._lock:
+            path = self._lookup(key)
+        return str(path) if path else None
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """
+        Copy cached file to output path
+
+        Args:
+            key: Cache key
+            output_path: Destination path
+
+        Returns:
+            True on a cache hit
+        """
+        cached = self.get(key)
+        if cached is None:
+            return False
+        try:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(cached, output_path)
+            return True
+        except OSError as e:
+            logger.warning(f"Cache '{self.name}': failed to copy {cached}: {e}")
+            return False
+
+    def put(self, key: str, source_path: str) -> Optional[str]:
+        """
+        Store a copy of a file in the cache
+
+        Args:
+            key: Cache key
+            source_path: File to store
+
+        Returns:
+            Path to cached file, or None if it could not be stored
+        """
+        source = Path(source_path)
+        shard = self.directory / key[:2]
+        target = shard / f"{key}{source.suffix}"
+        tmp = shard / f".{key}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            shard.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, tmp)
+            os.replace(tmp, target)
+            size = target.stat().st_size
+        except OSError as e:
+            logger.warning(f"Cache '{self.name}': failed to store {source_path}: {e}")
+            if tmp.exists():
+                tmp.unlink()
+            return None
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (target, size)
+            self.total_bytes += size
+            self._evict(keep=key)
+
+        return str(target)
+
+    def _evict(self, keep: str):
+        """Remove least recently used entries until under the size limit"""
+        if self.max_bytes <= 0:
+            return
+
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, (path, size) = next(iter(self._entries.items()))
+            if key == keep:
+                self._entries.move_to_end(key)
+                continue
+            self._entries.pop(key)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            logger.debug(f"Cache '{self.name}': evicted {path.name}")
+
+    def clear(self):
+        """Remove all cached files"""
+        with self._lock:
+            for path, _ in self._entries.values():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and size information"""
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+
+def open_cache(config, name: str) -> Optional[DiskCache]:
+    """
+    Open a named cache configured under the 'cache' section
+
+    Args:
+        config: Configuration object
+        name: Cache name (e.g. 'frames'), also used as subdirectory
+
+    Returns:
+        DiskCache instance, or None if caching is disabled
+    """
+    if config is None or not config.get('cache.enabled', True):
+        return None
+
+    directory = Path(config.get('cache.directory', 'demo/output/cache')) / name
+    max_mb = config.get(f'cache.{name}_max_mb', 0) or 0
+    try:
+        return DiskCache(str(directory), int(max_mb * 1024 * 1024), name=name)
+    except OSError as e:
+        logger.warning(f"Cache '{name}' disabled: {e}")
+        return None
@@ -0,0 +1,247 @@
+"""Header-only media probing with a metadata cache"""
+import os
+import re
+import shutil
+import struct
+import subprocess
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+from .logger import get_logger
+
+logger = get_logger('media_probe')
+
+
+class AudioInfo(NamedTuple):
+    """Audio stream timing read from file headers"""
+    duration: float
+    sample_rate: int
+    channels: int
+
+
+_probe_memo: Dict[Tuple[str, int, int], Optional[AudioInfo]] = {}
+_probe_lock = threading.Lock()
+
+# MPEG audio header tables, indexed by [version][layer]
+_MP3_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 2.5: (11025, 12000, 8000)}
+
+# Bytes read from the start of a file, enough for ID3-less headers and VBR tags
+_HEADER_BYTES = 64 * 1024
+
+
+def find_ffmpeg() -> Optional[str]:
+    """Locate ffmpeg on PATH, falling back to the binary bundled with imageio-ffmpeg"""
+    path = shutil.which('ffmpeg')
+    if path:
+        return path
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+def probe_audio(path: str) -> Optional[AudioInfo]:
+    """
+    Read duration, sample rate and channel count without decoding audio
+
+    WAV and MP3 headers are parsed directly; other formats fall back to
+    the container headers reported by `ffmpeg -i`. Results are memoized
+    by (path, mtime, size), so repeated lookups across stages are free.
+
+    Args:
+        path: Path to audio file
+
+    Returns:
+        AudioInfo, or None if the file is missing or cannot be probed
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _probe_lock:
+        if memo_key in _probe_memo:
+            return _probe_memo[memo_key]
+
+    info = None
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(_HEADER_BYTES)
+        if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+            info = _probe_wav(path)
+        elif head[:3] == b'ID3' or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+            info = _probe_mp3(path, head, stat.st_size)
+    except (OSError, struct.error, ValueError) as e:
+        logger.warning(f"Could not parse audio headers of {path}: {e}")
+
+    if info is None:
+        info = _probe_ffmpeg(path)
+    if info is None:
+        logger.error(f"Could not probe audio file: {path}")
+
+    with _probe_lock:
+        _probe_memo[memo_key] = info
+    return info
+
+
+def _probe_wav(path: str) -> Optional[AudioInfo]:
+    """Read timing from the RIFF fmt and data chunks"""
+    with open(path, 'rb') as f:
+        f.seek(12)
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, size = struct.unpack('<4sI', chunk)
+            if chunk_id == b'fmt ':
+                fmt = struct.unpack('<HHIIH', f.read(14))
+                f.seek(size - 14 + (size & 1), os.SEEK_CUR)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    return None
+                _, channels, sample_rate, byte_rate, _ = fmt
+                if not byte_rate:
+                    return None
+                # Streamed WAVs may leave the size unset, use what is on disk
+                size = min(size, os.fstat(f.fileno()).st_size - f.tell())
+                return AudioInfo(size / byte_rate, sample_rate, channels)
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+
+
+def _probe_mp3(path: str, head: bytes, file_size: int) -> Optional[AudioInfo]:
+    """Read timing from the first MPEG frame and its Xing/Info or VBRI tag"""
+    offset = 0
+    if head[:3] == b'ID3':
+        # Syncsafe tag size, plus a footer if flagged
+        size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        offset = 10 + size + (10 if head[5] & 0x10 else 0)
+        if offset + 4 > len(head):
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                head = f.read(_HEADER_BYTES)
+            file_size -= offset
+            offset = 0
+
+    # Find the first frame header that is followed by another one where its
+    # length says; a lone sync pattern in tag or ADTS data is not trusted,
+    # and leaving it unconfirmed sends the file to the full decoder
+    while offset + 4 <= len(head):
+        if head[offset] == 0xFF and head[offset + 1] & 0xE0 == 0xE0:
+            frame = _parse_mp3_header(head[offset:offset + 4])
+            if frame:
+                following = offset + frame[5]
+                second = _parse_mp3_header(head[following:following + 4])
+                if second and second[:2] == frame[:2] and second[3] == frame[3]:
+                    break
+        offset += 1
+    else:
+        return None
+
+    version, layer, bitrate, sample_rate, channels, _ = frame
+    samples_per_frame = 384 if layer == 1 else (1152 if layer == 2 or version == 1 else 576)
+
+    # VBR tags sit after the side information of the first frame
+    if version == 1:
+        side_info = 32 if channels == 2 else 17
+    else:
+        side_info = 17 if channels == 2 else 9
+    tag = offset + 4 + side_info
+    if head[tag:tag + 4] in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', head[tag + 4:tag + 8])[0]
+        if flags & 1:
+            frames = struct.unpack('>I', head[tag + 8:tag + 12])[0]
+            samples = frames * samples_per_frame
+            # LAME tag stores encoder delay and padding added around the audio
+            lame = tag + 8 + 4 * bin(flags & 0x0B).count('1') + (100 if flags & 0x04 else 0)
+            if head[lame:lame + 4] in (b'LAME', b'Lavc', b'Lavf') and len(head) >= lame + 24:
+                delay = (head[lame + 21] << 4) | (head[lame + 22] >> 4)
+                padding = ((head[lame + 22] & 0x0F) << 8) | head[lame + 23]
+                samples = max(samples - delay - padding, 0)
+            return AudioInfo(samples / sample_rate, sample_rate, channels)
+
+    vbri = offset + 4 + 32
+    if head[vbri:vbri + 4] == b'VBRI':
+        frames = struct.unpack('>I', head[vbri + 14:vbri + 18])[0]
+        return AudioInfo(frames * samples_per_frame / sample_rate, sample_rate, channels)
+
+    # Constant bitrate: the stream size gives the duration
+    audio_bytes = file_size - offset
+    with open(path, 'rb') as f:
+        f.seek(-128, os.SEEK_END)
+        if f.read(3) == b'TAG':
+            audio_bytes -= 128
+    return AudioInfo(audio_bytes * 8 / (bitrate * 1000), sample_rate, channels)
+
+
+def _parse_mp3_header(header: bytes) -> Optional[tuple]:
+    """
+    Decode an MPEG audio frame header
+
+    Reserved versions, layer 00 (used by ADTS AAC), free-format and
+    reserved bitrates and the reserved sample rate are rejected.
+
+    Returns:
+        (version, layer, bitrate, sample rate, channels, frame length in
+        bytes), or None if the bytes are not a valid header
+    """
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    value = struct.unpack('>I', header)[0]
+    version = {0: 2.5, 2: 2, 3: 1}.get((value >> 19) & 0x3)
+    layer = {1: 3, 2: 2, 3: 1}.get((value >> 17) & 0x3)
+    bitrate_index = (value >> 12) & 0xF
+    rate_index = (value >> 10) & 0x3
+    if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    bitrate = _MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index]
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    channels = 1 if (value >> 6) & 0x3 == 3 else 2
+    padding = (value >> 9) & 0x1
+    if layer == 1:
+        length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    else:
+        # MPEG-2/2.5 Layer III frames hold half the samples of MPEG-1 ones
+        coefficient = 72 if layer == 3 and version != 1 else 144
+        length = coefficient * bitrate * 1000 // sample_rate + padding
+    return version, layer, bitrate, sample_rate, channels, length
+
+
+def _probe_ffmpeg(path: str) -> Optional[AudioInfo]:
+    """Read timing from the container headers reported by `ffmpeg -i`"""
+    ffmpeg = find_ffmpeg()
+    if not ffmpeg:
+        return None
+
+    try:
+        result = subprocess.run([ffmpeg, '-hide_banner', '-i', path],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=30)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"ffmpeg probe failed for {path}: {e}")
+        return None
+
+    output = result.stderr.decode(errors='replace')
+    duration = re.search(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)', output)
+    stream = re.search(r'Audio: [^\n]*?(\d+) Hz, ([^,\n]+)', output)
+    if not duration or not stream:
+        return None
+
+    hours, minutes, seconds = duration.groups()
+    layout = stream.group(2).strip()
+    channels = {'mono': 1, 'stereo': 2}.get(layout)
+    if channels is None:
+        match = re.match(r'(\d+) channels', layout)
+        channels = int(match.group(1)) if match else 2
+    return AudioInfo(int(hours) * 3600 + int(minutes) * 60 + float(seconds),
+                     int(stream.group(1)), channels)
@@ -0,0 +1,229 @@
+"""Hierarchical timing spans with counters and Chrome trace export"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from .logger import get_logger
+
+logger = get_logger('tracing')
+
+
+class Span:
+    """A timed region of work with named counters"""
+
+    __slots__ = ('name', 'path', 'args', 'counters')
+
+    def __init__(self, name: str, path: str, args: dict):
+        self.name = name
+        self.path = path
+        self.args = args
+        self.counters: Dict[str, float] = {}
+
+    def count(self, key: str, amount: float = 1):
+        """Add to a counter such as 'bytes_written' or 'cache_hits'"""
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+
+class _NullSpan:
+    """Span stand-in used while tracing is disabled"""
+
+    __slots__ = ()
+
+    def count(self, key: str, amount: float = 1):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Records nested spans per thread as Chrome trace events"""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize tracer
+
+        Args:
+            enabled: Record spans; when False, span() costs one attribute check
+        """
+        self.enabled = enabled
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name: str, category: str = 'stage', parent: Optional[Span] = None,
+             **args) -> Iterator[Span]:
+        """
+        Time a block of work as a child of the current span on this thread
+
+        Args:
+            name: Span name (e.g. 'parse', 'frames')
+            category: Trace category
+            parent: Span to nest under instead of this thread's current span,
+                for work handed to pool threads
+            args: Extra values shown with the span (e.g. scene number)
+
+        Yields:
+            Span whose counters are stored with it
+        """
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = parent or (stack[-1] if stack else None)
+        path = f"{parent.path}/{name}" if isinstance(parent, Span) else name
+        span = Span(name, path, args)
+        stack.append(span)
+        start = time.perf_counter_ns()
+        try:
+            yield span
+        finally:
+            duration = time.perf_counter_ns() - start
+            stack.pop()
+            event = {
+                'name': name, 'cat': category, 'ph': 'X',
+                'ts': start / 1000.0, 'dur': duration / 1000.0,
+                'pid': os.getpid(), 'tid': threading.get_ident(),
+                'args': {'path': path, **args, 'counters': span.counters},
+            }
+            with self._lock:
+                self.events.append(event)
+
+    @contextmanager
+    def attach(self, parent: Optional[Span]) -> Iterator[None]:
+        """Nest spans opened on this thread under a span from another thread"""
+        if not self.enabled or not isinstance(parent, Span):
+            yield
+            return
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(parent)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def current(self) -> Optional[Span]:
+        """Innermost open span on this thread"""
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def drain(self) -> List[dict]:
+        """Take all recorded events, e.g. to send them from a worker process"""
+        with self._lock:
+            events, self.events = self.events, []
+        return events
+
+    def merge(self, events: List[dict], parent: Optional[Span] = None):
+        """
+        Add events recorded by another tracer, such as a worker process
+
+        Args:
+            events: Events from drain()
+            parent: Span to nest the events' paths under
+        """
+        if not self.enabled or not events:
+            return
+        if isinstance(parent, Span):
+            for event in events:
+                event['args']['path'] = f"{parent.path}/{event['args']['path']}"
+        with self._lock:
+            self.events.extend(events)
+
+    def export_chrome(self, path: str):
+        """
+        Write events as Chrome trace-event JSON
+
+        The file opens in chrome://tracing or https://ui.perfetto.dev.
+
+        Args:
+            path: Output JSON path
+        """
+        with self._lock:
+            events = list(self.events)
+        names = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': f'cinematic-ai {pid}'}}
+                 for pid in sorted({event['pid'] for event in events})]
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': names + events, 'displayTimeUnit': 'ms'}, f)
+        logger.info(f"Chrome trace written to {path}")
+
+    def summary(self) -> str:
+        """
+        Aggregate spans by their path into a table
+
+        Returns:
+            Table with call count, total and mean time and summed counters
+            per span path, children indented under their parents
+        """
+        with self._lock:
+            events = list(self.events)
+
+        rows: Dict[str, dict] = {}
+        first_seen: Dict[str, float] = {}
+        for event in events:
+            path = event['args']['path']
+            row = rows.setdefault(path, {'count': 0, 'total': 0.0, 'max': 0.0, 'counters': defaultdict(float)})
+            row['count'] += 1
+            row['total'] += event['dur']
+            row['max'] = max(row['max'], event['dur'])
+            first_seen[path] = min(first_seen.get(path, event['ts']), event['ts'])
+            for key, value in event['args']['counters'].items():
+                row['counters'][key] += value
+
+        # Parents before children, siblings in order of first appearance
+        def sort_key(path: str) -> list:
+            parts = path.split('/')
+            return [(first_seen.get('/'.join(parts[:i + 1]), 0.0), parts[i]) for i in range(len(parts))]
+
+        lines = [f"{'Span':<34} {'Count':>6} {'Total s':>9} {'Mean ms':>9} {'Max ms':>9}  Counters"]
+        for path in sorted(rows, key=sort_key):
+            row = rows[path]
+            depth = path.count('/')
+            label = '  ' * depth + path.rsplit('/', 1)[-1]
+            counters = ', '.join(f"{key}={_format_count(key, value)}" for key, value in sorted(row['counters'].items()))
+            lines.append(f"{label:<34} {row['count']:>6} {row['total'] / 1e6:>9.3f} "
+                         f"{row['total'] / row['count'] / 1e3:>9.1f} {row['max'] / 1e3:>9.1f}  {counters}")
+        return '\n'.join(lines)
+
+
+def _format_count(key: str, value: float) -> str:
+    """Format counter values, bytes in kilobytes or megabytes"""
+    if key.startswith('bytes_'):
+        return f"{value / 1e6:.1f}MB" if value >= 1e5 else f"{value / 1e3:.1f}KB"
+    return f"{value:g}"
+
+
+_tracer = Tracer(enabled=False)
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer"""
+    return _tracer
+
+
+def configure_tracing(config=None, enabled: Optional[bool] = None) -> Tracer:
+    """
+    Install a fresh process-wide tracer
+
+    Args:
+        config: Configuration object, reads tracing.enabled
+        enabled: Explicit override of the configured setting
+
+    Returns:
+        The new tracer
+    """
+    global _tracer
+    if enabled is None:
+        enabled = config.get('tracing.enabled', True) if config else True
+    _tracer = Tracer(enabled=enabled)
+    return _tracer
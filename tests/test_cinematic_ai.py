@@ -1,6 +1,7 @@
 """Unit tests for CinematicAI components"""
 import unittest
 import sys
+import tempfile
 from pathlib import Path
 
 # Add src to path
@@ -29,6 +30,15 @@ class TestConfig(unittest.TestCase):
         missing = config.get('nonexistent.key', 'default')
         self.assertEqual(missing, 'default')
 
+    def test_preview_profile(self):
+        """Test that a profile overrides only the keys it sets"""
+        config = Config(profile='preview')
+        self.assertEqual(config.get('video.resolution.width'), 640)
+        self.assertEqual(config.get('video.preset'), 'ultrafast')
+        self.assertEqual(config.get('video.codec'), Config().get('video.codec'))
+        with self.assertRaises(ValueError):
+            Config(profile='nonexistent')
+
 
 class TestScriptParser(unittest.TestCase):
     """Test script parsing"""
@@ -87,6 +97,260 @@ And here is the third scene.
         self.assertEqual(scene.time, "DAY")
         self.assertIn("SARAH", scene.characters)
 
+    def test_iter_scenes_streams_with_offsets(self):
+        """Test streaming parser yields scenes with line and byte offsets"""
+        import io
+        
+        script = "Preamble\nINT. CAFÉ - DAY\nSARAH waves.\nEXT. PARK - NIGHT\nJOHN runs.\n"
+        scenes = list(ScriptParser().iter_scenes(io.StringIO(script)))
+        
+        self.assertEqual([s.location for s in scenes], ["CAFÉ", "PARK"])
+        self.assertEqual([s.line_number for s in scenes], [2, 4])
+        raw = script.encode('utf-8')
+        self.assertTrue(raw[scenes[1].byte_offset:].startswith(b"EXT. PARK"))
+        self.assertEqual(scenes[0].dialogue, "SARAH waves.")
+    
+    def test_iter_scenes_offsets_with_crlf(self):
+        """Test byte offsets stay exact on files with Windows line endings"""
+        script = "Preamble\r\nINT. CAFÉ - DAY\r\nSARAH waves.\r\nEXT. PARK - NIGHT\r\nJOHN runs.\r\n"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'script.txt'
+            path.write_bytes(script.encode('utf-8'))
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                scenes = list(ScriptParser().iter_scenes(f))
+        
+        raw = script.encode('utf-8')
+        self.assertTrue(raw[scenes[0].byte_offset:].startswith("INT. CAFÉ".encode('utf-8')))
+        self.assertTrue(raw[scenes[1].byte_offset:].startswith(b"EXT. PARK"))
+        self.assertEqual(scenes[0].location, "CAFÉ")
+        self.assertEqual(scenes[0].dialogue, "SARAH waves.")
+    
+    def test_characters_in_order_of_appearance(self):
+        """Test that extracted characters are deterministic across runs"""
+        parser = ScriptParser()
+        characters = parser._extract_characters("SARAH waves. JOHN nods. SARAH leaves.")
+        self.assertEqual(characters, ["SARAH", "JOHN"])
+
+
+class TestRenderManifest(unittest.TestCase):
+    """Test incremental render manifest"""
+    
+    def test_rebuild_reasons(self):
+        """Test new, changed, missing and up-to-date scene stages"""
+        from cinematic_ai.core.render_manifest import RenderManifest
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            artifact = Path(tmp) / 'scene_1_audio.mp3'
+            artifact.write_bytes(b'audio')
+            manifest = RenderManifest(f"{tmp}/manifest.json")
+            self.assertEqual(manifest.check(1, 'audio', 'fp1'), 'new')
+            
+            manifest.record(1, 'audio', 'fp1', [str(artifact)])
+            manifest.save()
+            
+            reloaded = RenderManifest(f"{tmp}/manifest.json")
+            self.assertIsNone(reloaded.check(1, 'audio', 'fp1'))
+            self.assertEqual(reloaded.check(1, 'audio', 'fp2'), 'changed')
+            self.assertEqual(reloaded.artifacts(1, 'audio'), [str(artifact)])
+            
+            artifact.unlink()
+            self.assertEqual(reloaded.check(1, 'audio', 'fp1'), 'missing artifacts')
+
+
+class TestLocationIndex(unittest.TestCase):
+    """Test ranked location matching"""
+    
+    def setUp(self):
+        from cinematic_ai.core.location_index import LocationIndex
+        self.index = LocationIndex([
+            'loc/park.jpg', 'loc/coffee_shop.jpg', 'loc/shop.jpg',
+            'loc/apartment.jpg', 'loc/central_park_night.jpg',
+        ])
+    
+    def test_ranked_token_match(self):
+        """Test that the most specific name wins over first substring hit"""
+        self.assertEqual(self.index.match('COFFEE SHOP'), 'loc/coffee_shop.jpg')
+        self.assertEqual(self.index.match('SHOP'), 'loc/shop.jpg')
+        self.assertEqual(self.index.match('PARK'), 'loc/park.jpg')
+        self.assertEqual(self.index.match('CENTRAL PARK - NIGHT'), 'loc/central_park_night.jpg')
+    
+    def test_fuzzy_and_fallback(self):
+        """Test trigram matching and deterministic fallback"""
+        self.assertEqual(self.index.match('APARTMENTS'), 'loc/apartment.jpg')
+        self.assertEqual(self.index.match('SPACESHIP'), 'loc/apartment.jpg')
+    
+    def test_persisted_index(self):
+        """Test that a saved index is reused only with a matching signature"""
+        from cinematic_ai.core.location_index import LocationIndex
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            self.index.signature = ['loc', 1]
+            self.index.save(f"{tmp}/index.json")
+            loaded = LocationIndex.load(f"{tmp}/index.json", ['loc', 1])
+            self.assertEqual(loaded.match('COFFEE SHOP'), 'loc/coffee_shop.jpg')
+            self.assertIsNone(LocationIndex.load(f"{tmp}/index.json", ['loc', 2]))
+    
+    def test_persisted_index_paths_follow_directory(self):
+        """Test that a persisted index resolves paths against the directory as given"""
+        from cinematic_ai.core.frame_generator import FrameGenerator
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            locations = Path(tmp) / 'locations'
+            (Path(tmp) / 'elsewhere').mkdir()
+            locations.mkdir()
+            (locations / 'park.jpg').write_bytes(b'')
+            config = Config()
+            config.config['cache']['directory'] = f"{tmp}/cache"
+            
+            FrameGenerator(config, f"{tmp}/elsewhere/../locations")
+            self.assertTrue(list(Path(tmp, 'cache', 'location_index').iterdir()))
+            generator = FrameGenerator(config, str(locations))
+            self.assertEqual(generator.location_images, [str(locations / 'park.jpg')])
+            
+            config.config['cache']['enabled'] = False
+            config.config['cache']['directory'] = f"{tmp}/disabled"
+            FrameGenerator(config, str(locations))
+            self.assertFalse(Path(tmp, 'disabled').exists())
+
+
+class TestFrameGenerator(unittest.TestCase):
+    """Test frame generation"""
+    
+    def setUp(self):
+        from cinematic_ai.core.frame_generator import FrameGenerator
+        
+        self.tmp = tempfile.TemporaryDirectory()
+        config = Config()
+        config.config['cache']['enabled'] = False
+        config.config['frame_generation']['persist_location_index'] = False
+        config.config['frame_generation']['slideshow'].update(zoom_effect=False, pan_effect=False)
+        config.config['video']['resolution'] = {'width': 320, 'height': 180}
+        self.generator = FrameGenerator(config, self.tmp.name)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_reduced_decode_of_large_jpeg(self):
+        """Test that large JPEGs decode at reduced scale but still cover the frame"""
+        from PIL import Image
+        
+        source = Path(self.tmp.name) / 'large.jpg'
+        Image.new('RGB', (4000, 3000), 'red').save(source)
+        
+        img = self.generator._open_source_image(str(source))
+        self.assertLess(img.width, 4000)
+        self.assertGreaterEqual(img.width, 320)
+        self.assertGreaterEqual(img.height, 180)
+        
+        output = Path(self.tmp.name) / 'frame.png'
+        self.generator._create_frame_from_image(str(source), str(output))
+        with Image.open(output) as frame:
+            self.assertEqual(frame.size, (320, 180))
+
+
+class TestTextRenderer(unittest.TestCase):
+    """Test text card rendering"""
+
+    def test_wraps_and_caches_cards(self):
+        """Long lines wrap within the margins and repeated cards come from the cache"""
+        from PIL import Image
+        from cinematic_ai.core.text_renderer import TextRenderer
+        renderer = TextRenderer(Config(), 640, 360)
+        text = 'Scene 1\n' + ' '.join(['LOCATION'] * 12)
+        lines = renderer.layout(text)
+        self.assertGreater(len(lines), 2)
+        self.assertEqual(lines[0][0], 'Scene 1')
+        self.assertTrue(all(width <= 640 * (1 - 2 * renderer.style.margin) for _, width in lines))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            first, second = Path(tmp) / 'a.png', Path(tmp) / 'b.png'
+            renderer.write(text, str(first))
+            self.assertTrue(renderer.write(text, str(second)))
+            self.assertEqual(first.read_bytes(), second.read_bytes())
+            with Image.open(first) as img:
+                self.assertEqual(img.size, (640, 360))
+                self.assertEqual(img.getpixel((0, 0)), (0, 0, 0))
+                self.assertIsNotNone(img.convert('L').getbbox())
+
+
+class TestFrameStore(unittest.TestCase):
+    """Test frame handoff between generation and assembly"""
+
+    def test_spool_and_memory_round_trip(self):
+        """Spooled frames load back unchanged, kept frames follow file changes"""
+        import numpy as np
+        from PIL import Image
+        from cinematic_ai.core.frame_store import FrameStore
+        config = Config()
+        image = Image.fromarray(np.arange(48 * 64 * 3, dtype=np.uint8).reshape(48, 64, 3))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FrameStore(config)
+            path = store.path(tmp, 'frame')
+            self.assertTrue(path.endswith('.ppm'))
+            store.save(image, path)
+            self.assertTrue(np.array_equal(store.load(path), np.asarray(image)))
+
+            config.config['frame_generation']['store'] = 'memory'
+            store = FrameStore(config)
+            store.save(image, path)
+            self.assertIs(store.load(path), store.load(path))
+            Image.new('RGB', (64, 48), 'white').save(path)
+            self.assertEqual(store.load(path)[0, 0].tolist(), [255, 255, 255])
+
+
+class TestKenBurnsEngine(unittest.TestCase):
+    """Test vectorized zoom/pan engine"""
+    
+    def test_render_without_motion_is_identity(self):
+        """Test that a full-frame window reproduces the source exactly"""
+        import numpy as np
+        from cinematic_ai.core.motion import KenBurnsEngine
+        
+        config = Config()
+        config.config['frame_generation']['slideshow'].update(zoom_effect=False, pan_effect=False)
+        engine = KenBurnsEngine(config, 64, 36)
+        source = np.random.RandomState(0).randint(0, 256, (36, 64, 3)).astype(np.uint8)
+        
+        frames = np.concatenate(list(engine.render(source, 3)))
+        self.assertEqual(frames.shape, (3, 36, 64, 3))
+        self.assertTrue((frames == source).all())
+    
+    def test_zoom_windows_shrink_and_stay_inside(self):
+        """Test that zoom-in windows shrink and never leave the source"""
+        from cinematic_ai.core.motion import KenBurnsEngine
+        
+        engine = KenBurnsEngine(Config(), 1920, 1080)
+        windows = engine.shot_windows(24, variant=0)
+        self.assertGreater(windows[0, 2], windows[-1, 2])
+        self.assertTrue((windows[:, 0] >= -1e-9).all())
+        self.assertTrue((windows[:, 0] + windows[:, 2] <= 1920 + 1e-9).all())
+        self.assertTrue((windows[:, 1] + windows[:, 3] <= 1080 + 1e-9).all())
+    
+    def test_motion_frames_are_never_upsampled(self):
+        """Test that frames are large enough for the tightest zoom and pan window"""
+        from cinematic_ai.core.frame_generator import FrameGenerator
+        from cinematic_ai.core.motion import KenBurnsEngine
+        
+        config = Config()
+        config.config['cache']['enabled'] = False
+        config.config['video']['resolution'] = {'width': 320, 'height': 180}
+        engine = KenBurnsEngine(config, 320, 180)
+        width, height = engine.source_size()
+        self.assertEqual((width, height), (370, 208))
+        
+        windows = engine.shot_windows(24, variant=0)
+        windows[:, [0, 2]] *= width / 320
+        windows[:, [1, 3]] *= height / 180
+        self.assertTrue((windows[:, 2] >= 320 - 1e-9).all())
+        self.assertTrue((windows[:, 3] >= 180 - 1e-9).all())
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            generator = FrameGenerator(config, tmp)
+            self.assertEqual((generator.frame_width, generator.frame_height), (width, height))
+            config.config['video']['engine'] = 'moviepy'
+            self.assertEqual(FrameGenerator(config, tmp).frame_width, 320)
+
 
 class TestCharacterManager(unittest.TestCase):
     """Test character management"""
@@ -98,6 +362,611 @@ class TestCharacterManager(unittest.TestCase):
         # Should not crash with non-existent directory
         manager = CharacterManager("nonexistent_dir")
         self.assertEqual(len(manager.characters), 0)
+    
+    def test_indexed_lookup_with_aliases(self):
+        """Test case-insensitive lookup and honorific aliases"""
+        from cinematic_ai.core.character_manager import CharacterManager
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / 'SARAH').mkdir()
+            (Path(tmp) / 'SARAH' / 'sarah_1.jpg').write_bytes(b'')
+            (Path(tmp) / 'DR_SMITH.png').write_bytes(b'')
+            manager = CharacterManager(tmp)
+            
+            self.assertEqual(manager.get_character('sarah').name, 'SARAH')
+            self.assertEqual(manager.get_character('DR. SMITH').name, 'DR_SMITH')
+            self.assertEqual(manager.get_character('SMITH').name, 'DR_SMITH')
+            self.assertIsNone(manager.get_character('JOHN'))
+            
+            manager.add_alias('THE DOCTOR', 'DR_SMITH')
+            self.assertEqual(manager.get_character('the doctor').name, 'DR_SMITH')
+    
+    def test_refresh_picks_up_changes(self):
+        """Test incremental index updates when the directory changes"""
+        from cinematic_ai.core.character_manager import CharacterManager
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / 'SARAH.jpg').write_bytes(b'')
+            manager = CharacterManager(tmp)
+            self.assertFalse(manager.refresh())
+            
+            (Path(tmp) / 'JOHN.jpg').write_bytes(b'')
+            (Path(tmp) / 'SARAH.jpg').unlink()
+            self.assertTrue(manager.refresh())
+            self.assertEqual(manager.get_character('john').name, 'JOHN')
+            self.assertIsNone(manager.get_character('sarah'))
+
+
+class TestDiskCache(unittest.TestCase):
+    """Test on-disk LRU cache"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def _write(self, name, size):
+        path = self.root / name
+        path.write_bytes(b'x' * size)
+        return str(path)
+    
+    def test_put_and_fetch(self):
+        """Test that stored files are returned on a hit"""
+        from cinematic_ai.utils.disk_cache import DiskCache, make_key
+        
+        cache = DiskCache(str(self.root / 'cache'))
+        key = make_key('frame', 'abc', 1920, 1080)
+        self.assertFalse(cache.fetch(key, str(self.root / 'out.png')))
+        
+        cache.put(key, self._write('src.png', 10))
+        self.assertTrue(cache.fetch(key, str(self.root / 'out.png')))
+        self.assertEqual((self.root / 'out.png').read_bytes(), b'x' * 10)
+        
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+    
+    def test_lru_eviction(self):
+        """Test that least recently used entries are evicted first"""
+        from cinematic_ai.utils.disk_cache import DiskCache
+        
+        cache = DiskCache(str(self.root / 'cache'), max_bytes=25)
+        cache.put('aa1', self._write('a', 10))
+        cache.put('bb2', self._write('b', 10))
+        cache.get('aa1')
+        cache.put('cc3', self._write('c', 10))
+        
+        self.assertIsNotNone(cache.get('aa1'))
+        self.assertIsNone(cache.get('bb2'))
+        self.assertIsNotNone(cache.get('cc3'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+    
+    def test_persists_across_instances(self):
+        """Test that a new instance sees previously cached files"""
+        from cinematic_ai.utils.disk_cache import DiskCache
+        
+        DiskCache(str(self.root / 'cache')).put('dd4', self._write('d', 5))
+        cache = DiskCache(str(self.root / 'cache'))
+        self.assertIsNotNone(cache.get('dd4'))
+        self.assertEqual(cache.stats()['bytes'], 5)
+
+
+class TestAudioGenerator(unittest.TestCase):
+    """Test voiceover generation"""
+    
+    def test_tts_cache_reuses_identical_text(self):
+        """Test that identical utterances are synthesized once"""
+        from unittest import mock
+        from cinematic_ai.core.audio_generator import AudioGenerator
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            config = Config()
+            config.config['cache']['directory'] = tmp
+            generator = AudioGenerator(config)
+            
+            def fake_save(path):
+                Path(path).write_bytes(b'ID3 fake mp3')
+            
+            with mock.patch('gtts.gTTS') as tts:
+                tts.return_value.save.side_effect = fake_save
+                generator.generate_voiceover("Hello there", f"{tmp}/a.mp3")
+                generator.generate_voiceover("Hello there", f"{tmp}/b.mp3")
+                generator.generate_voiceover("Goodbye", f"{tmp}/c.mp3")
+            
+            self.assertEqual(tts.call_count, 2)
+            self.assertEqual(Path(f"{tmp}/b.mp3").read_bytes(), b'ID3 fake mp3')
+            self.assertEqual(generator.cache_stats()['hits'], 1)
+    
+    def test_stub_backend_batch(self):
+        """Test offline batch synthesis with the deterministic stub backend"""
+        from unittest import mock
+        from cinematic_ai.core.audio_generator import AudioGenerator
+        from cinematic_ai.utils.media_probe import probe_audio
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            config = Config()
+            config.config['cache']['enabled'] = False
+            config.config['audio'].update(tts_backend='stub', words_per_minute=120)
+            generator = AudioGenerator(config)
+            self.assertEqual(generator.audio_extension, '.wav')
+            
+            words = ' '.join(['word'] * 6)
+            jobs = [(words, f"{tmp}/a.wav"), ("Hi", f"{tmp}/b.wav"), (words, f"{tmp}/c.wav")]
+            fallback_paths = set()
+            with mock.patch.object(generator.backend, 'synthesize',
+                                   wraps=generator.backend.synthesize) as synthesize:
+                paths = generator.generate_voiceovers(jobs, fallback_paths)
+            
+            self.assertEqual(paths, [path for _, path in jobs])
+            self.assertEqual(synthesize.call_count, 2)
+            self.assertAlmostEqual(probe_audio(paths[0]).duration, 3.0)
+            self.assertAlmostEqual(probe_audio(paths[1]).duration, 1.0)
+            self.assertEqual(Path(paths[0]).read_bytes(), Path(paths[2]).read_bytes())
+            self.assertFalse(fallback_paths)
+
+            # Each caller collects its own batch's fallbacks
+            lost, found = set(), set()
+            with mock.patch.object(generator.backend, 'synthesize', side_effect=RuntimeError("offline")):
+                generator.generate_voiceovers([("Lost", f"{tmp}/d.wav")], lost)
+            generator.generate_voiceovers([("Found", f"{tmp}/e.wav")], found)
+            self.assertEqual((lost, found), ({f"{tmp}/d.wav"}, set()))
+
+
+class TestDurationPlanner(unittest.TestCase):
+    """Test up-front scene duration planning"""
+
+    def test_estimates_clamps_and_cuts(self):
+        """Cached voiceovers, speaking rate and clamped images set durations; late scenes are cut"""
+        from cinematic_ai.core.audio_generator import AudioGenerator
+        from cinematic_ai.core.planner import DurationPlanner
+
+        with tempfile.TemporaryDirectory() as tmp:
+            config = Config()
+            config.config['cache']['directory'] = tmp
+            config.config['audio'].update(tts_backend='stub', words_per_minute=60)
+            config.config['video']['max_duration'] = 22
+            config.config['scenes'].update(min_duration=3, max_duration=8, plan_margin=0.1)
+            generator = AudioGenerator(config)
+            cached = ' '.join(['cached'] * 4)
+            generator.generate_voiceovers([(cached, f"{tmp}/cached.wav")])
+            generator.tts_cache.put(generator._tts_cache_key('Hi there'), f"{tmp}/cached.wav")
+
+            scenes = [
+                Scene(1, 'PARK', 'DAY', 'Hi there'),
+                Scene(2, 'PARK', 'DAY', ' '.join(['word'] * 12)),
+                Scene(3, 'PARK', 'DAY', ''),
+                Scene(4, 'PARK', 'DAY', 'One'),
+                Scene(5, 'PARK', 'DAY', 'Two'),
+            ]
+            plans = DurationPlanner(config, generator).plan(scenes, [1, 1, 2, 1, 1])
+
+        self.assertEqual([plan.source for plan in plans], ['tts cache', 'words', 'images', 'words', 'words'])
+        # Speech is not clamped to min_duration/max_duration, the image-only scene is
+        self.assertEqual([plan.duration for plan in plans], [4.0, 12.0, 8.0, 1.0, 1.0])
+        self.assertEqual([plan.start for plan in plans[:3]], [0.0, 4.0, 16.0])
+        # 22s plus the 10% margin fits three scenes, everything after the first misfit is cut
+        self.assertEqual([plan.cut for plan in plans], [False, False, False, True, True])
+        self.assertEqual(generator.cache_stats()['hits'], 0)
+
+
+class TestMediaProbe(unittest.TestCase):
+    """Test header-only audio probing"""
+
+    def test_probe_wav_and_cbr_mp3_headers(self):
+        """Test that timing comes from headers and is memoized per file version"""
+        import wave
+        from cinematic_ai.utils import media_probe
+
+        with tempfile.TemporaryDirectory() as tmp:
+            wav_path = str(Path(tmp) / 'voice.wav')
+            with wave.open(wav_path, 'wb') as wav:
+                wav.setnchannels(2)
+                wav.setsampwidth(2)
+                wav.setframerate(22050)
+                wav.writeframes(b'\0' * 4 * 22050 * 3)
+            info = media_probe.probe_audio(wav_path)
+            self.assertEqual((info.sample_rate, info.channels), (22050, 2))
+            self.assertAlmostEqual(info.duration, 3.0)
+
+            # MPEG-1 Layer III, 128 kbps, 44.1 kHz, mono, behind an empty ID3v2 tag
+            mp3_path = str(Path(tmp) / 'voice.mp3')
+            frame = bytes([0xFF, 0xFB, 0x90, 0xC0]) + b'\0' * 413
+            with open(mp3_path, 'wb') as f:
+                f.write(b'ID3\x04\x00\x00\x00\x00\x00\x00' + frame * 100)
+            info = media_probe.probe_audio(mp3_path)
+            self.assertEqual((info.sample_rate, info.channels), (44100, 1))
+            self.assertAlmostEqual(info.duration, 417 * 100 * 8 / 128000)
+            self.assertIs(media_probe.probe_audio(mp3_path), info)
+
+            self.assertIsNone(media_probe.probe_audio(str(Path(tmp) / 'missing.mp3')))
+
+    def test_mp3_sync_requires_two_frames(self):
+        """Test that unconfirmed or non-MP3 frame syncs are left to the full decoder"""
+        from cinematic_ai.utils import media_probe
+
+        frame = bytes([0xFF, 0xFB, 0x90, 0xC0]) + b'\0' * 413
+        cases = {
+            'valid': frame * 3,
+            # ADTS AAC shares the sync word but has layer 00
+            'adts': bytes([0xFF, 0xF1, 0x50, 0x80, 0x2E, 0x7F, 0xFC]) + b'\0' * 400,
+            # A single header-like pattern followed by unrelated data
+            'lone': frame + b'\x01' * 1000,
+            # Reserved sample rate index
+            'reserved': (bytes([0xFF, 0xFB, 0x9C, 0xC0]) + b'\0' * 413) * 3,
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, data in cases.items():
+                path = str(Path(tmp) / f'{name}.mp3')
+                Path(path).write_bytes(data)
+                info = media_probe._probe_mp3(path, data, len(data))
+                if name == 'valid':
+                    self.assertAlmostEqual(info.duration, 417 * 3 * 8 / 128000)
+                else:
+                    self.assertIsNone(info, name)
+
+
+class TestAudioMixer(unittest.TestCase):
+    """Test streaming audio mixer"""
+
+    @staticmethod
+    def _write_wav(path, level, seconds, rate=22050):
+        import wave
+        import numpy as np
+        with wave.open(path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(rate)
+            wav.writeframes(np.full(int(rate * seconds), int(level * 32767), dtype='<i2').tobytes())
+
+    def test_voice_placement_looping_and_ducking(self):
+        """Test that voices land on the timeline and music loops and ducks under them"""
+        import wave
+        import numpy as np
+        from cinematic_ai.core.audio_mixer import AudioMixer, AUDIO_SAMPLE_RATE
+        from cinematic_ai.utils.media_probe import find_ffmpeg
+
+        if not find_ffmpeg():
+            self.skipTest("ffmpeg not available")
+
+        config = Config()
+        config.config['audio'].update(background_music_volume=0.5, ducking=0.5,
+                                      duck_release=0.1, mix_block_seconds=0.25)
+        with tempfile.TemporaryDirectory() as tmp:
+            config.config['output']['temp_directory'] = tmp
+            voice, music = str(Path(tmp) / 'voice.wav'), str(Path(tmp) / 'music.wav')
+            output = str(Path(tmp) / 'mix.wav')
+            self._write_wav(voice, 0.5, 2.0)
+            self._write_wav(music, 0.4, 0.3)
+
+            AudioMixer(config).mix([{'audio': voice, 'start': 1.0, 'duration': 1.0}],
+                                   3.0, output, music)
+            with wave.open(output, 'rb') as wav:
+                self.assertEqual(wav.getnchannels(), 2)
+                self.assertEqual(wav.getnframes(), 3 * AUDIO_SAMPLE_RATE)
+                samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2') / 32767.0
+
+        left = samples[::2]
+        second = lambda t: left[int(t * AUDIO_SAMPLE_RATE)]
+        self.assertAlmostEqual(second(0.5), 0.2, places=2)
+        self.assertAlmostEqual(second(0.95), 0.2, places=2)  # music looped past 0.3s
+        self.assertAlmostEqual(second(1.5), 0.5 + 0.1, places=2)  # voice cut to its scene
+        self.assertAlmostEqual(second(2.5), 0.2, places=2)  # music recovered
+
+    def test_undecodable_voice_raises(self):
+        """Test that a broken voiceover fails the mix instead of turning silent"""
+        from cinematic_ai.core.audio_mixer import AudioMixer
+
+        config = Config()
+        with tempfile.TemporaryDirectory() as tmp:
+            config.config['output']['temp_directory'] = tmp
+            voice = Path(tmp) / 'voice.wav'
+            voice.write_bytes(b'not audio')
+            # Raises whether ffmpeg rejects the file or is missing altogether
+            with self.assertRaises(RuntimeError):
+                AudioMixer(config).mix([{'audio': str(voice), 'start': 0.0, 'duration': 1.0}],
+                          1.0, str(Path(tmp) / 'mix.wav'))
+
+
+class TestFFmpegRenderer(unittest.TestCase):
+    """Test direct ffmpeg renderer"""
+    
+    def test_frame_counts_do_not_drift(self):
+        """Test that per-shot rounding does not accumulate"""
+        from cinematic_ai.core.ffmpeg_renderer import FFmpegRenderer
+        
+        config = Config()
+        with tempfile.TemporaryDirectory() as tmp:
+            config.config['cache']['directory'] = str(Path(tmp) / 'cache')
+            config.config['output']['temp_directory'] = str(Path(tmp) / 'temp')
+            renderer = FFmpegRenderer(config)
+        counts = renderer._frame_counts([1.01] * 100)
+        self.assertEqual(sum(counts), round(101.0 * 24))
+        self.assertTrue(all(c in (24, 25) for c in counts))
+
+    def test_crossfade_blends_only_overlap(self):
+        """Test that transitions shorten the film by the overlap and blend only it"""
+        import numpy as np
+        from PIL import Image
+        from cinematic_ai.core.ffmpeg_renderer import FFmpegRenderer
+        from cinematic_ai.core.transitions import iter_frames
+
+        config = Config()
+        config.config['cache']['enabled'] = False
+        config.config['video']['resolution'] = {'width': 32, 'height': 18}
+        config.config['scenes']['transition_duration'] = 0.25
+        config.config['frame_generation']['slideshow'].update(zoom_effect=False, pan_effect=False)
+        renderer = FFmpegRenderer(config)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            black, white = Path(tmp) / 'black.png', Path(tmp) / 'white.png'
+            Image.new('RGB', (32, 18), 'black').save(black)
+            Image.new('RGB', (32, 18), 'white').save(white)
+            scenes = renderer._plan_transitions(renderer._quantize([
+                {'frames': [str(black)], 'duration': 1.0},
+                {'frames': [str(white)], 'duration': 1.0},
+            ]))
+            self.assertEqual(scenes[1]['transition_in'], 6)
+
+            first = [f.copy() for f in iter_frames(renderer._segment_stream(scenes, 0))]
+            second = [f.copy() for f in iter_frames(renderer._segment_stream(scenes, 1))]
+
+        self.assertEqual(len(first) + len(second), 48 - 6)
+        self.assertTrue(all((f == 0).all() for f in first))
+        levels = [int(f[0, 0, 0]) for f in second[:6]]
+        self.assertEqual(levels, sorted(levels))
+        self.assertTrue(0 < levels[0] and levels[-1] < 255)
+        self.assertTrue(all((f == 255).all() for f in second[6:]))
+
+    def test_segment_cache_reencodes_only_changed_scene(self):
+        """Test that a second render re-encodes only the scene whose frames changed"""
+        import subprocess
+        from PIL import Image
+        from cinematic_ai.core.ffmpeg_renderer import FFmpegRenderer
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            config = Config()
+            config.config['cache']['directory'] = str(root / 'cache')
+            config.config['output']['temp_directory'] = str(root / 'temp')
+            config.config['video']['resolution'] = {'width': 32, 'height': 18}
+            # A crossfade would make the next segment depend on the changed scene too
+            config.config['scenes']['transition_duration'] = 0
+            if not FFmpegRenderer(config).available():
+                self.skipTest("ffmpeg not available")
+
+            scenes = []
+            for i, color in enumerate(('red', 'green', 'blue')):
+                frame, audio = root / f"frame_{i}.png", str(root / f"audio_{i}.wav")
+                Image.new('RGB', (32, 18), color).save(frame)
+                TestAudioMixer._write_wav(audio, 0.1, 1.0)
+                scenes.append({'frames': [str(frame)], 'duration': 1.0 + i * 0.5, 'audio': audio})
+
+            def render():
+                renderer = FFmpegRenderer(config)
+                output = str(root / 'film.mp4')
+                renderer.render(scenes, output)
+                return renderer.segment_cache.stats(), output
+
+            first, _ = render()
+            Image.new('RGB', (32, 18), 'white').save(scenes[1]['frames'][0])
+            second, output = render()
+
+            packets = subprocess.run([FFmpegRenderer(config).ffmpeg, '-loglevel', 'error', '-i', output,
+                                      '-map', '0:v', '-f', 'framecrc', '-'],
+                                     capture_output=True, text=True).stdout
+
+        self.assertEqual((first['hits'], first['misses']), (0, 3))
+        self.assertEqual((second['hits'], second['misses']), (2, 1))
+        self.assertEqual(len([line for line in packets.splitlines() if not line.startswith('#')]),
+                         round((1.0 + 1.5 + 2.0) * 24))
+
+    def test_stills_encode_once_per_image(self):
+        """Test that held stills become single variable-rate frames on the fps grid"""
+        import subprocess
+        import numpy as np
+        from cinematic_ai.core.ffmpeg_renderer import FFmpegRenderer
+
+        config = Config()
+        config.config['cache']['enabled'] = False
+        config.config['video']['resolution'] = {'width': 32, 'height': 18}
+        config.config['frame_generation']['slideshow'].update(zoom_effect=False, pan_effect=False)
+        renderer = FFmpegRenderer(config)
+        if not renderer.available():
+            self.skipTest("ffmpeg not available")
+        self.assertTrue(renderer.still_encoding)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            renderer.temp_dir = Path(tmp)
+            video = str(Path(tmp) / 'stills.mp4')
+            black, white = np.zeros((18, 32, 3), np.uint8), np.full((18, 32, 3), 255, np.uint8)
+            renderer._encode([(black, 30), (white, 18)], video)
+
+            packets = subprocess.run([renderer.ffmpeg, '-loglevel', 'error', '-i', video,
+                                      '-c', 'copy', '-f', 'framecrc', '-'],
+                                     capture_output=True, text=True).stdout
+            raw = subprocess.run([renderer.ffmpeg, '-loglevel', 'error', '-i', video, '-vf', 'fps=24',
+                                  '-f', 'rawvideo', '-pix_fmt', 'gray', '-'], capture_output=True).stdout
+
+        self.assertEqual(len([line for line in packets.splitlines() if not line.startswith('#')]), 3)
+        levels = np.frombuffer(raw, np.uint8).reshape(-1, 18 * 32).mean(axis=1)
+        self.assertEqual(len(levels), 48)
+        self.assertTrue((levels[:30] < 30).all() and (levels[30:] > 225).all())
+
+
+class TestTracer(unittest.TestCase):
+    """Test stage tracing"""
+
+    def test_nested_spans_and_export(self):
+        """Spans nest by path, sum counters and export as Chrome trace events"""
+        import json
+        from cinematic_ai.utils.tracing import Tracer
+        tracer = Tracer()
+        with tracer.span('render') as root:
+            for _ in range(2):
+                with tracer.span('frame') as span:
+                    span.count('bytes_read', 2e6)
+            worker = Tracer()
+            with worker.span('tts'):
+                pass
+            tracer.merge(worker.drain(), parent=root)
+
+        paths = sorted(event['args']['path'] for event in tracer.events)
+        self.assertEqual(paths, ['render', 'render/frame', 'render/frame', 'render/tts'])
+        summary = tracer.summary().splitlines()
+        self.assertTrue(summary[1].startswith('render '))
+        self.assertIn('bytes_read=4.0MB', summary[2])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'trace.json'
+            tracer.export_chrome(str(path))
+            events = json.loads(path.read_text())['traceEvents']
+        self.assertEqual(sum(1 for event in events if event['ph'] == 'X'), 4)
+
+    def test_disabled_tracer_records_nothing(self):
+        """A disabled tracer hands out null spans"""
+        from cinematic_ai.utils.tracing import Tracer
+        tracer = Tracer(enabled=False)
+        with tracer.span('render') as span:
+            span.count('frames')
+        self.assertEqual(tracer.events, [])
+
+
+class TestParallelScenes(unittest.TestCase):
+    """Test scene processing with the frame worker pool"""
+
+    def test_order_and_failure_isolation(self):
+        """Scenes come back in script order and a failing scene is skipped alone"""
+        import yaml
+        from cinematic_ai.core.script_parser import ScriptParser
+        from cinematic_ai.core.video_generator import CinematicAI
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            config = Config().config
+            config['audio']['tts_backend'] = 'stub'
+            config['video']['resolution'] = {'width': 64, 'height': 36}
+            config['performance']['frame_workers'] = 2
+            config['cache']['enabled'] = False
+            config['cache']['directory'] = str(root / 'cache')
+            config['output']['temp_directory'] = str(root / 'temp')
+            config['logging']['file'] = str(root / 'log.txt')
+            config_path = root / 'config.yaml'
+            config_path.write_text(yaml.safe_dump(config))
+            for name in ('characters', 'locations'):
+                (root / name).mkdir()
+
+            generator = CinematicAI(str(config_path))
+            try:
+                generator.character_manager, generator.frame_generator = generator.load_assets(
+                    str(root / 'characters'), str(root / 'locations'))
+                scenes = ScriptParser().parse_script('\n\n'.join(
+                    f"INT. ROOM {n} - DAY\n\nSARAH\nLine number {n}." for n in range(1, 5)))
+                # A directory where scene 2's card should go makes its frame worker fail
+                frames_dir = root / 'work' / 'frames_64x36'
+                (frames_dir / 'scene_2_frame_1.ppm').mkdir(parents=True)
+                scenes_data = generator._process_scenes(scenes, root / 'work')
+                self.assertIsNotNone(generator._frame_pool)
+            finally:
+                generator.close()
+
+        self.assertEqual([data['scene'].number for data in scenes_data], [1, 3, 4])
+        self.assertEqual([number for number, _ in generator.failed_scenes], [2])
+        for data in scenes_data:
+            self.assertEqual(Path(data['frames'][0]).name, f"scene_{data['scene'].number}_frame_1.ppm")
+            self.assertTrue(data['audio'].endswith(f"scene_{data['scene'].number}_audio.wav"))
+
+
+class TestBatch(unittest.TestCase):
+    """Test batch job lists and the CLI entry point"""
+
+    def test_load_jobs(self):
+        """Directories and job files resolve scripts, outputs and defaults"""
+        from cinematic_ai.core.batch import load_jobs
+        with tempfile.TemporaryDirectory() as tmp:
+            scripts = Path(tmp) / 'scripts'
+            scripts.mkdir()
+            for name in ('ep2.txt', 'ep1.txt', 'notes.md'):
+                (scripts / name).write_text('INT. ROOM - DAY')
+            jobs = load_jobs(str(scripts), str(Path(tmp) / 'out'), 'chars', 'locs')
+            self.assertEqual([Path(job.script).name for job in jobs], ['ep1.txt', 'ep2.txt'])
+            self.assertEqual(jobs[0].output, str(Path(tmp) / 'out' / 'ep1.mp4'))
+            self.assertEqual(jobs[0].characters, 'chars')
+
+            listing = Path(tmp) / 'jobs.txt'
+            listing.write_text('# nightly\nscripts/ep1.txt\nother/ep1.txt\n')
+            with self.assertRaises(ValueError):
+                load_jobs(str(listing), 'out', 'chars', 'locs')
+
+    def test_render_is_default_command(self):
+        """Options without a subcommand still go to render"""
+        from click.testing import CliRunner
+        from cinematic_ai.cli import main
+        result = CliRunner().invoke(main, ['-s', 'missing.txt'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("'--script'", result.output)
+
+    def test_preview_output_does_not_overwrite(self):
+        """Preview renders go next to the full render"""
+        from cinematic_ai.cli import _preview_output
+        self.assertEqual(_preview_output('out/video.mp4'), str(Path('out/video_preview.mp4')))
+        self.assertEqual(_preview_output('video_preview.mp4'), 'video_preview.mp4')
+
+
+class TestRenderService(unittest.TestCase):
+    """Test the render service queue"""
+
+    def test_priority_and_cancellation(self):
+        """Higher priorities are dequeued first and queued jobs cancel immediately"""
+        import yaml
+        from cinematic_ai.core.service import RenderService, CANCELLED, QUEUED
+        with tempfile.TemporaryDirectory() as tmp:
+            settings = Config().config
+            settings['logging']['file'] = str(Path(tmp) / 'service.log')
+            settings['output']['directory'] = str(Path(tmp) / 'out')
+            settings['output']['temp_directory'] = str(Path(tmp) / 'temp')
+            settings['cache']['directory'] = str(Path(tmp) / 'cache')
+            config_path = Path(tmp) / 'config.yaml'
+            config_path.write_text(yaml.safe_dump(settings))
+            script = Path(tmp) / 'script.txt'
+            script.write_text('INT. ROOM - DAY')
+
+            service = RenderService(str(config_path))
+            low = service.submit(str(script), tmp, tmp, priority=0)
+            high = service.submit(str(script), tmp, tmp, priority=5)
+            with self.assertRaises(ValueError):
+                service.submit(str(Path(tmp) / 'missing.txt'), tmp, tmp)
+
+            service.cancel(low.id)
+            self.assertEqual(low.status, CANCELLED)
+            self.assertEqual(high.status, QUEUED)
+            self.assertTrue(high.output.endswith(f"{high.id}.mp4"))
+            order = [service._queue.get()[2] for _ in range(2)]
+            self.assertEqual(order, [high, low])
+            service.generator.close()
+
+
+class TestStartup(unittest.TestCase):
+    """Test command-line startup cost"""
+
+    def test_cli_import_skips_media_libraries(self):
+        """The CLI and generator import without MoviePy, PIL, numpy or gTTS"""
+        import os
+        import subprocess
+        code = (
+            "import sys, time\n"
+            "start = time.perf_counter()\n"
+            "import cinematic_ai.cli, cinematic_ai.core.video_generator\n"
+            "print(time.perf_counter() - start)\n"
+            "print(' '.join(m for m in ('moviepy', 'PIL', 'numpy', 'gtts') if m in sys.modules))\n"
+        )
+        env = dict(os.environ, PYTHONPATH=str(Path(__file__).parent.parent / 'src'))
+        result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        seconds, loaded = (result.stdout.split('\n') + [''])[:2]
+        self.assertEqual(loaded.strip(), '')
+        self.assertLess(float(seconds), 1.0, f"CLI import took {float(seconds):.2f}s")
 
 
 if __name__ == '__main__':